@@ -1,11 +1,32 @@
 __doc__ = """Run following tests:
+        python test.cpp.test_cpp_accessor_writer
         python test.cpp.test_cpp_array_writer
+        python test.cpp.test_cpp_async_writer
+        python test.cpp.test_cpp_attribute_writer
         python test.cpp.test_cpp_class_writer
+        python test.cpp.test_cpp_constant_writer
+        python test.cpp.test_cpp_crtp_writer
+        python test.cpp.test_cpp_determinism
+        python test.cpp.test_cpp_enum_hash_writer
+        python test.cpp.test_cpp_enum_names_writer
         python test.cpp.test_cpp_enum_writer
         python test.cpp.test_cpp_file
+        python test.cpp.test_cpp_file_concurrent
+        python test.cpp.test_cpp_forward_writer
         python test.cpp.test_cpp_function_writer
+        python test.cpp.test_cpp_hierarchy_writer
+        python test.cpp.test_cpp_include_writer
+        python test.cpp.test_cpp_layout_writer
+        python test.cpp.test_cpp_placement_writer
+        python test.cpp.test_cpp_profile_order_writer
+        python test.cpp.test_cpp_project_writer
         python test.cpp.test_cpp_scope_writer
+        python test.cpp.test_cpp_shard_writer
+        python test.cpp.test_cpp_soa_writer
+        python test.cpp.test_cpp_statement_writer
+        python test.cpp.test_cpp_string_table_writer
         python test.cpp.test_cpp_type_gen
+        python test.cpp.test_cpp_unity_writer
         python test.cpp.test_cpp_variable_writer
 """
 
@@ -34,13 +55,34 @@ def run_black():
 if __name__ == "__main__":
     command_line_args = sys.argv[1:]
     test_files = [
+        "test.cpp.test_cpp_accessor_writer",
         "test.cpp.test_cpp_array_writer",
+        "test.cpp.test_cpp_async_writer",
+        "test.cpp.test_cpp_attribute_writer",
         "test.cpp.test_cpp_class_writer",
+        "test.cpp.test_cpp_constant_writer",
+        "test.cpp.test_cpp_crtp_writer",
+        "test.cpp.test_cpp_determinism",
+        "test.cpp.test_cpp_enum_hash_writer",
+        "test.cpp.test_cpp_enum_names_writer",
         "test.cpp.test_cpp_enum_writer",
         "test.cpp.test_cpp_file",
+        "test.cpp.test_cpp_file_concurrent",
+        "test.cpp.test_cpp_forward_writer",
         "test.cpp.test_cpp_function_writer",
+        "test.cpp.test_cpp_hierarchy_writer",
+        "test.cpp.test_cpp_include_writer",
+        "test.cpp.test_cpp_layout_writer",
+        "test.cpp.test_cpp_placement_writer",
+        "test.cpp.test_cpp_profile_order_writer",
+        "test.cpp.test_cpp_project_writer",
         "test.cpp.test_cpp_scope_writer",
+        "test.cpp.test_cpp_shard_writer",
+        "test.cpp.test_cpp_soa_writer",
+        "test.cpp.test_cpp_statement_writer",
+        "test.cpp.test_cpp_string_table_writer",
         "test.cpp.test_cpp_type_gen",
+        "test.cpp.test_cpp_unity_writer",
         "test.cpp.test_cpp_variable_writer",
     ]
 
@@ -1,2 +1,3 @@
 from .source_file import *
 from .code_formatter import *
+from .import_path import *
@@ -153,3 +153,88 @@ class CodeFormatterFactory:
             # TODO: leave default formatter for respective source file
             return type("Formatter", (CodeFormatter,), {"code_layout": CodeLayout})
         raise ValueError(f"Unknown code format: {code_format}")
+
+
+class CodeRecorder:
+    """
+    Records code generation calls (lines, blocks, labels, empty lines) without formatting them.
+    Recorded code could be replayed later into any source file or code block,
+    so it is indented according to the place where it is replayed.
+    Ex.
+    # Python code
+    recorder = CodeRecorder()
+    recorder('int a = 0;')
+    with recorder.block('if (a == 0)') as block:
+        block('return;')
+    with cpp.block('void f()') as block:
+        recorder.replay(block)
+
+    // Generated code
+    void f()
+    {
+        int a = 0;
+        if (a == 0)
+        {
+            return;
+        }
+    }
+    """
+
+    def __init__(self):
+        # list of (method name, args, kwargs, nested recorder or None)
+        self.calls = []
+
+    def __call__(self, text, indent=None, endline=True):
+        self.line(text, indent=indent, endline=endline)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        pass
+
+    def line(self, text, indent=None, endline=True):
+        """Record one line."""
+        kwargs = {"endline": endline}
+        if indent is not None:
+            kwargs["indent"] = indent
+        self.calls.append(("line", (text,), kwargs, None))
+
+    def write(self, text, indent=None, endline=True):
+        """Record one line, SourceFile compatible alias of line()."""
+        self.line(text, indent=indent, endline=endline)
+
+    def block(self, text=None, endline=True, postfix=None, braces=True):
+        """Record a nested code block, returns recorder for its content."""
+        # only given arguments are replayed, nested code blocks have no braces
+        kwargs = {}
+        if not endline:
+            kwargs["endline"] = endline
+        if postfix is not None:
+            kwargs["postfix"] = postfix
+        if not braces:
+            kwargs["braces"] = braces
+        nested = CodeRecorder()
+        self.calls.append(("block", (text,), kwargs, nested))
+        return nested
+
+    def label(self, text):
+        """Record C/C++ code label."""
+        self.calls.append(("label", (text,), {}, None))
+
+    def newline(self, n=1):
+        """Record one or several empty lines."""
+        self.calls.append(("newline", (n,), {}, None))
+
+    def replay(self, cpp):
+        """
+        Write recorded code into the source file or code block
+        """
+        for name, args, kwargs, nested in self.calls:
+            if name == "line":
+                cpp(*args, **kwargs)
+            elif nested is None:
+                getattr(cpp, name)(*args, **kwargs)
+            else:
+                with cpp.block(*args, **kwargs) as block:
+                    nested.replay(block)
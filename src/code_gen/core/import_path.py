@@ -0,0 +1,47 @@
+import importlib
+
+__doc__ = """Helpers for referencing Python callables by their dotted import path.
+
+Dotted paths are plain strings, so elements that reference their callbacks
+this way can be pickled and sent to worker processes.
+
+Example:
+# Python code
+handle = import_by_path('my_generator.bodies:factorial_body')
+"""
+
+
+def import_by_path(path):
+    """
+    Import and return the object referenced by the dotted path
+    Both 'package.module:attr.subattr' and 'package.module.attr' forms are supported
+    @param: path - dotted path of the object
+    @raise: ImportError, if the object could not be imported
+    """
+    if ":" in path:
+        module_name, _, attr_path = path.partition(":")
+    else:
+        module_name, _, attr_path = path.rpartition(".")
+    if not module_name or not attr_path:
+        raise ImportError(f"Invalid dotted path '{path}'")
+    obj = importlib.import_module(module_name)
+    for attr in attr_path.split("."):
+        try:
+            obj = getattr(obj, attr)
+        except AttributeError as e:
+            raise ImportError(
+                f"Cannot import '{attr_path}' from '{module_name}'"
+            ) from e
+    return obj
+
+
+def resolve_callable(handle):
+    """
+    Return the callable referenced by the handle
+    @param: handle - callable or its dotted path
+    """
+    if isinstance(handle, str):
+        handle = import_by_path(handle)
+    if not callable(handle):
+        raise TypeError(f"Object {handle!r} is not callable")
+    return handle
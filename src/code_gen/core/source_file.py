@@ -1,3 +1,7 @@
+import contextvars
+import io
+from concurrent.futures import ThreadPoolExecutor
+
 from code_gen.core.code_formatter import CodeFormat, CodeFormatterFactory
 
 __doc__ = """
@@ -33,6 +37,10 @@ public:
 """
 
 
+def _render_to_string(element, cpp):
+    element.render_to_string(cpp)
+
+
 class SourceFile:
     """
     The class is a main instrument of code generation
@@ -64,16 +72,32 @@ class SourceFile:
     // Generated C++ code
     class Derived : public Base
 
-    And finally, it can insert a number of empty lines
+    It can insert a number of empty lines
     cpp.newline(3)
+
+    And finally, it can collect the code into named sections, which could be appended
+    to in any order and are written in the declared order when the file is closed
+    Ex.
+    # Python code
+    cpp = SourceFile('ex.cpp', sections=('includes', 'definitions'))
+    cpp.section('definitions')('int i = 0;')
+    cpp.section('includes')('#include <cstddef>')
+    cpp.close()
+
+    // Generated C++ code
+    #include <cstddef>
+    int i = 0;
     """
 
-    def __init__(self, filename, formatter=None, writer=None):
+    default_sections = ()
+
+    def __init__(self, filename, formatter=None, writer=None, sections=None):
         """
         Creates a new source file
         @param: filename source file to create (rewrite if exists)
         @param: formatter code formatter to define rules of code indentation and line ending
         @param: writer optional writer to write output to
+        @param: sections optional sequence of section names in the output order
         """
         self.filename = filename
         if not isinstance(formatter, CodeFormat) and formatter is not None:
@@ -81,11 +105,85 @@ class SourceFile:
         self.formatter = formatter if formatter is not None else CodeFormat.DEFAULT
         self.out = writer if writer is not None else open(filename, "w")
         self.code_formatter = CodeFormatterFactory.get_code_formatter(self.formatter)
+        self.sections = tuple(
+            sections if sections is not None else self.default_sections
+        )
+        self._section_files = {}
+
+    def fork(self):
+        """
+        Create a new source file of the same type and format, which writes to an in-memory buffer
+        The buffered content is available as fork.out.getvalue()
+        """
+        return type(self)(
+            self.filename, formatter=self.formatter, writer=io.StringIO(), sections=()
+        )
+
+    def section(self, name):
+        """
+        Return the source file handle of the named section
+        The code written to the section is buffered until flush_sections() or close()
+        @raise: ValueError, if the section was not declared
+        """
+        if name not in self.sections:
+            raise ValueError(
+                f"Unknown section '{name}', declared sections: {self.sections}"
+            )
+        if name not in self._section_files:
+            self._section_files[name] = self.fork()
+        return self._section_files[name]
+
+    def flush_sections(self):
+        """
+        Write the content of all sections in the declared order after the code,
+        which has been written directly to the file, and empty them
+        """
+        for name in self.sections:
+            section = self._section_files.pop(name, None)
+            if section is not None:
+                self.out.write(section.out.getvalue())
+
+    def render_elements(self, elements, render=None, max_workers=1):
+        """
+        Render a sequence of independent elements into the file
+        @param: elements - elements supporting render_to_string(cpp) interface
+        @param: render - optional function render(element, cpp) used instead of render_to_string
+        @param: max_workers - number of threads, every element is rendered into its own buffer
+        and the buffers are written in the original order, so the output is identical
+        to the serial rendering. Elements are rendered directly into the file if 1.
+        Threads help only when implementation callbacks are I/O bound.
+        Every element is rendered in a copy of the caller's context, so context variables
+        (e.g. canonical_order() or compiler_profile()) apply to the threads as well.
+        """
+        if render is None:
+            render = _render_to_string
+
+        if max_workers == 1:
+            for element in elements:
+                render(element, self)
+            return
+
+        def render_to_buffer(element):
+            buffer = self.fork()
+            render(element, buffer)
+            return buffer.out.getvalue()
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # worker threads do not inherit the context, a context is entered by one thread
+            futures = [
+                executor.submit(
+                    contextvars.copy_context().run, render_to_buffer, element
+                )
+                for element in elements
+            ]
+            for future in futures:
+                self.out.write(future.result())
 
     def close(self):
         """
-        File created, just close the handle
+        File created, write the sections and close the handle
         """
+        self.flush_sections()
         self.out.close()
         self.out = None
 
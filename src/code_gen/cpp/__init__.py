@@ -1,8 +1,26 @@
+from .accessor_generator import *
 from .array_generator import *
+from .attribute_generator import *
 from .class_generator import *
+from .constant_generator import *
+from .determinism import *
 from .enum_generator import *
+from .enum_hash_generator import *
+from .enum_names_generator import *
+from .forward_generator import *
 from .function_generator import *
+from .hierarchy_generator import *
+from .include_generator import *
 from .language_element import *
+from .layout_generator import *
+from .placement_generator import *
+from .profile_order import *
+from .project_generator import *
+from .shard_generator import *
+from .soa_generator import *
 from .source_file import *
+from .statement_generator import *
+from .string_table_generator import *
 from .type_base_generator import *
+from .unity_generator import *
 from .variable_generator import *
@@ -0,0 +1,226 @@
+from .enum_generator import CppEnum
+from .layout_generator import TYPE_LAYOUTS, CppStructLayout
+from .scope_generator import CppClassScope
+from .type_base_generator import CppBaseType
+
+__doc__ = """Getters and setters of class data members with cost-aware passing.
+
+Accessors written by hand often copy large members, e.g. a getter returning
+std::string by value. CppAccessors chooses the passing of every data member
+by its type:
+- 'value' - trivially copyable types up to max_value_size bytes (fundamental types,
+  pointers, enums, std::string_view, classes of such members) are returned
+  and set by value,
+- 'move' - types in movable_types (std::string, containers, smart pointers)
+  are returned by const reference and set by value with std::move,
+- 'reference' - other types are returned and set by const reference.
+Getters are [[nodiscard]] and noexcept, setters are noexcept unless they copy
+a non-trivial value. Const and reference members have no setter, static members
+no accessors.
+
+Example:
+# Python code
+user = CppClass(name='User')
+user.add_variable(CppVariable(name='m_id', type='int'))
+user.add_variable(CppVariable(name='m_name', type='std::string'))
+user.add_accessors()
+
+// Generated C++ code
+class User
+{
+public:
+    [[nodiscard]] int GetId() const noexcept;
+    void SetId(int id) noexcept;
+    [[nodiscard]] const std::string& GetName() const noexcept;
+    void SetName(std::string name) noexcept;
+    ...
+};
+"""
+
+# types with a cheap move, which are set by value and moved to the member
+MOVABLE_TYPES = {
+    "std::string",
+    "std::wstring",
+    "std::vector",
+    "std::deque",
+    "std::list",
+    "std::map",
+    "std::multimap",
+    "std::set",
+    "std::multiset",
+    "std::unordered_map",
+    "std::unordered_set",
+    "std::function",
+    "std::unique_ptr",
+    "std::shared_ptr",
+}
+
+
+class CppAccessors:
+    """
+    Generates accessors of data members of a class
+    Available properties:
+    cpp_class - CppClass instance
+    type_layouts - dictionary {type name: (size, alignment)} (see CppStructLayout)
+    trivial_types - names of trivially copyable types besides the types in TYPE_LAYOUTS
+    movable_types - names of types set by value and std::move, MOVABLE_TYPES by default
+    max_value_size - size of the largest trivially copyable type passed by value, 16 by default
+    getter, setter - name patterns, 'Get{name}' and 'Set{name}' by default, {name} is
+    the member name without 'm_' prefix in CamelCase
+    """
+
+    def __init__(
+        self,
+        cpp_class,
+        type_layouts=None,
+        trivial_types=None,
+        movable_types=None,
+        max_value_size=16,
+        getter="Get{name}",
+        setter="Set{name}",
+    ):
+        self.cpp_class = cpp_class
+        self.layout = CppStructLayout(cpp_class, type_layouts)
+        self.trivial_types = set(TYPE_LAYOUTS) | set(trivial_types or [])
+        self.movable_types = set(
+            MOVABLE_TYPES if movable_types is None else movable_types
+        )
+        self.max_value_size = max_value_size
+        self.getter = getter
+        self.setter = setter
+
+    def members(self):
+        """
+        @return: non-static variable members
+        """
+        return [m for m in self.cpp_class.variable_members if not m.type.is_static]
+
+    @staticmethod
+    def accessor_name(member):
+        """
+        @return: member name without 'm_' prefix in CamelCase, e.g. 'MaxSize' for 'm_max_size'
+        """
+        name = member.name[2:] if member.name.startswith("m_") else member.name
+        return "".join(part[:1].upper() + part[1:] for part in name.split("_") if part)
+
+    @staticmethod
+    def parameter_name(member):
+        """
+        @return: member name without 'm_' prefix, e.g. 'max_size' for 'm_max_size'
+        """
+        name = member.name[2:] if member.name.startswith("m_") else member.name
+        return name.strip("_")
+
+    def is_trivial(self, ctype):
+        """
+        @param: ctype - type name, CppBaseType, CppEnum or class
+        @return: True if the type is known to be trivially copyable
+        """
+        if isinstance(ctype, CppBaseType):
+            return ctype.is_ptr or self.is_trivial(ctype.type)
+        if isinstance(ctype, CppEnum):
+            return True
+        if isinstance(ctype, CppClassScope):
+            # user-declared constructors, destructors and virtual methods
+            special = any(
+                method.ret_type is None or getattr(method, "is_virtual", False)
+                for method in ctype.methods
+            )
+            member_types = [
+                *(v.type for v in ctype.variable_members if not v.type.is_static),
+                *(a.type for a in ctype.array_members if not a.is_static),
+            ]
+            return not special and all(self.is_trivial(t) for t in member_types)
+        name = " ".join(str(ctype).split())
+        return name.endswith("*") or name in self.trivial_types
+
+    def type_size(self, ctype):
+        """
+        @return: size of the type in bytes, None if unknown
+        """
+        if isinstance(ctype, CppBaseType) and not ctype.is_ptr:
+            if isinstance(ctype.type, CppEnum):
+                return 8 if ctype.type.underlying_type() == "uint64_t" else 4
+        try:
+            return self.layout.type_layout(ctype)[0]
+        except ValueError:
+            return None
+
+    def passing(self, member):
+        """
+        @return: 'value', 'move' or 'reference' - passing of the member value
+        """
+        ctype = member.type
+        if self.is_trivial(ctype):
+            size = self.type_size(ctype)
+            if size is not None and size <= self.max_value_size:
+                return "value"
+            return "reference"
+        name = CppBaseType.resolved_name(ctype.type, local_scope=True)
+        if name.split("<")[0].strip() in self.movable_types:
+            return "move"
+        return "reference"
+
+    @staticmethod
+    def is_pointer(member):
+        """
+        @return: True if the member is a pointer, e.g. is_ptr=True or type='char*'
+        """
+        name = CppBaseType.resolved_name(member.type.type, local_scope=True)
+        return bool(member.type.is_ptr) or name.rstrip().endswith("*")
+
+    def value_type(self, member, const=False, ref=False):
+        """
+        @return: CppBaseType of the member value
+        """
+        return CppBaseType(
+            type=member.type.type,
+            is_ptr=member.type.is_ptr,
+            # constness of the pointed value is a part of the pointer type
+            is_const=const or (self.is_pointer(member) and member.type.is_const),
+            is_ref=ref,
+        )
+
+    def getter_method(self, member):
+        """
+        @return: CppMethod returning the member
+        """
+        by_value = self.passing(member) == "value" and not member.type.is_ref
+        return self.cpp_class.CppMethod(
+            name=self.getter.format(name=self.accessor_name(member)),
+            ret_type=self.value_type(member, const=not by_value, ref=not by_value),
+            is_const=True,
+            attributes=["nodiscard", "noexcept"],
+            implementation=[f"return {member.name};"],
+        )
+
+    def setter_method(self, member):
+        """
+        @return: CppMethod setting the member, None for const and reference members
+        """
+        if member.type.is_ref or (member.type.is_const and not self.is_pointer(member)):
+            return None
+        passing = self.passing(member)
+        parameter = self.parameter_name(member)
+        by_reference = passing == "reference"
+        value = self.value_type(member, const=by_reference, ref=by_reference)
+        argument = f"{value.scoped_name(local_scope=True)} {parameter}"
+        if passing == "move":
+            statement = f"{member.name} = std::move({parameter});"
+        else:
+            statement = f"{member.name} = {parameter};"
+        # copying a non-trivial value could throw
+        is_noexcept = passing != "reference" or self.is_trivial(member.type)
+        return self.cpp_class.CppMethod(
+            name=self.setter.format(name=self.accessor_name(member)),
+            ret_type="void",
+            arguments=[argument],
+            attributes=["noexcept"] if is_noexcept else None,
+            implementation=[statement],
+        )
+
+    def report(self):
+        """
+        @return: dictionary {member name: passing}
+        """
+        return {member.name: self.passing(member) for member in self.members()}
@@ -1,3 +1,4 @@
+from .attribute_generator import CppAttributes
 from .language_element import CppLanguageElement
 
 
@@ -21,8 +22,17 @@ class CppArray(CppLanguageElement):
     type - string, variable type
     (is_)static - boolean, 'static' prefix
     (is_)const - boolean, 'const' prefix
+    (is_)constexpr - boolean, 'constexpr' prefix, static class members are defined in the class
+    (is_)constinit - boolean, 'constinit' prefix (C++20), static initialization of a mutable array
+    (is_)extern - boolean, the array is declared in a header ('extern const int arr[3];')
+        and defined once in a source file by render_to_string_implementation()
+    (is_)inline - boolean, C++17 inline array defined in a header, the linker keeps
+        one copy for all translation units, no definition in a source file is required
     array_size - integer, size of array if required
     newline_align - in the array definition rendering place every item on the new string
+    (is_)pinned - boolean, the class member keeps its position when the class layout is optimized
+    attributes - list of attributes, e.g. [('alignas', 64), ('section', '.rodata.hot')]
+        (see CppAttributes)
 
     NOTE: versions 2.0+ of CodeGenerator support boolean properties without "is_" suffix,
     but old versions preserved for backward compatibility
@@ -36,9 +46,15 @@ class CppArray(CppLanguageElement):
         "type",
         "is_static",
         "is_const",
+        "is_constexpr",
+        "is_constinit",
+        "is_extern",
+        "is_inline",
         "array_size",
         "newline_align",
         "items",
+        "is_pinned",
+        "attributes",
     }
 
     def __init__(self, **properties):
@@ -46,8 +62,14 @@ class CppArray(CppLanguageElement):
         self.type = None
         self.is_static = False
         self.is_const = False
+        self.is_constexpr = False
+        self.is_constinit = False
+        self.is_extern = False
+        self.is_inline = False
         self.array_size = 0
         self.newline_align = False
+        self.is_pinned = False
+        self.attributes = None
         # array elements
         self.items = []
         self.init_properties(properties)
@@ -66,16 +88,50 @@ class CppArray(CppLanguageElement):
         """
         self.items.extend(items)
 
-    def decl_to_string(self):
+    def decl_to_string(self, extern=False):
+        """
+        @param: extern - True for the only definition of an extern array
+        """
         lhr = [
+            f"{self._attributes().prefix()}",
+            "extern" if extern else "",
             f"{self._modifiers()}",
             f"{self.type}",
             f"{self.name}[{self._size()}]",
         ]
         return " ".join(h for h in lhr if h)
 
+    def is_defined_by_declaration(self):
+        """
+        @return: True if the declaration is the definition as well, i.e. inline arrays
+        and constexpr class members, which are not defined in a source file
+        """
+        return bool(self.is_inline or (self.is_constexpr and self.is_class_member()))
+
+    def has_single_definition(self):
+        """
+        @return: True for extern and inline arrays outside of classes
+        """
+        if self.is_class_member():
+            return False
+        return bool(self.is_extern or self.is_inline)
+
+    def extern_decl_to_string(self):
+        """
+        @return: declaration of the extern array, the size is derived from the items if not set
+        """
+        lhr = [
+            f"{self._attributes().prefix()}",
+            "extern",
+            f"{self._const()}",
+            f"{self.type}",
+            f"{self.name}[{self._size() or len(self.items) or ''}]",
+        ]
+        return " ".join(h for h in lhr if h)
+
     def full_decl_to_string(self):
         lhr = [
+            f"{self._attributes().prefix()}",
             f"{self._modifiers()}",
             f"{self.type}",
             f"{self.fully_qualified_name()}[{self._size()}]",
@@ -93,37 +149,56 @@ class CppArray(CppLanguageElement):
 
         That method is used for generating automatic (non-class members) arrays
         For class members use render_to_string_declaration/render_to_string_implementation methods
+        Extern arrays are only declared, e.g.
+        extern const int my_array[3];
         """
         self._sanity_check()
-        if self.is_class_member() and not (self.is_static and self.is_const):
+        if self.is_class_member() and not (
+            self.is_static and (self.is_const or self.is_constexpr)
+        ):
             raise RuntimeError(
                 "For class member variables use definition() and declaration() methods"
             )
+        if self.is_extern:
+            cpp(f"{self.extern_decl_to_string()};")
+            return
+        self._render_definition(cpp, self.decl_to_string())
 
+    def _render_definition(self, cpp, declaration):
+        """
+        Render array definition with the given declaration part
+        """
         # newline-formatting of array elements makes sense only if array is not empty
         if self.newline_align and self.items:
-            with cpp.block(
-                f"{self.decl_to_string()} =", endline=False, postfix=";"
-            ) as block:
+            with cpp.block(f"{declaration} =", endline=False, postfix=";") as block:
                 # render array items
                 self._render_value(block)
         else:
-            cpp(f"{self.decl_to_string()} = {{{self._content()}}};")
+            cpp(f"{declaration} = {{{self._content()}}};")
 
     def render_to_string_declaration(self, cpp):
         """
         Generates declaration for the C++ array.
-        Non-static arrays-class members do not supported
+        Non-static class member arrays are data members of a fixed size
 
         Example:
         static int my_class_member_array[];
+        char m_tag[4];
+
+        Extern and inline arrays could be declared outside of classes as well
+        extern const int my_array[3];
         """
         self._sanity_check()
         if not self.is_class_member():
-            raise RuntimeError(
-                "For automatic variable use its render_to_string() method"
-            )
-        cpp(f"{self.decl_to_string()};")
+            if not (self.is_extern or self.is_inline):
+                raise RuntimeError(
+                    "For automatic variable use its render_to_string() method"
+                )
+            self.render_to_string(cpp)
+        elif self.is_defined_by_declaration():
+            self._render_definition(cpp, self.decl_to_string())
+        else:
+            cpp(f"{self.decl_to_string()};")
 
     def render_to_string_implementation(self, cpp):
         """
@@ -137,27 +212,32 @@ class CppArray(CppLanguageElement):
         };
 
         Non-static arrays-class members do not supported
+
+        The only definition of an extern array keeps 'extern', e.g.
+        extern const int my_array[3] = {1, 2, 3};
+        otherwise a const array would have internal linkage in source files,
+        which do not include its declaration. The definition always has an initializer,
+        so 'extern' does not make it a declaration.
+        Inline and constexpr class member arrays are defined by their declaration,
+        nothing is rendered
         """
         self._sanity_check()
+        if self.is_defined_by_declaration():
+            return
         if not self.is_class_member():
-            raise RuntimeError(
-                "For automatic variable use its render_to_string() method"
-            )
+            if not self.is_extern:
+                raise RuntimeError(
+                    "For automatic variable use its render_to_string() method"
+                )
+            self._render_definition(cpp, self.decl_to_string(extern=True))
+            return
 
         # generate definition for the static class member arrays only
         # other types are not supported
         if not self.is_static:
             raise RuntimeError("Only static arrays as class members are supported")
 
-        # newline-formatting of array elements makes sense only if array is not empty
-        if self.newline_align and self.items:
-            with cpp.block(
-                f"{self.full_decl_to_string()} =", endline=False, postfix=";"
-            ) as block:
-                # render array items
-                self._render_value(block)
-        else:
-            cpp(f"{self.full_decl_to_string()} = {{{self._content()}}};")
+        self._render_definition(cpp, self.full_decl_to_string())
 
     def _sanity_check(self):
         """
@@ -169,6 +249,20 @@ class CppArray(CppLanguageElement):
             raise RuntimeError("Array name is not set")
         if self.is_class_member() and not self.name:
             raise RuntimeError("Class member array name is not set")
+        if self.is_extern and self.is_inline:
+            raise ValueError("Array can be either 'extern' or 'inline', not both")
+        if self.is_constexpr and (self.is_const or self.is_constinit or self.is_extern):
+            raise ValueError(
+                "Array can't be 'constexpr' and 'const', 'constinit' or 'extern'"
+            )
+        if self.is_extern and (self.is_static or self.is_class_member()):
+            raise ValueError(
+                "Only arrays outside of classes without 'static' can be 'extern'"
+            )
+        if self.is_inline and self.is_static and not self.is_class_member():
+            raise ValueError(
+                "Static inline array has a copy in every translation unit, remove 'static'"
+            )
 
     def _static(self):
         """
@@ -182,9 +276,38 @@ class CppArray(CppLanguageElement):
         """
         return "const" if self.is_const else ""
 
+    def _inline(self):
+        """
+        @return: 'inline' prefix if required
+        """
+        return "inline" if self.is_inline else ""
+
+    def _constexpr(self):
+        """
+        @return: 'constexpr' prefix if required
+        """
+        return "constexpr" if self.is_constexpr else ""
+
+    def _constinit(self):
+        """
+        @return: 'constinit' prefix if required
+        """
+        return "constinit" if self.is_constinit else ""
+
+    def _attributes(self):
+        """
+        @return: validated CppAttributes of the array
+        """
+        attributes = CppAttributes(self.attributes)
+        attributes.validate("array", self.name)
+        return attributes
+
     def _modifiers(self):
         modifiers = [
             self._static(),
+            self._inline(),
+            self._constinit(),
+            self._constexpr(),
             self._const(),
         ]
         return " ".join(m for m in modifiers if m)
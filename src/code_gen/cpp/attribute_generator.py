@@ -0,0 +1,221 @@
+import contextlib
+import contextvars
+
+__doc__ = """Attributes of functions, methods, variables and arrays.
+
+Elements accept the 'attributes' property: a list of attribute names and
+(name, value) pairs, or a dictionary {name: value}:
+    CppFunction(name='Lookup', ret_type='int', attributes=['noexcept', 'hot'])
+    CppArray(name='table', type='float', attributes={'alignas': 64})
+
+CppAttributes validates the attributes (unknown names, attributes not applicable
+to the element, conflicting attributes and invalid values raise ValueError)
+and renders them at their places:
+- 'noexcept' after the parameter list (and 'const'), in declarations and definitions,
+- '__restrict' after the '*' of pointer variables,
+- other attributes before the declaration, 'alignas' and 'section'
+  in declarations and definitions, optimization hints only in declarations.
+
+The spelling depends on the compiler profile ('gcc' by default, 'clang', 'msvc'),
+which is selected by the compiler_profile() context. Hints without an equivalent
+in the profile (e.g. 'hot' for MSVC) are omitted.
+
+Example:
+# Python code
+with compiler_profile('msvc'):
+    CppFunction(name='Parse', ret_type='int', attributes=['always_inline', 'noexcept'],
+                implementation=['return 0;']).render_to_string(cpp)
+
+// Generated C++ code
+__forceinline int Parse() noexcept {
+    return 0;
+}
+"""
+
+# attribute -> element kinds it could be applied to
+ATTRIBUTE_KINDS = {
+    "nodiscard": {"function", "method"},
+    "hot": {"function", "method"},
+    "cold": {"function", "method"},
+    "always_inline": {"function", "method"},
+    "noinline": {"function", "method"},
+    "section": {"function", "method", "variable", "array"},
+    "alignas": {"variable", "array"},
+    "noexcept": {"function", "method"},
+    "restrict": {"variable"},
+    # statement attributes, not applicable to declarations
+    "likely": set(),
+    "unlikely": set(),
+}
+
+# attributes with a value, other attributes are flags
+VALUE_ATTRIBUTES = {"section", "alignas"}
+
+# attributes repeated in the definitions, other ones are rendered in declarations only
+DEFINITION_ATTRIBUTES = {"section", "alignas", "noexcept", "restrict"}
+
+CONFLICTING_ATTRIBUTES = [("hot", "cold"), ("always_inline", "noinline")]
+
+# spelling of the attributes in the order of rendering, None if not supported
+_GNU_PROFILE = {
+    "nodiscard": "[[nodiscard]]",
+    "hot": "[[gnu::hot]]",
+    "cold": "[[gnu::cold]]",
+    "always_inline": "[[gnu::always_inline]]",
+    "noinline": "[[gnu::noinline]]",
+    "section": '[[gnu::section("{value}")]]',
+    "alignas": "alignas({value})",
+    "noexcept": "noexcept",
+    "restrict": "__restrict",
+}
+
+COMPILER_PROFILES = {
+    "gcc": _GNU_PROFILE,
+    "clang": _GNU_PROFILE,
+    "msvc": {
+        "nodiscard": "[[nodiscard]]",
+        "hot": None,
+        "cold": None,
+        "alignas": "alignas({value})",
+        # MSVC inline specifiers are declaration specifiers, they follow the attributes
+        "always_inline": "__forceinline",
+        "noinline": "__declspec(noinline)",
+        # placing to a section requires '#pragma section' or '#pragma code_seg'
+        "section": None,
+        "noexcept": "noexcept",
+        "restrict": "__restrict",
+    },
+}
+
+_compiler_profile = contextvars.ContextVar("compiler_profile", default="gcc")
+
+
+@contextlib.contextmanager
+def compiler_profile(name):
+    """
+    Render attributes for the compiler within the context
+    @param: name - 'gcc', 'clang' or 'msvc'
+    """
+    if name not in COMPILER_PROFILES:
+        raise ValueError(f"Unknown compiler profile '{name}'")
+    token = _compiler_profile.set(name)
+    try:
+        yield
+    finally:
+        _compiler_profile.reset(token)
+
+
+def current_compiler_profile():
+    """
+    @return: name of the compiler profile used for rendering
+    """
+    return _compiler_profile.get()
+
+
+class CppAttributes:
+    """
+    Validated set of element attributes
+    attributes - list of names and (name, value) pairs, dictionary {name: value}
+    or CppAttributes
+    """
+
+    def __init__(self, attributes=None):
+        self.values = {}
+        if isinstance(attributes, CppAttributes):
+            self.values = dict(attributes.values)
+        elif isinstance(attributes, dict):
+            for name, value in attributes.items():
+                self.add(name, None if value is True else value)
+        elif attributes:
+            for attribute in attributes:
+                if isinstance(attribute, tuple):
+                    self.add(*attribute)
+                else:
+                    self.add(attribute)
+
+    def add(self, name, value=None):
+        if name not in ATTRIBUTE_KINDS:
+            raise ValueError(f"Unknown attribute '{name}'")
+        self.values[name] = value
+
+    def __contains__(self, name):
+        return name in self.values
+
+    def __bool__(self):
+        return bool(self.values)
+
+    def validate(self, kind, element_name, is_ptr=False):
+        """
+        @param: kind - 'function', 'method', 'variable' or 'array'
+        @param: is_ptr - True for pointer variables, which could be '__restrict'
+        @raise: ValueError, if the attributes could not be applied to the element
+        """
+        for name, value in self.values.items():
+            if kind not in ATTRIBUTE_KINDS[name]:
+                raise ValueError(
+                    f"Attribute '{name}' is not applicable to {kind} {element_name}"
+                )
+            if name in VALUE_ATTRIBUTES and value is None:
+                raise ValueError(
+                    f"Attribute '{name}' of {element_name} requires a value"
+                )
+            if name not in VALUE_ATTRIBUTES and value is not None:
+                raise ValueError(f"Attribute '{name}' of {element_name} has no value")
+        for first, second in CONFLICTING_ATTRIBUTES:
+            if first in self.values and second in self.values:
+                raise ValueError(
+                    f"Attributes '{first}' and '{second}' of {element_name} are exclusive"
+                )
+        alignment = self.values.get("alignas")
+        if alignment is not None and (
+            not isinstance(alignment, int)
+            or alignment <= 0
+            or alignment & (alignment - 1)
+        ):
+            raise ValueError(
+                f"Alignment {alignment} of {element_name} is not a power of two"
+            )
+        section = self.values.get("section")
+        if section is not None and (
+            not isinstance(section, str) or not section or '"' in section
+        ):
+            raise ValueError(f"Section name {section!r} of {element_name} is not valid")
+        if "restrict" in self.values and not is_ptr:
+            raise ValueError(
+                f"Only pointer variables could be '__restrict', not {element_name}"
+            )
+
+    def prefix(self, definition=False):
+        """
+        @param: definition - True for a definition following a separate declaration
+        @return: string of the attributes rendered before the declaration
+        """
+        return self._render(
+            [name for name in ATTRIBUTE_KINDS if name not in ("noexcept", "restrict")],
+            definition,
+        )
+
+    def suffix(self):
+        """
+        @return: 'noexcept' if set, rendered after the parameter list
+        """
+        return self._render(["noexcept"], definition=False)
+
+    def declarator(self):
+        """
+        @return: '__restrict' if set, rendered after the pointer
+        """
+        return self._render(["restrict"], definition=False)
+
+    def _render(self, names, definition):
+        profile = COMPILER_PROFILES[current_compiler_profile()]
+        spellings = []
+        for name in names:
+            if name not in self.values:
+                continue
+            if definition and name not in DEFINITION_ATTRIBUTES:
+                continue
+            spelling = profile.get(name)
+            if spelling is not None:
+                spellings.append(spelling.format(value=self.values[name]))
+        return " ".join(spellings)
@@ -1,8 +1,25 @@
+import inspect
+import re
 from textwrap import dedent
 
+from ..core import CodeRecorder
+from .accessor_generator import CppAccessors
+from .attribute_generator import CppAttributes
 from .language_element import CppLanguageElement
 from .function_generator import CppFunction
+from .layout_generator import CppStructLayout
 from .scope_generator import CppClassScope
+from .type_base_generator import CppTemplateType
+
+
+def _argument_name(argument):
+    """
+    @return: name of the argument, e.g. 'size' for 'size_t size = 10'
+    """
+    match = re.search(r"(\w+)\s*(\[[^\]]*\]\s*)*$", argument.split("=")[0].strip())
+    if match is None:
+        raise ValueError(f"Could not find the name of the argument '{argument}'")
+    return match.group(1)
 
 
 class CppClass(CppClassScope):
@@ -11,7 +28,25 @@ class CppClass(CppClassScope):
     Usually contains a number of child elements - internal classes, enums, methods and variables.
     Available properties:
     is_struct - boolean, use 'struct' keyword for class declaration, 'class' otherwise
+    is_final - boolean, the class could not be derived from
+    parent_class - parent class name or CppClass, a (parent, access) pair, e.g.
+    ('Base', 'protected') or ('Base', 'virtual public'), or a list of them for
+    multiple inheritance
     documentation - string, '/// Example doxygen'
+    includes - list of headers required by the class, headers required by its members
+    are collected by required_includes()
+    header - string, header declaring the class (e.g. '"my_class.h"'),
+    included by the users of the class which need its complete type
+    optimize_layout - boolean, declare data members in the order with the least padding
+    and assert the size of the class (see CppStructLayout)
+    type_layouts - dictionary {type name: (size, alignment)} for the layout optimization
+    placement - CppPlacementPolicy choosing where the method bodies are defined,
+    all bodies except constexpr ones are defined in the source file if None
+    is_crtp - boolean, render the class as 'template <class Derived>' interface
+    with static polymorphism: virtual methods dispatch by
+    static_cast<Derived*>(this)->MethodImpl(...) to the derived class, which inherits
+    from Interface<Derived> (see crtp_derive), the implementations of not pure
+    virtual methods are the defaults of MethodImpl; all methods are defined in the class
 
     Example of usage:
 
@@ -48,9 +83,28 @@ class CppClass(CppClassScope):
 
     PROPERTIES = CppClassScope.PROPERTIES | {
         "is_struct",
+        "is_final",
         "parent_class",
+        "header",
+        "is_optimize_layout",
+        "type_layouts",
+        "is_crtp",
+        "placement",
     }
 
+    # template parameter and suffix of the implementations in the CRTP mode
+    CRTP_PARAMETER = "Derived"
+    CRTP_IMPL_SUFFIX = "Impl"
+
+    INHERITANCE_ACCESS = [
+        "public",
+        "protected",
+        "private",
+        "virtual public",
+        "virtual protected",
+        "virtual private",
+    ]
+
     class CppMethod(CppFunction):
         """
         The Python class that generates string representation for C++ method
@@ -61,9 +115,13 @@ class CppClass(CppClassScope):
         is_const - boolean, const method prefix, could not be static
         is_virtual - boolean, virtual method postfix, could not be static
         is_pure_virtual - boolean, ' = 0' method postfix, could not be static
+        attributes - list of attributes, e.g. ['noexcept', 'nodiscard'] (see CppAttributes)
+        hotness - number of profile samples, hotter methods are defined first (see CppHotnessProfile)
         documentation - string, '/// Example doxygen'
         implementation - reference to a function that receives 'self' and C++ code generator handle
-        (see code_generator.cpp) and generates method body without braces
+        (see code_generator.cpp) and generates method body without braces,
+        or a dotted path to such function ('my_module:method_body').
+        Coroutine functions (async def) are supported when the class is rendered by render_async()
         Ex.
         #Python code
         def functionBody(self, cpp): cpp('return 42;')
@@ -92,6 +150,8 @@ class CppClass(CppClassScope):
             "arguments",
             "implementation",
             "documentation",
+            "attributes",
+            "hotness",
         }
 
         def __init__(self, **properties):
@@ -110,6 +170,7 @@ class CppClass(CppClassScope):
             self.arguments = []
             self.implementation = None
             self.documentation = None
+            self.attributes = None
             self.init_properties(properties)
 
         def add_argument(self, argument):
@@ -124,15 +185,9 @@ class CppClass(CppClassScope):
             """
             return ", ".join(self.arguments)
 
-        def body(self, cpp):
-            """
-            The method calls Python function that creates C++ method body if handle exists
-            """
-            if self.implementation is not None:
-                self.implementation(cpp)
-
         def short_header_declaration_to_string(self):
             header = [
+                f"{self._attributes().prefix()}",
                 f"{self._static()}",
                 f"{self._modifiers_front()}",
                 f"{self._ret_type(local_scope=True)}",
@@ -145,11 +200,18 @@ class CppClass(CppClassScope):
         def short_header_implementation_to_string(self):
             return self.short_header_declaration_to_string()
 
-        def full_header_implementation_to_string(self):
+        def full_header_implementation_to_string(self, inline=False):
+            """
+            @param: inline - True for the 'inline' definition in a header
+            """
+            attributes = self._attributes()
             header = [
+                f"{attributes.prefix(definition=True)}",
+                "inline" if inline else "",
                 f"{self._ret_type(local_scope=False)}",
                 f"{self.fully_qualified_name()}({self.args()})",
                 f"{self._const()}",
+                f"{attributes.suffix()}",
             ]
             return " ".join(h for h in header if h)
 
@@ -176,7 +238,7 @@ class CppClass(CppClassScope):
                 )
 
             with cpp.block(self.short_header_implementation_to_string()) as block:
-                self.implementation(block)
+                self.body(block)
 
         def render_to_string_declaration(self, cpp):
             """
@@ -194,7 +256,7 @@ class CppClass(CppClassScope):
             else:
                 cpp(f"{self.short_header_declaration_to_string()};")
 
-        def render_to_string_implementation(self, cpp):
+        def render_to_string_implementation(self, cpp, inline=False):
             """
             Special case for a method implementation string representation.
             Generates method string in the form
@@ -204,6 +266,7 @@ class CppClass(CppClassScope):
             ...
             }
             Generates method body if `self.implementation` property exists
+            @param: inline - True for the 'inline' definition in a header
             """
             # check all properties for the consistency
             self._sanity_check()
@@ -220,8 +283,8 @@ class CppClass(CppClassScope):
 
             if self.documentation and not self.is_constexpr:
                 cpp(dedent(self.documentation))
-            with cpp.block(self.full_header_implementation_to_string()) as block:
-                self.implementation(block)
+            with cpp.block(self.full_header_implementation_to_string(inline)) as block:
+                self.body(block)
 
         def _sanity_check(self):
             """
@@ -261,6 +324,13 @@ class CppClass(CppClassScope):
                 raise ValueError(
                     f"Pure virtual method {self.name} could not be implemented"
                 )
+            self._attributes().validate("method", self.name)
+
+        def _attributes(self):
+            """
+            @return: CppAttributes of the method
+            """
+            return CppAttributes(self.attributes)
 
         def _modifiers_front(self):
             modifiers = [
@@ -273,6 +343,7 @@ class CppClass(CppClassScope):
         def _modifiers_back(self):
             modifiers = [
                 self._const(),
+                self._attributes().suffix(),
                 self._override(),
                 self._final(),
             ]
@@ -343,13 +414,21 @@ class CppClass(CppClassScope):
             return "final" if self.is_final else ""
 
     class CppCtor(CppMethod):
-        """Constructor method."""
+        """
+        Constructor method.
+        initializers - list of member initializer strings or a function returning it,
+        coroutine functions are supported when the class is rendered by render_async()
+        attributes - list of attributes, e.g. ['noexcept'] (see CppAttributes)
+        hotness - number of profile samples (see CppHotnessProfile)
+        """
 
         PROPERTIES = CppLanguageElement.PROPERTIES | {
             "arguments",
             "initializers",
             "implementation",
             "documentation",
+            "attributes",
+            "hotness",
         }
 
         def __init__(self, **properties):
@@ -360,6 +439,7 @@ class CppClass(CppClassScope):
             self.initializers = []
             self.implementation = None
             self.documentation = None
+            self.attributes = None
             self.init_properties(properties)
 
         def _sanity_check(self):
@@ -384,20 +464,40 @@ class CppClass(CppClassScope):
                 )
                 if attr_val:
                     raise ValueError(f"{self.name} ctor cannot be declared with {attr}")
+            self._attributes().validate("method", self.name)
+
+        def async_callbacks(self):
+            callbacks = super().async_callbacks()
+            if inspect.iscoroutinefunction(self.initializers):
+                callbacks.append(("initializers", self.initializers))
+            return callbacks
 
         def short_header_declaration_to_string(self):
-            return f"{self.name}({self.args()})"
+            attributes = self._attributes()
+            header = [
+                f"{attributes.prefix()}",
+                f"{self.name}({self.args()})",
+                f"{attributes.suffix()}",
+            ]
+            return " ".join(h for h in header if h)
 
         def short_header_implementation_to_string(self):
+            attributes = self._attributes()
             header = [
+                f"{attributes.prefix()}",
                 f"{self.name}({self.args()})",
+                f"{attributes.suffix()}",
                 f"{self._member_initializers()}",
             ]
             return " ".join(h for h in header if h)
 
-        def full_header_implementation_to_string(self):
+        def full_header_implementation_to_string(self, inline=False):
+            attributes = self._attributes()
             header = [
+                f"{attributes.prefix(definition=True)}",
+                "inline" if inline else "",
                 f"{self.fully_qualified_name()}({self.args()})",
+                f"{attributes.suffix()}",
                 f"{self._member_initializers()}",
             ]
             return " ".join(h for h in header if h)
@@ -407,11 +507,18 @@ class CppClass(CppClassScope):
             if not self.initializers:
                 return None
 
-            initializers = (
-                self.initializers()
-                if callable(self.initializers)
-                else self.initializers
-            )
+            initializers = self.resolved_callback("initializers")
+            if initializers is None:
+                initializers = (
+                    self.initializers()
+                    if callable(self.initializers)
+                    else self.initializers
+                )
+            if inspect.isawaitable(initializers):
+                initializers.close()
+                raise RuntimeError(
+                    f"Coroutine initializers of {self.name} ctor must be rendered by render_async()"
+                )
 
             out_list = []
             started = False
@@ -426,15 +533,47 @@ class CppClass(CppClassScope):
     def __init__(self, **properties):
         super().__init__()
         self.is_struct = False
+        self.is_final = False
         self.parent_class = None
+        self.header = None
+        self.is_optimize_layout = False
+        self.type_layouts = None
+        self.is_crtp = False
+        self.placement = None
+        # placements of the methods measured by the policy {id(method): (method, placement)}
+        self._placements = {}
         self.init_properties(properties)
 
+    def parent_classes(self):
+        """
+        @return: list of (parent, access) pairs, parent is a class name or CppClass
+        """
+        parents = self.parent_class
+        if not parents:
+            return []
+        if not isinstance(parents, list):
+            parents = [parents]
+        result = []
+        for parent in parents:
+            parent, access = parent if isinstance(parent, tuple) else (parent, "public")
+            if access not in self.INHERITANCE_ACCESS:
+                raise ValueError(
+                    f"Invalid access '{access}' to parent class of {self.name}"
+                )
+            result.append((parent, access))
+        return result
+
     def inherits(self):
         """
         @return: string representation of the inheritance
         """
-        if self._parent_class():
-            return f" : public {self._parent_class()}"
+        parents = [
+            f"{access} {CppLanguageElement.resolved_name(parent, local_scope=False)}"
+            for parent, access in self.parent_classes()
+        ]
+        if parents:
+            return f" : {', '.join(parents)}"
+        return ""
 
     # group generated sections
     def anything_public_to_declare(self):
@@ -482,8 +621,194 @@ class CppClass(CppClassScope):
         if not self.is_struct and self.anything_public_to_declare():
             cpp.label("private")
 
-        self.render_variables_declaration(cpp)
-        self.render_array_declaration(cpp)
+        self.render_data_members_declaration(cpp)
+
+    def layout(self):
+        """
+        @return: CppStructLayout of the class data members
+        """
+        return CppStructLayout(self, self.type_layouts)
+
+    def add_accessors(self, members=None, getters=True, setters=True, **options):
+        """
+        Add getters and setters of the non-static variable members (see CppAccessors)
+        @param: members - names of the members, all members if None
+        @param: options - CppAccessors properties, e.g. getter='{name}'
+        @return: list of the added methods
+        """
+        accessors = CppAccessors(self, self.type_layouts, **options)
+        selected = accessors.members()
+        if members is not None:
+            unknown = set(members) - {member.name for member in selected}
+            if unknown:
+                raise ValueError(
+                    f"Class {self.name} has no variable members {', '.join(sorted(unknown))}"
+                )
+            selected = [member for member in selected if member.name in members]
+        methods = []
+        for member in selected:
+            if getters:
+                methods.append(accessors.getter_method(member))
+            if setters:
+                methods.append(accessors.setter_method(member))
+        methods = [method for method in methods if method is not None]
+        existing = {method.name for method in self.methods}
+        for method in methods:
+            if method.name in existing:
+                raise ValueError(f"Method {method.name} of {self.name} already exists")
+        for method in methods:
+            self.add_method(method)
+        if any("std::move" in method.implementation[0] for method in methods):
+            if "<utility>" not in (self.includes or []):
+                self.includes = [*(self.includes or []), "<utility>"]
+        return methods
+
+    def render_data_members_declaration(self, cpp):
+        """
+        Render variables and arrays, the non-static ones in the optimized order
+        if the layout is optimized
+        """
+        if not self.is_optimize_layout:
+            self.render_variables_declaration(cpp)
+            self.render_array_declaration(cpp)
+            return
+        members = self.layout().optimized_members()
+        static_members = [
+            member
+            for member in [*self.variable_members, *self.array_members]
+            if member not in members
+        ]
+        for member in members + static_members:
+            member.declaration().render_to_string(cpp)
+
+    def render_size_assertion(self, cpp):
+        """
+        Generates assertion of the computed class size if the layout is optimized
+        static_assert(sizeof(MyClass) == 16, "Unexpected size of MyClass");
+        """
+        if self.is_optimize_layout:
+            cpp(
+                f"static_assert(sizeof({self.name}) == {self.layout().size()}, "
+                f'"Unexpected size of {self.name}");'
+            )
+
+    def crtp_methods(self):
+        """
+        @return: methods of the class in the CRTP mode: dispatchers of the virtual
+        methods, the default implementations of not pure virtual methods
+        and the other methods as they are
+        """
+        self._crtp_sanity_check()
+        methods = []
+        for method in self.ordered_methods():
+            if not getattr(method, "is_virtual", False):
+                methods.append(method)
+            elif method.name.startswith("~"):
+                # no virtual destructor without the virtual table
+                methods.append(
+                    self._crtp_copy(method, implementation=method.implementation or [])
+                )
+            else:
+                methods.append(self._crtp_dispatcher(method))
+                if not method.is_pure_virtual:
+                    methods.append(
+                        self._crtp_copy(
+                            method,
+                            name=f"{method.name}{self.CRTP_IMPL_SUFFIX}",
+                            documentation=None,
+                        )
+                    )
+        return methods
+
+    def crtp_derive(self, derived):
+        """
+        Rewrite the class derived from this CRTP interface to inherit from
+        Interface<Derived>, its methods overriding the interface methods
+        are renamed to '<name>Impl' and made non-virtual
+        @param: derived - CppClass, parent classes other than this one are kept
+        """
+        if not self.is_crtp:
+            raise RuntimeError(f"Class {self.name} is not a CRTP interface")
+        base = CppTemplateType(type=self, template_args=[derived])
+        parents = []
+        found = False
+        for parent, access in derived.parent_classes():
+            if parent is self or parent in (self.name, self.fully_qualified_name()):
+                parent = base
+                found = True
+            parents.append((parent, access))
+        if not found:
+            parents.append((base, "public"))
+        derived.parent_class = parents
+        interface = {
+            (m.name, m.args(), m.is_const)
+            for m in self.methods
+            if getattr(m, "is_virtual", False) and not m.name.startswith("~")
+        }
+        for method in derived.methods:
+            key = (method.name, method.args(), getattr(method, "is_const", False))
+            if key in interface:
+                method.name = f"{method.name}{self.CRTP_IMPL_SUFFIX}"
+                method.is_virtual = False
+                method.is_override = False
+                method.is_final = False
+
+    def method_placement(self, method):
+        """
+        @return: 'class', 'header' or 'source' - where the method is defined
+        (see CppPlacementPolicy), None for pure virtual methods.
+        The body is measured once, the decision is kept until the next declaration
+        of the class is rendered
+        """
+        if getattr(method, "is_pure_virtual", False):
+            return None
+        if method.is_constexpr or self.is_crtp:
+            return "class"
+        if self.placement is None or method.implementation is None:
+            return "source"
+        recorded = self._placements.get(id(method))
+        if recorded is not None and recorded[0] is method:
+            return recorded[1]
+        placement = self.placement.placement(method)
+        if placement == "header" and self.is_class_member():
+            # no definitions between the members of the enclosing class
+            placement = "class"
+        self._placements[id(method)] = (method, placement)
+        return placement
+
+    def render_methods_declaration(self, cpp):
+        """
+        Generates all class methods declaration, the methods placed to the class
+        are defined there, in the CRTP mode all methods
+        """
+        if self.is_crtp:
+            for method in self.crtp_methods():
+                method.render_to_string(cpp)
+            return
+        for method in self.ordered_methods():
+            if self.method_placement(method) == "class" and not method.is_constexpr:
+                method.render_to_string(cpp)
+            else:
+                method.render_to_string_declaration(cpp)
+
+    def implemented_methods(self):
+        """
+        @return: methods defined in the source file
+        """
+        return [
+            method
+            for method in super().implemented_methods()
+            if self.method_placement(method) == "source"
+        ]
+
+    def render_inline_definitions(self, cpp):
+        """
+        Generates 'inline' definitions of the methods placed to the header
+        """
+        for method in self.implementation_order():
+            if self.method_placement(method) == "header":
+                method.render_to_string_implementation(cpp, inline=True)
+                cpp.newline()
 
     def render_to_string(self, cpp):
         """
@@ -499,12 +824,13 @@ class CppClass(CppClassScope):
         Render to string class declaration.
         Typically handle to header should be passed as 'cpp' param
         """
+        self._placements = {}
         if self.documentation:
             cpp(dedent(self.documentation))
 
-        render_str = f"{self._class_type()} {self.name}"
-        if self._parent_class():
-            render_str += self.inherits()
+        if self.is_crtp:
+            cpp(f"template <class {self.CRTP_PARAMETER}>")
+        render_str = f"{self._class_type()} {self.name}{self._final()}{self.inherits()}"
 
         with cpp.block(render_str, postfix=";") as block:
             # in case of struct all members meant to be public
@@ -512,6 +838,8 @@ class CppClass(CppClassScope):
             self.private_class_members(block)
             self.render_internal_scopes_declarations(block)
             self.render_postfix_lines(block)
+        self.render_size_assertion(cpp)
+        self.render_inline_definitions(cpp)
 
     def render_to_string_implementation(self, cpp):
         """
@@ -523,6 +851,46 @@ class CppClass(CppClassScope):
         self.render_internal_classes_implementation(cpp)
         self.render_internal_scopes_implementation(cpp)
 
+    def _render_split(self, header, source):
+        """
+        Render class declaration to header and definition to source
+        (see CppClassScope.render_to_header_and_source)
+        """
+        self._placements = {}
+        if self.is_crtp:
+            # the template is defined in the header only
+            self.render_to_string_declaration(header)
+            return
+
+        methods_source = CodeRecorder()
+        classes_source = CodeRecorder()
+        scopes_source = CodeRecorder()
+
+        if self.documentation:
+            header(dedent(self.documentation))
+
+        render_str = f"{self._class_type()} {self.name}{self._final()}{self.inherits()}"
+
+        with header.block(render_str, postfix=";") as block:
+            if self.anything_public_to_declare():
+                if not self.is_struct:
+                    block.label("public")
+                self.render_enum_declaration(block)
+                self._render_nested_split(
+                    block, classes_source, self.internal_class_elements
+                )
+                self._render_methods_split(block, methods_source)
+            if self.anything_private_to_declare():
+                if not self.is_struct and self.anything_public_to_declare():
+                    block.label("private")
+                self.render_data_members_declaration(block)
+            self._render_nested_split(block, scopes_source, self.internal_scopes)
+            self.render_postfix_lines(block)
+        self.render_size_assertion(header)
+        self.render_inline_definitions(header)
+
+        self._render_source_split(source, methods_source, classes_source, scopes_source)
+
     ########################################
     # PRIVATE METHODS
     def _class_type(self):
@@ -531,8 +899,67 @@ class CppClass(CppClassScope):
         """
         return "struct" if self.is_struct else "class"
 
-    def _parent_class(self):
+    def _final(self):
+        """
+        @return: ' final' for final classes
+        """
+        return " final" if self.is_final else ""
+
+    def _crtp_copy(self, method, **changes):
+        """
+        @return: non-virtual copy of the method with the changed properties
+        """
+        properties = {
+            "name": method.name,
+            "ret_type": method.ret_type,
+            "arguments": list(method.arguments),
+            "is_const": method.is_const,
+            "implementation": method.implementation,
+            "documentation": method.documentation,
+            "attributes": method.attributes,
+            "hotness": method.hotness,
+        }
+        properties.update(changes)
+        copy = CppClass.CppMethod(**properties)
+        copy.ref_to_parent = self
+        copy.is_method = True
+        return copy
+
+    def _crtp_dispatcher(self, method):
         """
-        @return: parent class object
+        @return: method calling '<name>Impl' of the derived class
         """
-        return self.parent_class if self.parent_class else ""
+        derived = self.CRTP_PARAMETER
+        if method.is_const:
+            derived = f"const {derived}"
+        arguments = []
+        for argument in method.arguments:
+            name = _argument_name(argument)
+            # rvalue references are named, i.e. lvalues, in the dispatcher
+            arguments.append(
+                f"static_cast<decltype({name})>({name})" if "&&" in argument else name
+            )
+        call = (
+            f"static_cast<{derived}*>(this)->"
+            f"{method.name}{self.CRTP_IMPL_SUFFIX}({', '.join(arguments)})"
+        )
+        return self._crtp_copy(method, implementation=[f"return {call};"])
+
+    def _crtp_sanity_check(self):
+        """
+        Check whether the class could be rendered as a CRTP template
+        """
+        if self.internal_class_elements or self.internal_scopes:
+            raise ValueError(
+                f"Nested classes and scopes of CRTP interface {self.name} are not supported"
+            )
+        static_members = [
+            *(v for v in self.variable_members if v.type.is_static),
+            *(a for a in self.array_members if a.is_static),
+        ]
+        for member in static_members:
+            if not member.is_defined_by_declaration():
+                raise ValueError(
+                    f"Static member {member.name} of CRTP interface {self.name} "
+                    "must be inline or constexpr"
+                )
@@ -0,0 +1,267 @@
+import re
+
+from .array_generator import CppArray
+from .enum_generator import CppEnum
+from .type_base_generator import CppBaseType
+from .variable_generator import CppVariable
+
+__doc__ = """Promotion of literal-initialized variables and arrays to constexpr and constinit.
+
+Const variables and arrays with static storage are initialized dynamically at startup
+unless the compiler proves their initializers constant, and the order of such
+initializations across translation units is unspecified.
+CppConstantPromotion finds variables and arrays of literal types, which are initialized
+only by literals (numbers, characters, strings, true/false/nullptr), by names of other
+constants (constexpr variables, enumerators, names passed in 'constants') and by
+arithmetic on them, and promotes them:
+- const variables and arrays become constexpr ('static constexpr' for class members,
+  which are then defined in the class), 'const' of pointers qualifies the pointed-to
+  data and is kept in the type, e.g. 'constexpr const char* name = "x";',
+- mutable variables and arrays outside of classes become constinit (C++20 only).
+
+Example:
+# Python code
+promotion = CppConstantPromotion([table, my_class], standard=20)
+for element, keyword in promotion.apply():
+    print(element.name, keyword)
+
+// Generated C++ code
+constexpr int table[] = {1, 2, 3};
+"""
+
+# fundamental and standard library types, which are literal types
+LITERAL_TYPES = {
+    "bool",
+    "char",
+    "signed char",
+    "unsigned char",
+    "wchar_t",
+    "char8_t",
+    "char16_t",
+    "char32_t",
+    "short",
+    "unsigned short",
+    "int",
+    "unsigned",
+    "unsigned int",
+    "long",
+    "unsigned long",
+    "long long",
+    "unsigned long long",
+    "float",
+    "double",
+    "long double",
+    "size_t",
+    "ptrdiff_t",
+    "intptr_t",
+    "uintptr_t",
+    "std::string_view",
+    "std::wstring_view",
+    "std::u8string_view",
+    "std::u16string_view",
+    "std::u32string_view",
+}
+
+_FIXED_WIDTH_TYPE = re.compile(
+    r"(?:std::)?u?int(?:_least|_fast)?(?:8|16|32|64)_t|(?:std::)?u?intmax_t"
+)
+
+_TOKEN = re.compile(
+    r"""
+    (?P<space>\s+)
+    | (?P<string>(?:u8|u|U|L)?"(?:[^"\\]|\\.)*")
+    | (?P<char>(?:u8|u|U|L)?'(?:[^'\\]|\\.)+')
+    | (?P<number>(?:0[xX][0-9a-fA-F']+|0[bB][01']+|(?:\d[\d']*\.?[\d']*|\.\d[\d']*)
+        (?:[eE][+-]?\d+)?)[uUlLfF]*)
+    | (?P<name>(?:::)?[A-Za-z_]\w*(?:::[A-Za-z_]\w*)*)
+    | (?P<operator><<|>>|<=|>=|==|!=|&&|\|\||[-+*/%~!&|^<>?:(),{}])
+    """,
+    re.VERBOSE,
+)
+
+_KEYWORD_LITERALS = {"true", "false", "nullptr"}
+
+_CONST_PREFIX = re.compile(r"const\b")
+
+
+def is_literal_value(value, constants=()):
+    """
+    Check if the value is a constant expression built from literals and known constants
+    @param: value - string, C++ initializer, e.g. '1', '"name"', '{1, 2.5f}', 'kSize * 2'
+    @param: constants - names of constants, which could be used in the value
+    @return: True if the value could initialize a constexpr object
+    """
+    if not isinstance(value, str) or not value.strip():
+        return False
+    position = 0
+    operands = 0
+    while position < len(value):
+        match = _TOKEN.match(value, position)
+        if match is None:
+            return False
+        position = match.end()
+        kind = match.lastgroup
+        if kind == "name":
+            name = match.group(kind).lstrip(":")
+            if name not in _KEYWORD_LITERALS and name not in constants:
+                return False
+            operands += 1
+        elif kind in ("string", "char", "number"):
+            operands += 1
+    return operands > 0
+
+
+def is_literal_type(ctype, literal_types=()):
+    """
+    @param: ctype - string type or CppBaseType
+    @param: literal_types - names of additional literal types (e.g. aggregates of literals)
+    @return: True if objects of the type could be constexpr
+    """
+    if isinstance(ctype, CppBaseType):
+        if ctype.is_ref:
+            return False
+        if ctype.is_ptr:
+            return True
+        return is_literal_type(ctype.type, literal_types)
+    if not isinstance(ctype, str):
+        return False
+    name = " ".join(ctype.replace("const ", " ").split())
+    if name.endswith("*"):
+        return True
+    return (
+        name in LITERAL_TYPES
+        or f"std::{name}" in LITERAL_TYPES
+        or name in literal_types
+        or _FIXED_WIDTH_TYPE.fullmatch(name) is not None
+    )
+
+
+def _is_pointer(ctype):
+    """
+    @param: ctype - string type or CppBaseType
+    @return: True for pointer types
+    """
+    if isinstance(ctype, CppBaseType):
+        return bool(ctype.is_ptr) or _is_pointer(ctype.type)
+    return isinstance(ctype, str) and ctype.rstrip().endswith("*")
+
+
+class CppConstantPromotion:
+    """
+    Finds variables and arrays, which could be constexpr or constinit
+    Available properties:
+    elements - list of variables, arrays, classes and scopes
+    constants - names of constants defined elsewhere, which could be used in initializers
+    literal_types - names of additional literal types, e.g. structures of literals
+    standard - C++ standard version, 'constinit' requires 20 or later, 17 by default
+    """
+
+    def __init__(self, elements, constants=(), literal_types=(), standard=17):
+        self.elements = list(elements)
+        self.constants = set(constants)
+        self.literal_types = set(literal_types)
+        self.standard = standard
+
+    def promotions(self):
+        """
+        Analyse the elements without changing them
+        @return: list of (element, 'constexpr' or 'constinit') pairs in the order of the elements
+        """
+        items = [
+            item
+            for element in self.elements
+            for item in element.walk()
+            if isinstance(item, (CppVariable, CppArray, CppEnum))
+        ]
+        constants = set(self.constants)
+        for item in items:
+            if isinstance(item, CppEnum):
+                constants.update(self._names(item, item.enumerators()))
+            elif self._is_constexpr(item):
+                constants.update(self._names(item, [item.name]))
+
+        promoted = {}
+        changed = True
+        # initializers could reference constants promoted in the previous pass
+        while changed:
+            changed = False
+            for item in items:
+                if id(item) in promoted or isinstance(item, CppEnum):
+                    continue
+                keyword = self._promotion(item, constants)
+                if keyword is not None:
+                    promoted[id(item)] = (item, keyword)
+                    changed = True
+                    if keyword == "constexpr":
+                        constants.update(self._names(item, [item.name]))
+        return [promoted[id(item)] for item in items if id(item) in promoted]
+
+    def apply(self):
+        """
+        Promote the elements
+        @return: list of (element, 'constexpr' or 'constinit') pairs
+        """
+        result = self.promotions()
+        for item, keyword in result:
+            target = item.type if isinstance(item, CppVariable) else item
+            if keyword == "constexpr":
+                if target.is_const and _is_pointer(item.type):
+                    # 'constexpr' qualifies the pointer, the data stays const
+                    if not _CONST_PREFIX.match(target.type):
+                        target.type = f"const {target.type}"
+                target.is_const = False
+                target.is_constexpr = True
+            else:
+                target.is_constinit = True
+        return result
+
+    @staticmethod
+    def _names(item, names):
+        """
+        @return: names of the constants as used locally and with the parent qualifier
+        """
+        qualifier = item._parent_qualifier()
+        if isinstance(item, CppEnum):
+            scoped = [f"{item.name}::{name}" for name in names]
+            scoped += [f"{qualifier}{name}" for name in scoped]
+            if item.is_enum_class:
+                return scoped
+            # enumerators of unscoped enums are visible in the enclosing scope
+            return scoped + names + [f"{qualifier}{name}" for name in names]
+        return names + [f"{qualifier}{name}" for name in names]
+
+    @staticmethod
+    def _is_constexpr(item):
+        if isinstance(item, CppVariable):
+            return item.type.is_constexpr
+        return item.is_constexpr
+
+    def _promotion(self, item, constants):
+        """
+        @return: 'constexpr', 'constinit' or None
+        """
+        if isinstance(item, CppVariable):
+            ctype = item.type
+            static = ctype.is_static
+            values = [item.value]
+        else:
+            ctype = item
+            static = item.is_static
+            values = item.items
+        if ctype.is_constexpr or ctype.is_constinit or ctype.is_extern:
+            return None
+        # non-static class members are initialized by constructors
+        if item.is_class_member() and not static:
+            return None
+        if not values or not all(is_literal_value(v, constants) for v in values):
+            return None
+        if not is_literal_type(item.type, self.literal_types):
+            return None
+        if ctype.is_const:
+            if _is_pointer(item.type) and not isinstance(ctype.type, str):
+                # 'const' of the pointed-to element type could not be kept
+                return None
+            return "constexpr"
+        if self.standard >= 20 and not item.is_class_member():
+            return "constinit"
+        return None
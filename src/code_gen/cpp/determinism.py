@@ -0,0 +1,151 @@
+import difflib
+import json
+import os
+import subprocess
+import sys
+
+from ..core import resolve_callable
+from .language_element import canonical_order
+
+__doc__ = """Audit of generated files for run-to-run nondeterminism.
+
+Compiler caches (ccache, sccache) hit only if the generated files are byte-identical
+between generator runs. Iterating sets and dicts of strings gives different orders
+in every Python process (see PYTHONHASHSEED), so elements filled from them
+change the generated files.
+
+audit_determinism() runs a builder in separate processes with different hash seeds
+and returns the differences of the rendered files. The builder is rendered
+in the canonical_order() context by default, which sorts methods, so only
+order dependencies, which could not be fixed by the canonical order, are reported.
+
+The builder is a module-level function (or its dotted path), which builds
+the elements and returns the rendered text, a {filename: text} dictionary
+or a list of (filename, text) pairs (e.g. CppProject.render_to_strings()).
+
+Example:
+# Python code
+diffs = audit_determinism('my_generator.build:render_all', hash_seeds=(0, 1, 2))
+assert not diffs, "\\n".join(diffs)
+"""
+
+
+class CppDeterminismError(RuntimeError):
+    """
+    Raised by check_determinism() when the generated files differ between runs
+    diffs - list of unified diffs of the differing files
+    """
+
+    def __init__(self, diffs):
+        self.diffs = diffs
+        super().__init__(
+            f"{len(diffs)} generated file(s) differ between runs\n" + "\n".join(diffs)
+        )
+
+
+def _builder_path(builder):
+    """
+    @return: dotted path of the builder, which could be imported in another process
+    """
+    if isinstance(builder, str):
+        return builder
+    module = getattr(builder, "__module__", None)
+    qualname = getattr(builder, "__qualname__", "")
+    if not module or module == "__main__" or "<" in qualname:
+        raise TypeError(
+            f"Builder {builder!r} must be a module-level function or its dotted path"
+        )
+    return f"{module}:{qualname}"
+
+
+def render_outputs(builder, canonical=True):
+    """
+    Run the builder in the current process
+    @param: canonical - render in the canonical_order() context
+    @return: dictionary {filename: text}, the filename is None if the builder returns a string
+    """
+    build = resolve_callable(builder)
+    if canonical:
+        with canonical_order():
+            outputs = build()
+    else:
+        outputs = build()
+    if isinstance(outputs, str):
+        return {None: outputs}
+    return dict(outputs)
+
+
+def _render_in_process(path, hash_seed, canonical):
+    """
+    Run the builder in a new Python process with the given hash seed
+    """
+    env = dict(os.environ)
+    env["PYTHONHASHSEED"] = str(hash_seed)
+    env["PYTHONPATH"] = os.pathsep.join(os.path.abspath(p) for p in sys.path)
+    command = [
+        sys.executable,
+        "-c",
+        "import sys; from code_gen.cpp.determinism import _main; _main(sys.argv[1:])",
+        path,
+        "canonical" if canonical else "ordered",
+    ]
+    process = subprocess.run(command, env=env, capture_output=True, text=True)
+    if process.returncode != 0:
+        raise RuntimeError(
+            f"Builder '{path}' failed with hash seed {hash_seed}\n{process.stderr}"
+        )
+    return {filename: text for filename, text in json.loads(process.stdout)}
+
+
+def _main(argv):
+    path, mode = argv
+    outputs = render_outputs(path, canonical=(mode == "canonical"))
+    json.dump(list(outputs.items()), sys.stdout)
+
+
+def _diff(filename, reference, other, hash_seeds):
+    name = filename if filename is not None else "<output>"
+    if reference is None or other is None:
+        missing = hash_seeds[0] if reference is None else hash_seeds[1]
+        return f"{name}: not generated with hash seed {missing}\n"
+    return "".join(
+        difflib.unified_diff(
+            reference.splitlines(keepends=True),
+            other.splitlines(keepends=True),
+            f"{name} (hash seed {hash_seeds[0]})",
+            f"{name} (hash seed {hash_seeds[1]})",
+        )
+    )
+
+
+def audit_determinism(builder, hash_seeds=(0, 1), canonical=True):
+    """
+    Render the builder output once for every hash seed and compare the results
+    @param: builder - module-level function or its dotted path
+    @param: hash_seeds - PYTHONHASHSEED values of the runs, at least two
+    @param: canonical - render in the canonical_order() context
+    @return: list of unified diffs against the first run, empty if the output is stable
+    """
+    if len(hash_seeds) < 2:
+        raise ValueError("At least two hash seeds are required")
+    path = _builder_path(builder)
+    runs = [_render_in_process(path, seed, canonical) for seed in hash_seeds]
+    reference = runs[0]
+    diffs = []
+    for seed, outputs in zip(hash_seeds[1:], runs[1:]):
+        for filename in list(dict.fromkeys([*reference, *outputs])):
+            text = reference.get(filename)
+            other = outputs.get(filename)
+            if text != other:
+                diffs.append(_diff(filename, text, other, (hash_seeds[0], seed)))
+    return diffs
+
+
+def check_determinism(builder, hash_seeds=(0, 1), canonical=True):
+    """
+    Same as audit_determinism()
+    @raise: CppDeterminismError, if the output differs between the runs
+    """
+    diffs = audit_determinism(builder, hash_seeds, canonical)
+    if diffs:
+        raise CppDeterminismError(diffs)
@@ -1,14 +1,24 @@
+from .function_generator import CppFunction
 from .language_element import CppLanguageElement
 
 
 class CppEnum(CppLanguageElement):
     """
     The Python class that generates string representation for C++ enum
-    All enum elements are explicitly initialized with incremented values
+    All enum elements are explicitly initialized with incremented values,
+    elements added with a value restart the numbering from it
 
     Available properties:
     prefix - string, prefix added to every enum element, 'e' by default ('eItem1')
     add_counter - boolean, terminating value that shows count of enum elements added, 'True' by default.
+        The counter follows the last element if the elements have explicit values
+    item_values - dictionary {item: integer value} of the elements with explicit values
+    is_flags - boolean, bitflags enum: the elements are single bits '1u << n' (explicit values
+        are bit positions), the terminating value is the mask of all bits ('eItemsAll'),
+        the underlying type is the smallest unsigned type holding all bits (at most 64).
+        Constexpr operators |, &, ^, ~, |=, &=, ^= and the helpers <name>HasAll,
+        <name>HasAny and <name>Popcount (std::popcount, C++20) are rendered after the enum
+        (as hidden friends if the enum is a class member)
 
     Example of usage:
     # Python code
@@ -35,27 +45,117 @@ class CppEnum(CppLanguageElement):
         "is_enum_class",
         "add_counter",
         "enum_items",
+        "item_values",
+        "is_flags",
     }
 
+    FLAG_TYPES = (("uint8_t", 8), ("uint16_t", 16), ("uint32_t", 32), ("uint64_t", 64))
+
     def __init__(self, **properties):
         super().__init__()
         self.prefix = None
         self.enum_class = False
         self.add_counter = True
         self.enum_items = []
+        self.item_values = {}
+        self.is_flags = False
         self.init_properties(properties)
 
-    def add_item(self, item):
+    def add_item(self, item, value=None):
         """
         @param: item - string representation for the enum element
+        @param: value - integer value of the element, the previous value + 1 if not set
         """
+        if value is not None:
+            if not isinstance(value, int) or isinstance(value, bool):
+                raise ValueError(f"Value of enum item {item} must be an integer")
+            self.item_values[item] = value
         self.enum_items.append(item)
 
     def add_items(self, items):
         """
-        @param: items - list of strings
+        @param: items - list of strings or (string, integer value) pairs
+        """
+        for item in items:
+            if isinstance(item, tuple):
+                self.add_item(*item)
+            else:
+                self.add_item(item)
+
+    def _positions(self):
+        """
+        @return: list of the element numbers, i.e. the values or the bit positions of flags
+        """
+        positions = []
+        counter = 0
+        for item in self.enum_items:
+            counter = self.item_values.get(item, counter)
+            positions.append(counter)
+            counter += 1
+        return positions
+
+    def values(self):
+        """
+        @return: list of integer values of the enum items in the declaration order
+        (without the terminating counter)
+        """
+        if self.is_flags:
+            return [1 << bit for bit in self._flag_bits()]
+        return self._positions()
+
+    def _flag_bits(self):
+        bits = self._positions()
+        for item, bit in zip(self.enum_items, bits):
+            if not 0 <= bit < 64:
+                raise ValueError(
+                    f"Flag {item} of enum {self.name} must be a bit from 0 to 63, not {bit}"
+                )
+        return bits
+
+    def flags_mask(self):
+        """
+        @return: integer mask of all flags
+        """
+        mask = 0
+        for value in self.values():
+            mask |= value
+        return mask
+
+    def underlying_type(self):
+        """
+        @return: the smallest unsigned type holding all flags, None for regular enums
+        """
+        if not self.is_flags:
+            return None
+        width = max(self._flag_bits(), default=0) + 1
+        return next(name for name, bits in self.FLAG_TYPES if width <= bits)
+
+    def required_includes(self):
+        includes = super().required_includes()
+        if self.is_flags:
+            includes.extend(h for h in ("<bit>", "<cstdint>") if h not in includes)
+        return includes
+
+    def is_contiguous(self):
+        """
+        @return: True if the distinct values of the items form a range without gaps
         """
-        self.enum_items.extend(items)
+        values = set(self.values())
+        return not values or max(values) - min(values) + 1 == len(values)
+
+    def enumerators(self):
+        """
+        @return: list of enumerator names in the declaration order,
+        including the terminating counter if it is added
+        """
+        final_prefix = self.prefix if self.prefix is not None else "e"
+        names = [f"{final_prefix}{item}" for item in self.enum_items]
+        if self.add_counter in [None, True]:
+            names.append(f"{final_prefix}{self._counter_name()}")
+        return names
+
+    def _counter_name(self):
+        return f"{self.name}All" if self.is_flags else f"{self.name}Count"
 
     def short_header_declaration_to_string(self):
         header = [
@@ -63,6 +163,8 @@ class CppEnum(CppLanguageElement):
             f"{self._enum_class()}",
             f"{self.name}",
         ]
+        if self.is_flags:
+            header += [":", self.underlying_type()]
         return " ".join(h for h in header if h)
 
     def render_to_string(self, cpp):
@@ -75,17 +177,105 @@ class CppEnum(CppLanguageElement):
             eMyEnumCount = 2
         }
         """
-        counter = 0
+        if self.is_flags:
+            values = [f"{self._literal(1)} << {bit}" for bit in self._flag_bits()]
+            counter = f"{self.flags_mask():#x}{self._literal('')}"
+        else:
+            values = self.values()
+            counter = values[-1] + 1 if values else 0
         final_prefix = self.prefix if self.prefix is not None else "e"
         with cpp.block(
             self.short_header_declaration_to_string(), endline=False, postfix=";"
         ) as block:
-            for item in self.enum_items:
-                block(f"{final_prefix}{item} = {counter},")
-                counter += 1
+            for item, value in zip(self.enum_items, values):
+                block(f"{final_prefix}{item} = {value},")
             if self.add_counter in [None, True]:
-                last_element = f"{final_prefix}{self.name}Count = {counter}"
+                last_element = f"{final_prefix}{self._counter_name()} = {counter}"
                 block(last_element)
+        if self.is_flags:
+            for function in self.flag_functions():
+                function.render_to_string(cpp)
+
+    def flag_functions(self):
+        """
+        @return: list of constexpr CppFunction operators and helpers of the bitflags enum
+        """
+        name = self.name
+        # arithmetic is done in unsigned int at least, as smaller types are promoted
+        work = "uint64_t" if self.underlying_type() == "uint64_t" else "uint32_t"
+
+        def cast(value):
+            return f"static_cast<{work}>({value})"
+
+        def function(function_name, ret_type, arguments, result):
+            return CppFunction(
+                name=function_name,
+                ret_type=ret_type,
+                is_constexpr=True,
+                is_friend=self.is_class_member(),
+                arguments=arguments,
+                implementation=[f"return {result};"],
+            )
+
+        functions = []
+        for operator in "|&^":
+            functions.append(
+                function(
+                    f"operator{operator}",
+                    name,
+                    [f"{name} lhs", f"{name} rhs"],
+                    f"static_cast<{name}>({cast('lhs')} {operator} {cast('rhs')})",
+                )
+            )
+        functions.append(
+            function(
+                "operator~",
+                name,
+                [f"{name} value"],
+                f"static_cast<{name}>(~{cast('value')} & "
+                f"{self.flags_mask():#x}{self._literal('')})",
+            )
+        )
+        for operator in "|&^":
+            functions.append(
+                function(
+                    f"operator{operator}=",
+                    f"{name}&",
+                    [f"{name}& lhs", f"{name} rhs"],
+                    f"lhs = lhs {operator} rhs",
+                )
+            )
+        functions.append(
+            function(
+                f"{name}HasAll",
+                "bool",
+                [f"{name} value", f"{name} flags"],
+                f"({cast('value')} & {cast('flags')}) == {cast('flags')}",
+            )
+        )
+        functions.append(
+            function(
+                f"{name}HasAny",
+                "bool",
+                [f"{name} value", f"{name} flags"],
+                f"({cast('value')} & {cast('flags')}) != 0",
+            )
+        )
+        functions.append(
+            function(
+                f"{name}Popcount",
+                "int",
+                [f"{name} value"],
+                f"std::popcount({cast('value')})",
+            )
+        )
+        return functions
+
+    def _literal(self, value):
+        """
+        @return: unsigned literal of the underlying type width, e.g. '1u' or '1ull'
+        """
+        return f"{value}ull" if self.underlying_type() == "uint64_t" else f"{value}u"
 
     def _enum_class(self):
         return "class" if self.is_enum_class else ""
@@ -0,0 +1,248 @@
+from .array_generator import CppArray
+from .function_generator import CppFunction
+from .language_element import CppLanguageElement
+from .statement_generator import CppBlock
+from .string_table_generator import CppStringTable, chunked
+
+__doc__ = """Perfect-hash lookup of enum values by their names.
+
+CppEnumPerfectHash generates a function converting a string to the enum value
+with O(1) lookup instead of a chain of string comparisons.
+The names are placed to a minimal perfect hash table by the hash and displace method:
+the first hash of a name selects a bucket, the displacement stored for the bucket
+either selects the slot directly (buckets with one name) or seeds the second hash,
+which selects the slot. Every slot holds exactly one name, so one comparison verifies
+that the looked up string is a name of the enum.
+The table is built in near-linear time, large buckets are placed first.
+
+Example:
+# Python code
+items = CppEnum(name='Items', enum_class=True)
+items.add_items(['Chair', 'Table', 'Shelve'])
+lookup = CppEnumPerfectHash(enum=items)
+lookup.render_to_string_declaration(header)
+lookup.render_to_string_implementation(source)
+
+// Generated C++ code (header)
+bool ItemsFromString(std::string_view name, Items& value);
+
+// Generated C++ code (source)
+constexpr uint32_t ItemsFromString_hash(std::string_view key, uint32_t seed) {...}
+static constexpr int32_t ItemsFromString_displacements[] = {...};
+static constexpr Items ItemsFromString_values[] = {...};
+static const char ItemsFromString_keys_pool[] = ...;
+static const uint16_t ItemsFromString_keys_offsets[] = {...};
+bool ItemsFromString(std::string_view name, Items& value) {...}
+"""
+
+FNV_PRIME = 0x01000193
+
+
+def perfect_hash(data, seed):
+    """
+    32-bit FNV hash with a seed, the generated C++ hash function computes the same values
+    @param: data - bytes
+    @param: seed - integer, FNV prime is used for 0
+    """
+    h = seed or FNV_PRIME
+    for byte in data:
+        h = ((h * FNV_PRIME) ^ byte) & 0xFFFFFFFF
+    return h
+
+
+def build_perfect_hash(keys):
+    """
+    Build a minimal perfect hash table
+    @param: keys - list of unique bytes
+    @return: (displacements, slots) - displacement of every bucket and the key index
+    stored in every slot; a negative displacement d selects the slot -d - 1,
+    other displacements are the seeds of the second hash
+    """
+    size = len(keys)
+    buckets = [[] for _ in range(size)]
+    for index, key in enumerate(keys):
+        buckets[perfect_hash(key, 0) % size].append(index)
+
+    displacements = [0] * size
+    slots = [None] * size
+    # place the large buckets first, while the table is still empty
+    order = sorted(range(size), key=lambda b: len(buckets[b]), reverse=True)
+    position = 0
+    for position, bucket in enumerate(order):
+        items = buckets[bucket]
+        if len(items) <= 1:
+            break
+        seed = 1
+        while True:
+            placed = {perfect_hash(keys[index], seed) % size for index in items}
+            if len(placed) == len(items) and all(slots[s] is None for s in placed):
+                break
+            seed += 1
+            if seed > 0x7FFFFFFF:
+                raise RuntimeError("Perfect hash table could not be built")
+        displacements[bucket] = seed
+        for index in items:
+            slots[perfect_hash(keys[index], seed) % size] = index
+    else:
+        position = size
+
+    # buckets with one key are placed to the free slots directly
+    free = (s for s in range(size) if slots[s] is None)
+    for bucket in order[position:]:
+        items = buckets[bucket]
+        if not items:
+            break
+        slot = next(free)
+        displacements[bucket] = -slot - 1
+        slots[slot] = items[0]
+    return displacements, slots
+
+
+class CppEnumPerfectHash(CppLanguageElement):
+    """
+    The Python class that generates string to enum conversion by a perfect hash
+    Available properties:
+    enum - CppEnum instance
+    name - name of the generated function, '<enum name>FromString' by default
+    names - list of the strings for the enum items, the item names without prefix by default
+    includes - headers required by the lookup
+    """
+
+    PROPERTIES = CppLanguageElement.PROPERTIES | {
+        "enum",
+        "names",
+    }
+
+    def __init__(self, **properties):
+        super().__init__()
+        self.enum = None
+        self.names = None
+        self.includes = ["<cstddef>", "<cstdint>", "<string_view>"]
+        self.init_properties(properties)
+
+    def function_name(self):
+        return self.name or f"{self.enum.name}FromString"
+
+    def keys(self):
+        """
+        @return: list of the looked up strings in the order of the enum items
+        """
+        return (
+            list(self.names) if self.names is not None else list(self.enum.enum_items)
+        )
+
+    def enum_values(self):
+        """
+        @return: list of the qualified enum values in the order of the enum items
+        """
+        enum_name = self.enum.fully_qualified_name()
+        enumerators = self.enum.enumerators()[: len(self.enum.enum_items)]
+        return [f"{enum_name}::{enumerator}" for enumerator in enumerators]
+
+    def table(self):
+        """
+        @return: (displacements, slots) - see build_perfect_hash
+        """
+        self._sanity_check()
+        return build_perfect_hash([key.encode("utf-8") for key in self.keys()])
+
+    def lookup_function(self):
+        """
+        @return: CppFunction converting the name to the enum value
+        """
+        name = self.function_name()
+        size = len(self.keys())
+        return CppFunction(
+            name=name,
+            ret_type="bool",
+            arguments=[
+                "std::string_view name",
+                f"{self.enum.fully_qualified_name()}& value",
+            ],
+            implementation=[
+                f"const uint32_t bucket = {name}_hash(name, 0) % {size};",
+                f"const int32_t displacement = {name}_displacements[bucket];",
+                "const uint32_t slot = displacement < 0",
+                "    ? static_cast<uint32_t>(-displacement - 1)",
+                f"    : {name}_hash(name, static_cast<uint32_t>(displacement)) % {size};",
+                f"if (name != {name}_keys_pool + {name}_keys_offsets[slot])",
+                CppBlock(None, ["return false;"]),
+                f"value = {name}_values[slot];",
+                "return true;",
+            ],
+        )
+
+    def hash_function(self):
+        """
+        @return: constexpr CppFunction computing the same hash as perfect_hash()
+        """
+        return CppFunction(
+            name=f"{self.function_name()}_hash",
+            ret_type="uint32_t",
+            is_constexpr=True,
+            arguments=["std::string_view key", "uint32_t seed"],
+            implementation=[
+                f"uint32_t h = seed ? seed : {FNV_PRIME:#010x}u;",
+                CppBlock(
+                    "for (char c : key)",
+                    [f"h = (h * {FNV_PRIME:#010x}u) ^ static_cast<unsigned char>(c);"],
+                ),
+                "return h;",
+            ],
+        )
+
+    def render_to_string(self, cpp):
+        """
+        Render the hash function, the tables and the lookup function
+        """
+        name = self.function_name()
+        displacements, slots = self.table()
+        keys = self.keys()
+        values = self.enum_values()
+
+        self.hash_function().render_to_string(cpp)
+        for array_name, array_type, items in (
+            (f"{name}_displacements", "int32_t", [str(d) for d in displacements]),
+            (
+                f"{name}_values",
+                self.enum.fully_qualified_name(),
+                [values[index] for index in slots],
+            ),
+        ):
+            array = CppArray(
+                name=array_name,
+                type=array_type,
+                is_static=True,
+                is_constexpr=True,
+                newline_align=len(items) > 16,
+            )
+            array.add_array_items(chunked(items, 16 if len(items) > 16 else len(items)))
+            array.render_to_string(cpp)
+        CppStringTable(
+            name=f"{name}_keys", strings=[keys[index] for index in slots]
+        ).render_tables(cpp)
+        self.lookup_function().render_to_string(cpp)
+
+    def render_to_string_declaration(self, cpp):
+        """
+        Render the lookup function declaration, e.g.
+        bool ItemsFromString(std::string_view name, Items& value);
+        """
+        self.lookup_function().render_to_string_declaration(cpp)
+
+    def render_to_string_implementation(self, cpp):
+        """
+        Same as render_to_string(), the tables have internal linkage
+        """
+        self.render_to_string(cpp)
+
+    def _sanity_check(self):
+        if self.enum is None:
+            raise RuntimeError("Enum is not set")
+        keys = self.keys()
+        if not keys:
+            raise ValueError(f"Enum {self.enum.name} has no items")
+        if len(keys) != len(self.enum.enum_items):
+            raise ValueError("Number of names does not match the number of enum items")
+        if len(set(keys)) != len(keys):
+            raise ValueError(f"Names of enum {self.enum.name} are not unique")
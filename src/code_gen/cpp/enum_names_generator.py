@@ -0,0 +1,177 @@
+from .array_generator import CppArray
+from .function_generator import CppFunction
+from .language_element import CppLanguageElement
+from .statement_generator import CppBlock
+from .string_table_generator import CppStringTable, chunked
+
+__doc__ = """Lookup of enum item names by their values.
+
+A 'switch' over all enum values compiles slowly for large enums and is often compiled
+to a chain of branches. CppEnumNames generates a function converting the enum value
+to its name by a table lookup instead:
+- enums with contiguous values index the pooled string table (see CppStringTable)
+  directly by the value,
+- enums with sparse explicit values search the value in a sorted array and use
+  the found position as the index to the string table.
+Values without a name return nullptr. If several items share a value,
+the name of the first one is returned.
+
+Example:
+# Python code
+items = CppEnum(name='Items', enum_class=True)
+items.add_items(['Chair', 'Table', 'Shelve'])
+names = CppEnumNames(enum=items)
+names.render_to_string_declaration(header)
+names.render_to_string_implementation(source)
+
+// Generated C++ code (header)
+const char* ItemsToString(Items value);
+
+// Generated C++ code (source)
+static const char ItemsToString_names_pool[] = ...;
+static const uint16_t ItemsToString_names_offsets[] = {0, 6, 12};
+const char* ItemsToString(Items value) {
+    const size_t index = static_cast<size_t>(value);
+    ...
+}
+"""
+
+
+class CppEnumNames(CppLanguageElement):
+    """
+    The Python class that generates enum to string conversion by a table lookup
+    Available properties:
+    enum - CppEnum instance
+    name - name of the generated function, '<enum name>ToString' by default
+    names - list of the strings for the enum items, the item names without prefix by default
+    includes - headers required by the lookup, '<algorithm>' is added for sparse enums
+    """
+
+    PROPERTIES = CppLanguageElement.PROPERTIES | {
+        "enum",
+        "names",
+    }
+
+    def __init__(self, **properties):
+        super().__init__()
+        self.enum = None
+        self.names = None
+        self.includes = ["<cstddef>", "<cstdint>"]
+        self.init_properties(properties)
+
+    def function_name(self):
+        return self.name or f"{self.enum.name}ToString"
+
+    def entries(self):
+        """
+        @return: list of (value, name) pairs sorted by the value, one pair for every
+        distinct value
+        """
+        self._sanity_check()
+        names = list(self.names) if self.names is not None else self.enum.enum_items
+        entries = {}
+        for value, name in zip(self.enum.values(), names):
+            entries.setdefault(value, name)
+        return sorted(entries.items())
+
+    def is_sparse(self):
+        """
+        @return: True if the values have gaps, i.e. they are looked up by binary search
+        """
+        return not self.enum.is_contiguous()
+
+    def required_includes(self):
+        includes = super().required_includes()
+        if self.enum is not None and self.is_sparse() and "<algorithm>" not in includes:
+            includes.append("<algorithm>")
+        return includes
+
+    def value_type(self):
+        """
+        @return: integer type of the sorted value array
+        """
+        values = [value for value, _ in self.entries()]
+        if -(2**31) <= min(values) and max(values) < 2**31:
+            return "int32_t"
+        return "int64_t"
+
+    def lookup_function(self):
+        """
+        @return: CppFunction converting the enum value to its name
+        """
+        name = self.function_name()
+        entries = self.entries()
+        size = len(entries)
+        strings = f"{name}_names_pool + {name}_names_offsets"
+        if self.is_sparse():
+            value_type = self.value_type()
+            implementation = [
+                f"const {value_type} key = static_cast<{value_type}>(value);",
+                f"const {value_type}* end = {name}_values + {size};",
+                f"const {value_type}* found = std::lower_bound({name}_values, end, key);",
+                "if (found == end || *found != key)",
+                CppBlock(None, ["return nullptr;"]),
+                f"return {strings}[found - {name}_values];",
+            ]
+        else:
+            base = entries[0][0]
+            if base == 0:
+                index = "static_cast<size_t>(value)"
+            else:
+                shift = f"- {base}" if base > 0 else f"+ {-base}"
+                index = f"static_cast<size_t>(static_cast<int64_t>(value) {shift})"
+            implementation = [
+                f"const size_t index = {index};",
+                f"if (index >= {size})",
+                CppBlock(None, ["return nullptr;"]),
+                f"return {strings}[index];",
+            ]
+        return CppFunction(
+            name=name,
+            ret_type="const char*",
+            arguments=[f"{self.enum.fully_qualified_name()} value"],
+            implementation=implementation,
+        )
+
+    def render_to_string(self, cpp):
+        """
+        Render the tables and the lookup function
+        """
+        name = self.function_name()
+        entries = self.entries()
+        if self.is_sparse():
+            values = [str(value) for value, _ in entries]
+            array = CppArray(
+                name=f"{name}_values",
+                type=self.value_type(),
+                is_static=True,
+                is_constexpr=True,
+                newline_align=len(values) > 16,
+            )
+            array.add_array_items(chunked(values, 16))
+            array.render_to_string(cpp)
+        CppStringTable(
+            name=f"{name}_names", strings=[string for _, string in entries]
+        ).render_tables(cpp)
+        self.lookup_function().render_to_string(cpp)
+
+    def render_to_string_declaration(self, cpp):
+        """
+        Render the lookup function declaration, e.g.
+        const char* ItemsToString(Items value);
+        """
+        self.lookup_function().render_to_string_declaration(cpp)
+
+    def render_to_string_implementation(self, cpp):
+        """
+        Same as render_to_string(), the tables have internal linkage
+        """
+        self.render_to_string(cpp)
+
+    def _sanity_check(self):
+        if self.enum is None:
+            raise RuntimeError("Enum is not set")
+        if not self.enum.enum_items:
+            raise ValueError(f"Enum {self.enum.name} has no items")
+        if self.names is not None and len(self.names) != len(self.enum.enum_items):
+            raise ValueError("Number of names does not match the number of enum items")
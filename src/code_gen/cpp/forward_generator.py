@@ -0,0 +1,133 @@
+import re
+
+from .array_generator import CppArray
+from .class_generator import CppClass
+from .function_generator import CppFunction
+from .type_base_generator import CppBaseType, CppTemplateType
+from .variable_generator import CppVariable
+
+__doc__ = """Forward declarations of classes used only by pointer or reference.
+
+CppForwardDeclarations analyses declarations of classes, functions and variables,
+which are rendered to a header, and finds the classes they reference.
+Classes used only by pointer or reference could be forward declared ('class X;'),
+classes used by value, as a parent class or as a template argument need
+the complete type, i.e. their header has to be included.
+
+Classes are recognized when they are used as CppClass objects (e.g. CppBaseType(type=x_class))
+or by name in string types and function arguments ('const X& x', 'X* next'),
+the latter only for the classes passed in 'classes' property.
+
+Example:
+# Python code
+forward = CppForwardDeclarations([my_class], classes=[node_class, tree_class])
+forward.render_to_string(header.section('forward_declarations'))
+for include in forward.required_includes():
+    header.add_include(include)
+
+// Generated C++ code
+class Node;
+"""
+
+
+class CppForwardDeclarations:
+    """
+    Finds classes which could be forward declared in a header
+    Available properties:
+    elements - list of classes, functions and variables declared in the header
+    classes - list of CppClass objects, which could be referenced by name in string types
+    """
+
+    def __init__(self, elements, classes=None):
+        self.elements = list(elements)
+        self.classes = list(classes) if classes is not None else []
+        # CppClass -> True if the complete type is required, in the order of first use
+        self._uses = {}
+        self._patterns = [
+            (
+                cpp_class,
+                re.compile(rf"(?<![\w:]){re.escape(cpp_class.name)}\b(?!\s*::)"),
+            )
+            for cpp_class in self.classes
+        ]
+        self._analyse()
+
+    def forward_declared(self):
+        """
+        @return: list of classes used only by pointer or reference
+        """
+        return [c for c, complete in self._uses.items() if not complete]
+
+    def required(self):
+        """
+        @return: list of classes, which complete type is required
+        """
+        return [c for c, complete in self._uses.items() if complete]
+
+    def required_includes(self):
+        """
+        @return: list of headers of the required classes (see CppClass.header)
+        """
+        return list(dict.fromkeys(c.header for c in self.required() if c.header))
+
+    def render_to_string(self, cpp):
+        """
+        Write forward declarations, e.g. 'class Node;'
+        """
+        for cpp_class in self.forward_declared():
+            cpp(f"{cpp_class._class_type()} {cpp_class.name};")
+
+    def _use(self, cpp_class, complete):
+        # nested classes could not be forward declared outside their parent
+        complete = complete or cpp_class.is_class_member()
+        self._uses[cpp_class] = self._uses.get(cpp_class, False) or complete
+
+    def _use_string(self, text, complete):
+        """
+        Find classes referenced by name in a string type or function argument
+        """
+        for cpp_class, pattern in self._patterns:
+            for match in pattern.finditer(text):
+                indirect = re.match(r"\s*(const\b\s*)?[*&]", text[match.end() :])
+                self._use(cpp_class, complete and not indirect)
+
+    def _use_type(self, ctype, complete=True):
+        """
+        @param: ctype - string, CppClass or CppBaseType
+        @param: complete - False if the type is used in a context where it could be incomplete
+        """
+        if isinstance(ctype, str):
+            self._use_string(ctype, complete)
+        elif isinstance(ctype, CppClass):
+            self._use(ctype, complete)
+        elif isinstance(ctype, CppBaseType):
+            complete = complete and not ctype.is_indirect()
+            if isinstance(ctype, CppTemplateType):
+                # the template itself is used by value, the arguments are used as they are
+                for t_arg in ctype.template_args:
+                    self._use_type(t_arg, complete)
+            self._use_type(ctype.type, complete)
+
+    def _use_function(self, func):
+        self._use_type(getattr(func, "ret_type", None) or "")
+        for argument in func.arguments:
+            self._use_type(argument)
+
+    def _analyse(self):
+        defined = set()
+        for element in self.elements:
+            for item in element.walk():
+                if isinstance(item, CppClass):
+                    defined.add(item)
+                    for parent, _ in item.parent_classes():
+                        self._use_type(parent)
+                elif isinstance(item, CppFunction):
+                    self._use_function(item)
+                elif isinstance(item, CppVariable):
+                    # static data members could be declared with incomplete type
+                    static = item.is_class_member() and item.type.is_static
+                    self._use_type(item.type, complete=not static)
+                elif isinstance(item, CppArray):
+                    self._use_type(item.type, complete=not item.is_static)
+        for cpp_class in defined:
+            self._uses.pop(cpp_class, None)
@@ -1,6 +1,11 @@
+import inspect
 from textwrap import dedent
 
+from ..core import resolve_callable
+from .attribute_generator import CppAttributes
 from .language_element import CppLanguageElement
+from .statement_generator import CppBody
+from .type_base_generator import CppBaseType
 
 
 class CppFunction(CppLanguageElement):
@@ -10,9 +15,17 @@ class CppFunction(CppLanguageElement):
     Available properties:
     ret_type - string, return value for the method ('void', 'int'). Could not be set for constructors
     is_constexpr - boolean, const method prefix
+    is_friend - boolean, 'friend' prefix of a function declared in a class,
+    omitted in the definition following the declaration
+    attributes - list of attributes, e.g. ['noexcept', 'hot', ('section', '.text.hot')]
+    (see CppAttributes)
+    hotness - number of profile samples, hotter functions are defined first (see CppHotnessProfile)
     documentation - string, '/// Example doxygen'
     implementation - reference to a function that receives 'self' and C++ code generator handle
-    (see code_generator.cpp) and generates method body without braces
+    (see code_generator.cpp) and generates method body without braces,
+    or a dotted path to such function ('my_module:function_body'), which keeps the element picklable.
+    Coroutine functions (async def) are supported when the element is rendered by render_async().
+    Declarative CppBody (or a plain list of statements) is accepted as well
     Ex.
     #Python code
     def functionBody(self, cpp): cpp('return 42;')
@@ -31,9 +44,12 @@ class CppFunction(CppLanguageElement):
     PROPERTIES = CppLanguageElement.PROPERTIES | {
         "ret_type",
         "is_constexpr",
+        "is_friend",
         "arguments",
         "implementation",
         "documentation",
+        "attributes",
+        "hotness",
     }
 
     def __init__(self, **properties):
@@ -42,9 +58,12 @@ class CppFunction(CppLanguageElement):
         super().__init__()
         self.ret_type = None
         self.is_constexpr = False
+        self.is_friend = False
         self.arguments = []
         self.implementation = None
         self.documentation = None
+        self.attributes = None
+        self.hotness = None
         self.init_properties(properties)
 
     def _sanity_check(self):
@@ -53,6 +72,13 @@ class CppFunction(CppLanguageElement):
         """
         if self.is_constexpr and self.implementation is None:
             raise ValueError(f"Constexpr function {self.name} must have implementation")
+        self._attributes().validate("function", self.name)
+
+    def _attributes(self):
+        """
+        @return: CppAttributes of the function
+        """
+        return CppAttributes(self.attributes)
 
     def _constexpr(self):
         """
@@ -61,11 +87,25 @@ class CppFunction(CppLanguageElement):
         """
         return "constexpr" if self.is_constexpr else ""
 
-    def short_header_declaration_to_string(self):
+    def _friend(self):
+        """
+        Before function name, declaration only
+        """
+        return "friend" if self.is_friend else ""
+
+    def short_header_declaration_to_string(self, definition=False):
+        """
+        @param: definition - True for the definition following a separate declaration,
+        attributes rendered only in declarations are omitted
+        """
+        attributes = self._attributes()
         header = [
+            f"{attributes.prefix(definition)}",
+            "" if definition else f"{self._friend()}",
             f"{self._constexpr()}",
             f"{self.ret_type}",
             f"{self.name}({self.args()})",
+            f"{attributes.suffix()}",
         ]
         return " ".join(h for h in header if h)
 
@@ -81,21 +121,54 @@ class CppFunction(CppLanguageElement):
         """
         self.arguments.append(argument)
 
+    def referenced_elements(self):
+        if isinstance(self.ret_type, CppBaseType):
+            return [self.ret_type]
+        return []
+
+    def _implementation(self):
+        """
+        @return: callable generating the body from the implementation property
+        """
+        if isinstance(self.implementation, (list, tuple)):
+            return CppBody(self.implementation)
+        return resolve_callable(self.implementation)
+
+    def async_callbacks(self):
+        if self.implementation is not None:
+            implementation = self._implementation()
+            if inspect.iscoroutinefunction(implementation):
+                return [("implementation", implementation)]
+        return []
+
     def body(self, cpp):
         """
         The method calls Python function that creates C++ method body if handle exists
         """
-        if self.implementation is not None:
-            self.implementation(cpp)
+        if self.implementation is None:
+            return
+        recorded = self.resolved_callback("implementation")
+        if recorded is not None:
+            recorded.replay(cpp)
+            return
+        result = self._implementation()(cpp)
+        if inspect.isawaitable(result):
+            result.close()
+            raise RuntimeError(
+                f"Coroutine implementation of {self.name} must be rendered by render_async()"
+            )
 
     def render_to_string(self, cpp):
         """Function is rendered as with implementation"""
+        self._render_definition(cpp, definition=False)
+
+    def _render_definition(self, cpp, definition):
         # check all properties for the consistency
         self._sanity_check()
         if self.documentation:
             cpp(dedent(self.documentation))
         with cpp.block(
-            self.short_header_declaration_to_string(), endline=False
+            self.short_header_declaration_to_string(definition), endline=False
         ) as block:
             self.body(block)
 
@@ -112,8 +185,9 @@ class CppFunction(CppLanguageElement):
                 cpp(dedent(self.documentation))
             self.render_to_string(cpp)
         else:
+            self._sanity_check()
             cpp(f"{self.short_header_declaration_to_string()};")
 
     def render_to_string_implementation(self, cpp):
         if not self.is_constexpr:
-            self.render_to_string(cpp)
+            self._render_definition(cpp, definition=True)
@@ -0,0 +1,265 @@
+from .class_generator import CppClass
+from .type_base_generator import CppTemplateType
+
+__doc__ = """Devirtualization of generated class hierarchies.
+
+A virtual call could be devirtualized by the compiler only if it knows that the called
+method is not overridden, i.e. the class or the method is 'final'. CppClassHierarchy
+analyses a closed set of generated classes (nested classes included) and resolves
+their parents: CppClass parents directly, parents given by name if a class
+of the name is in the set; other parents are external and not analysed.
+
+devirtualize() marks
+- leaf classes (no class of the set derives from them) as 'final', unless they are
+  abstract, i.e. have pure virtual methods not implemented in the class or its parents,
+- virtual methods not overridden in any derived class as 'final',
+and reports virtual methods which are never overridden, these need not be virtual.
+Destructors are overridden by every derived class, even by an implicit one,
+and are never reported.
+CRTP interfaces (see CppClass.crtp_derive) have no virtual methods to devirtualize,
+they are skipped; their methods are overridden by the '<name>Impl' methods
+of the derived classes.
+The analysis assumes the set is the whole hierarchy, classes derived outside
+of the generated code have to be excluded. The parents are resolved once,
+when the hierarchy is created.
+
+Example:
+# Python code
+base = CppClass(name='Visitor')
+base.add_method(CppClass.CppMethod(name='Visit', ret_type='void', is_virtual=True,
+                                   is_pure_virtual=True))
+printer = CppClass(name='Printer', parent_class=base)
+printer.add_method(CppClass.CppMethod(name='Visit', ret_type='void', is_virtual=True,
+                                      is_override=True, implementation=...))
+CppClassHierarchy([base, printer]).devirtualize()
+
+// Generated C++ code
+class Printer final : public Visitor
+{
+public:
+    virtual void Visit() override;
+};
+"""
+
+
+def _method_key(method):
+    """
+    @return: key of the methods overriding each other, all destructors share one key
+    """
+    if method.name.startswith("~"):
+        return ("~",)
+    return method.name, method.args(), method.is_const
+
+
+class CppClassHierarchy:
+    """
+    Inheritance relations of a set of classes
+    Available properties:
+    classes - list of CppClass objects, their nested classes are included
+    excluded - names of classes derived outside of the set, neither they nor methods
+    of their parents are marked 'final'
+    """
+
+    def __init__(self, classes, excluded=None):
+        self.classes = []
+        for cpp_class in classes:
+            for item in cpp_class.walk():
+                if isinstance(item, CppClass) and item not in self.classes:
+                    self.classes.append(item)
+        self.excluded = set(excluded or [])
+        # the classes by their names, the first class of a name wins
+        self._names = {}
+        for cpp_class in self.classes:
+            self._names.setdefault(cpp_class.name, cpp_class)
+            self._names.setdefault(cpp_class.fully_qualified_name(), cpp_class)
+        # relations by id() of the classes
+        self._parents = {}
+        self._children = {id(cpp_class): [] for cpp_class in self.classes}
+        for cpp_class in self.classes:
+            resolved = (self.resolve(p) for p, _ in cpp_class.parent_classes())
+            self._parents[id(cpp_class)] = [p for p in resolved if p is not None]
+            for parent in self._parents[id(cpp_class)]:
+                if cpp_class not in self._children[id(parent)]:
+                    self._children[id(parent)].append(cpp_class)
+        self._descendants = {}
+
+    def resolve(self, parent):
+        """
+        @param: parent - class name, CppClass or CRTP base CppTemplateType
+        @return: CppClass of the set or None for external parents
+        """
+        if isinstance(parent, CppTemplateType):
+            parent = parent.type
+        if isinstance(parent, CppClass):
+            return parent if id(parent) in self._children else None
+        return self._names.get(parent)
+
+    def parents(self, cpp_class):
+        """
+        @return: list of the resolved parent classes
+        """
+        return list(self._parents.get(id(cpp_class), []))
+
+    def external_parents(self, cpp_class):
+        """
+        @return: list of the parents, which are not in the set
+        """
+        return [
+            parent
+            for parent, _ in cpp_class.parent_classes()
+            if self.resolve(parent) is None
+        ]
+
+    def children(self, cpp_class):
+        """
+        @return: list of the classes directly derived from the class
+        """
+        return list(self._children.get(id(cpp_class), []))
+
+    def descendants(self, cpp_class):
+        """
+        @return: list of all classes derived from the class
+        """
+        if id(cpp_class) not in self._descendants:
+            found = []
+            seen = set()
+            pending = self.children(cpp_class)
+            while pending:
+                item = pending.pop(0)
+                if id(item) not in seen:
+                    seen.add(id(item))
+                    found.append(item)
+                    pending.extend(self.children(item))
+            self._descendants[id(cpp_class)] = found
+        return list(self._descendants[id(cpp_class)])
+
+    def is_open(self, cpp_class):
+        """
+        @return: True if the class could be derived outside of the set
+        """
+        return bool({cpp_class.name, cpp_class.fully_qualified_name()} & self.excluded)
+
+    def is_closed(self, cpp_class):
+        """
+        @return: True if neither the class nor a class derived from it is open
+        """
+        return not any(
+            self.is_open(item) for item in [cpp_class, *self.descendants(cpp_class)]
+        )
+
+    def is_abstract(self, cpp_class):
+        """
+        @return: True if the class or a parent has a pure virtual method,
+        which is not implemented in the class or a nearer parent
+        """
+        implemented = set()
+        pending = [cpp_class]
+        while pending:
+            item = pending.pop(0)
+            for method in item.methods:
+                if getattr(method, "is_pure_virtual", False):
+                    if not self._overriding_keys(item, method) & implemented:
+                        return True
+                elif not isinstance(method, CppClass.CppCtor):
+                    implemented.add(_method_key(method))
+            pending.extend(self.parents(item))
+        return False
+
+    def leaves(self):
+        """
+        @return: list of classes without derived classes
+        """
+        return [
+            item
+            for item in self.classes
+            if not self.children(item) and not self.is_open(item)
+        ]
+
+    def is_overridden(self, cpp_class, method):
+        """
+        @return: True if a class derived from cpp_class overrides the method,
+        destructors are overridden by every derived class, implicitly declared or not
+        """
+        if method.name.startswith("~"):
+            return bool(self.descendants(cpp_class))
+        keys = self._overriding_keys(cpp_class, method)
+        return any(
+            _method_key(other) in keys
+            for item in self.descendants(cpp_class)
+            for other in item.methods
+            if not isinstance(other, CppClass.CppCtor) and not other.is_static
+        )
+
+    def devirtualize(self, mark_classes=True, mark_methods=True):
+        """
+        Mark leaf classes, which are not abstract, and not overridden virtual methods 'final'
+        @return: dictionary with lists of qualified names:
+        'final_classes', 'final_methods' - the marked classes and methods
+        'never_overridden' - virtual methods, which neither override
+        nor are overridden
+        """
+        report = {"final_classes": [], "final_methods": [], "never_overridden": []}
+        leaves = {id(item) for item in self.leaves()}
+        for cpp_class in self.classes:
+            if cpp_class.is_crtp:
+                # methods of CRTP interfaces are dispatched statically
+                continue
+            is_leaf = id(cpp_class) in leaves
+            if (
+                mark_classes
+                and is_leaf
+                and not cpp_class.is_final
+                and not self.is_abstract(cpp_class)
+            ):
+                cpp_class.is_final = True
+                report["final_classes"].append(cpp_class.fully_qualified_name())
+            for method in cpp_class.methods:
+                if not getattr(method, "is_virtual", False):
+                    continue
+                if not self.is_closed(cpp_class) or self.is_overridden(
+                    cpp_class, method
+                ):
+                    continue
+                # pure virtual methods are the interface of classes derived elsewhere,
+                # virtual destructors delete objects by a pointer to the base
+                if (
+                    not method.is_override
+                    and not method.is_pure_virtual
+                    and not method.name.startswith("~")
+                    and not self._overrides(cpp_class, method)
+                ):
+                    report["never_overridden"].append(method.fully_qualified_name())
+                if (
+                    mark_methods
+                    and not cpp_class.is_final
+                    and not method.is_final
+                    and not method.is_pure_virtual
+                ):
+                    method.is_final = True
+                    report["final_methods"].append(method.fully_qualified_name())
+        return report
+
+    @staticmethod
+    def _overriding_keys(cpp_class, method):
+        """
+        @return: set of keys of the methods overriding the method of the class,
+        '<name>Impl' methods override the methods of CRTP interfaces
+        """
+        keys = {_method_key(method)}
+        if cpp_class.is_crtp and not method.name.startswith("~"):
+            impl_name = f"{method.name}{CppClass.CRTP_IMPL_SUFFIX}"
+            keys.add((impl_name, method.args(), method.is_const))
+        return keys
+
+    def _overrides(self, cpp_class, method):
+        """
+        @return: True if the method overrides a method of a parent in the set
+        """
+        key = _method_key(method)
+        ancestors = self.parents(cpp_class)
+        while ancestors:
+            item = ancestors.pop(0)
+            if any(_method_key(other) == key for other in item.methods):
+                return True
+            ancestors.extend(self.parents(item))
+        return False
@@ -0,0 +1,98 @@
+__doc__ = """Registry of include directives of a C++ file.
+
+Headers are registered in any order and multiple times, they are rendered
+once, sorted and grouped: system headers (<...>) first, local headers ("...") next.
+Bare header names are treated as system headers.
+
+Example:
+# Python code
+includes = CppIncludes()
+includes.add('"my_class.h"')
+includes.add('vector')
+includes.add('<string>')
+includes.add('<vector>')
+includes.render(cpp)
+
+// Generated C++ code
+#include <string>
+#include <vector>
+
+#include "my_class.h"
+"""
+
+
+class CppIncludes:
+    """
+    Deduplicating registry of included headers
+    """
+
+    def __init__(self, headers=None):
+        self.headers = set()
+        # headers already written by render()
+        self.rendered = set()
+        self.is_rendered = False
+        for header in headers or []:
+            self.add(header)
+
+    def __len__(self):
+        return len(self.headers - self.rendered)
+
+    def __contains__(self, header):
+        return self.normalize(header) in self.headers
+
+    @staticmethod
+    def normalize(header):
+        """
+        @return: header name enclosed in <> or "" (bare names are system headers)
+        """
+        header = header.strip()
+        if header.startswith("#include"):
+            header = header[len("#include") :].strip()
+        if header[:1] in ('"', "<"):
+            return header
+        return f"<{header}>"
+
+    def add(self, header):
+        """
+        @param: header - string, e.g. '<vector>', '"my_class.h"' or 'vector'
+        """
+        self.headers.add(self.normalize(header))
+
+    def add_from(self, *elements):
+        """
+        Register headers required by the elements and their children
+        (see CppLanguageElement.required_includes)
+        """
+        for element in elements:
+            for header in element.required_includes():
+                self.add(header)
+
+    def system_headers(self):
+        """
+        @return: sorted list of system headers
+        """
+        return sorted(h for h in self.headers if h.startswith("<"))
+
+    def local_headers(self):
+        """
+        @return: sorted list of local headers
+        """
+        return sorted(h for h in self.headers if h.startswith('"'))
+
+    def render(self, cpp):
+        """
+        Write include directives of the headers, which have not been rendered yet
+        Groups of system and local headers are separated by an empty line
+        """
+        groups = [
+            [h for h in self.system_headers() if h not in self.rendered],
+            [h for h in self.local_headers() if h not in self.rendered],
+        ]
+        groups = [group for group in groups if group]
+        for index, group in enumerate(groups):
+            if index:
+                cpp.newline()
+            for header in group:
+                cpp(f"#include {header}")
+            self.rendered.update(group)
+        self.is_rendered = True
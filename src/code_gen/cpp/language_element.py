@@ -1,3 +1,9 @@
+import asyncio
+import contextlib
+import contextvars
+
+from ..core import CodeRecorder
+
 __doc__ = """The module encapsulates C++ code generation logics for main C++ language primitives:
 classes, methods and functions, variables, enums.
 Every C++ element could render its current state to a string that could be evaluated as
@@ -44,6 +50,54 @@ cpp.newline(2)
 For more detailed information see SourceFile and CppSourceFile documentation.
 """
 
+# results of awaited coroutine callbacks, keyed by (id(element), callback property name)
+_resolved_callbacks = contextvars.ContextVar("resolved_callbacks", default=None)
+# parent qualifiers computed during one rendering pass, keyed by id(parent)
+_cached_qualifiers = contextvars.ContextVar("cached_qualifiers", default=None)
+# True if elements are rendered in the canonical order (see canonical_order)
+_canonical_order = contextvars.ContextVar("canonical_order", default=False)
+
+
+@contextlib.contextmanager
+def cached_qualifiers():
+    """
+    Compute every parent qualifier only once within the context.
+    The element hierarchy must not be changed while the context is active.
+    """
+    if _cached_qualifiers.get() is not None:
+        yield
+        return
+    token = _cached_qualifiers.set({})
+    try:
+        yield
+    finally:
+        _cached_qualifiers.reset(token)
+
+
+@contextlib.contextmanager
+def canonical_order():
+    """
+    Render elements, which order has no semantic meaning, in a canonical order
+    within the context, so the generated files do not depend on the order
+    the elements were added in (e.g. from sets or dicts) and compiler caches
+    (ccache, sccache) could reuse the results.
+    Only methods are reordered: data members, arrays, enums and nested classes
+    keep their order, as it defines the layout, the initialization order
+    and the visibility of names.
+    """
+    token = _canonical_order.set(True)
+    try:
+        yield
+    finally:
+        _canonical_order.reset(token)
+
+
+def is_canonical_order():
+    """
+    @return: True if rendering in the canonical_order() context
+    """
+    return _canonical_order.get()
+
 
 ###########################################################################
 # Declaration/Implementation helpers
@@ -93,15 +147,18 @@ class CppLanguageElement:
     PROPERTIES = {
         "name",
         "ref_to_parent",
+        "includes",
     }
 
     def __init__(self):
         """
-        @param: properties - Basic C++ element properties (name, ref_to_parent)
-        class is a parent for method or a member variable
+        @param: properties - Basic C++ element properties (name, ref_to_parent, includes)
+        class is a parent for method or a member variable,
+        includes is a list of headers required by the element (e.g. '<vector>')
         """
         self.name = None
         self.ref_to_parent = None
+        self.includes = []
 
     def _normalize_properties(self, properties):
         """Produce properties with normalized names, i.e. substitute "const" with "is_const"."""
@@ -124,6 +181,17 @@ class CppLanguageElement:
         Supports for nested classes, e.g.
         void MyClass::NestedClass::
         """
+        cache = _cached_qualifiers.get()
+        if cache is not None and self.ref_to_parent is not None:
+            parent = self.ref_to_parent
+            qualifier = cache.get(id(parent))
+            if qualifier is None:
+                qualifier = parent._parent_qualifier()
+                if parent.name is not None:
+                    qualifier = f"{qualifier}{parent.name}::"
+                cache[id(parent)] = qualifier
+            return qualifier
+
         full_parent_qualifier = ""
         parent = self.ref_to_parent
         # walk through all existing parents
@@ -170,10 +238,71 @@ class CppLanguageElement:
     def scoped_name(self, local_scope):
         return self.name if local_scope else f"{self._parent_qualifier()}{self.name}"
 
+    def children(self):
+        """
+        @return: list of directly contained C++ elements
+        """
+        return []
+
+    def referenced_elements(self):
+        """
+        @return: list of contained elements and elements used as types by the element
+        """
+        return self.children()
+
+    def required_includes(self):
+        """
+        @return: list of headers required by the element, its children and its types
+        """
+        includes = dict.fromkeys(self.includes or [])
+        for element in self.referenced_elements():
+            includes.update(dict.fromkeys(element.required_includes()))
+        return list(includes)
+
+    def walk(self):
+        """
+        Iterate over the element and all its (nested) children
+        """
+        yield self
+        for child in self.children():
+            yield from child.walk()
+
+    def async_callbacks(self):
+        """
+        @return: list of (property name, coroutine function) pairs, which has to be awaited
+        before the element could be rendered (see render_async)
+        """
+        return []
+
+    def resolved_callback(self, name):
+        """
+        @return: awaited result of the coroutine callback stored in property 'name'
+        or None if the element is not rendered by render_async
+        """
+        resolved = _resolved_callbacks.get()
+        if resolved is None:
+            return None
+        return resolved.get((id(self), name))
+
+    async def render_async(self, cpp, render=None):
+        """
+        Await all coroutine callbacks of the element and its children concurrently
+        and render the element afterwards
+        @param: render - optional function render(element, cpp) used instead of render_to_string
+        """
+        await render_elements_async(cpp, [self], render)
+
     def is_class_member(self):
         """Return True if element is part of another (class/struct/scope) element."""
         return self.ref_to_parent is not None
 
+    def has_single_definition(self):
+        """
+        @return: True if the element is declared in a header and defined once
+        in a source file (extern and inline variables and arrays)
+        """
+        return False
+
     def render_to_string(self, cpp):
         """
         @param: cpp - handle that supports code generation interface (see source_file.py)
@@ -208,3 +337,39 @@ class CppLanguageElement:
         for definition rendering using render_to_string(cpp) interface
         """
         return CppImplementation(self)
+
+
+async def _await_callback(element, name, callback):
+    """
+    Await one coroutine callback, implementation callbacks get a CodeRecorder as code handle
+    """
+    if name == "implementation":
+        recorder = CodeRecorder()
+        await callback(recorder)
+        return (id(element), name), recorder
+    return (id(element), name), await callback()
+
+
+async def render_elements_async(cpp, elements, render=None):
+    """
+    Render elements with coroutine callbacks (e.g. async def implementation(cpp): ...)
+    All the callbacks of all elements are awaited concurrently, the elements are rendered
+    in the given order afterwards, so the output is deterministic.
+    @param: render - optional function render(element, cpp) used instead of render_to_string
+    """
+    awaitables = [
+        _await_callback(item, name, callback)
+        for element in elements
+        for item in element.walk()
+        for name, callback in item.async_callbacks()
+    ]
+    resolved = dict(await asyncio.gather(*awaitables))
+    token = _resolved_callbacks.set(resolved)
+    try:
+        for element in elements:
+            if render is None:
+                element.render_to_string(cpp)
+            else:
+                render(element, cpp)
+    finally:
+        _resolved_callbacks.reset(token)
@@ -0,0 +1,232 @@
+from .array_generator import CppArray
+from .attribute_generator import CppAttributes
+from .scope_generator import CppClassScope
+from .type_base_generator import CppBaseType
+
+__doc__ = """Data member layout of generated structures.
+
+Members are placed in the declaration order, every member at an offset aligned to
+its alignment, so members declared between members of larger alignment waste bytes
+on padding. CppStructLayout computes the size of a class from a table of type sizes
+and alignments and finds the member order with less padding: the members are sorted
+by their alignment (largest first), pinned members (is_pinned) keep their positions.
+
+CppClass(optimize_layout=True) declares its data members in the optimized order
+and asserts the computed size by 'static_assert', so a wrong size or alignment in the
+table is reported by the compiler.
+
+Sizes and alignments of types missing in TYPE_LAYOUTS are passed in 'type_layouts'
+or set on the type, e.g. CppVariable(name='m_pos', type='Vec3', size=12, alignment=4).
+Classes used as member types are laid out recursively.
+
+Example:
+# Python code
+point = CppClass(name='Point', is_struct=True, optimize_layout=True)
+point.add_variable(CppVariable(name='id', type='uint8_t'))
+point.add_variable(CppVariable(name='x', type='double'))
+point.add_variable(CppVariable(name='flags', type='uint16_t'))
+print(point.layout().report())
+
+// Generated C++ code
+struct Point
+{
+    double x;
+    uint16_t flags;
+    uint8_t id;
+};
+static_assert(sizeof(Point) == 16, "Unexpected size of Point");
+"""
+
+# (size, alignment) of types on LP64 platforms (Linux, macOS x86-64 and ARM64)
+TYPE_LAYOUTS = {
+    "bool": (1, 1),
+    "char": (1, 1),
+    "signed char": (1, 1),
+    "unsigned char": (1, 1),
+    "char8_t": (1, 1),
+    "std::byte": (1, 1),
+    "int8_t": (1, 1),
+    "uint8_t": (1, 1),
+    "char16_t": (2, 2),
+    "short": (2, 2),
+    "unsigned short": (2, 2),
+    "int16_t": (2, 2),
+    "uint16_t": (2, 2),
+    "char32_t": (4, 4),
+    "wchar_t": (4, 4),
+    "int": (4, 4),
+    "unsigned": (4, 4),
+    "unsigned int": (4, 4),
+    "int32_t": (4, 4),
+    "uint32_t": (4, 4),
+    "float": (4, 4),
+    "long": (8, 8),
+    "unsigned long": (8, 8),
+    "long long": (8, 8),
+    "unsigned long long": (8, 8),
+    "int64_t": (8, 8),
+    "uint64_t": (8, 8),
+    "size_t": (8, 8),
+    "ptrdiff_t": (8, 8),
+    "intptr_t": (8, 8),
+    "uintptr_t": (8, 8),
+    "double": (8, 8),
+    "long double": (16, 16),
+    "std::string_view": (16, 8),
+}
+
+
+class CppStructLayout:
+    """
+    Computes the layout of non-static data members of a class
+    Available properties:
+    cpp_class - CppClass instance
+    type_layouts - dictionary {type name: (size, alignment)} extending or overriding TYPE_LAYOUTS
+    pointer_size - size and alignment of pointers and references, 8 by default
+    """
+
+    def __init__(self, cpp_class, type_layouts=None, pointer_size=8):
+        self.cpp_class = cpp_class
+        self.type_layouts = {**TYPE_LAYOUTS, **(type_layouts or {})}
+        self.pointer_size = pointer_size
+
+    def data_members(self):
+        """
+        @return: non-static data members in the declaration order
+        """
+        members = [*self.cpp_class.variable_members, *self.cpp_class.array_members]
+        return [member for member in members if not self._is_static(member)]
+
+    def type_layout(self, ctype):
+        """
+        @param: ctype - string type, CppBaseType or class
+        @return: (size, alignment) of the type
+        @raise: ValueError, if the layout of the type is unknown
+        """
+        if isinstance(ctype, CppBaseType):
+            if ctype.is_indirect():
+                return self.pointer_size, self.pointer_size
+            if ctype.size is not None or ctype.alignment is not None:
+                if ctype.size is None or ctype.alignment is None:
+                    raise ValueError(
+                        f"Both size and alignment of type {ctype.type} must be set"
+                    )
+                return ctype.size, ctype.alignment
+            return self.type_layout(ctype.type)
+        if isinstance(ctype, CppClassScope):
+            layout = CppStructLayout(ctype, self.type_layouts, self.pointer_size)
+            return layout.size(), layout.alignment()
+        name = " ".join(str(ctype).replace("const ", " ").split())
+        if name.endswith(("*", "&")):
+            return self.pointer_size, self.pointer_size
+        for key in (name, f"std::{name}", name.replace("std::", "", 1)):
+            if key in self.type_layouts:
+                return self.type_layouts[key]
+        raise ValueError(
+            f"Layout of type '{name}' is unknown, add it to type_layouts "
+            "or set size and alignment of the type"
+        )
+
+    def member_layout(self, member):
+        """
+        @return: (size, alignment) of the data member, 'alignas' attribute
+        of the member increases the alignment of its type
+        """
+        size, alignment = self.type_layout(member.type)
+        if isinstance(member, CppArray):
+            count = member.array_size or len(member.items)
+            if not count:
+                raise ValueError(f"Size of array member {member.name} is unknown")
+            size *= count
+        alignas = CppAttributes(member.attributes).values.get("alignas")
+        return size, max(alignment, alignas or 1)
+
+    def struct_layout(self, members):
+        """
+        @param: members - data members in the declaration order
+        @return: (size, alignment) of the class with the members
+        """
+        if getattr(self.cpp_class, "parent_class", None):
+            raise ValueError(
+                f"Layout of derived class {self.cpp_class.name} is not supported"
+            )
+        offset = 0
+        alignment = 1
+        if any(
+            getattr(method, "is_virtual", False) for method in self.cpp_class.methods
+        ):
+            # the pointer to the virtual table precedes the members
+            offset = alignment = self.pointer_size
+        for member in members:
+            member_size, member_alignment = self.member_layout(member)
+            offset = self._align(offset, member_alignment) + member_size
+            alignment = max(alignment, member_alignment)
+        # an empty class still occupies one byte
+        return max(self._align(offset, alignment), 1), alignment
+
+    def optimized_members(self):
+        """
+        @return: data members sorted by alignment, pinned members keep their positions;
+        the declaration order if sorting does not reduce the size
+        """
+        members = self.data_members()
+        movable = [
+            member for member in members if not getattr(member, "is_pinned", False)
+        ]
+        movable.sort(key=lambda member: self.member_layout(member)[1], reverse=True)
+        reordered = iter(movable)
+        optimized = [
+            member if getattr(member, "is_pinned", False) else next(reordered)
+            for member in members
+        ]
+        if self.struct_layout(optimized)[0] < self.struct_layout(members)[0]:
+            return optimized
+        return members
+
+    def original_size(self):
+        """
+        @return: size of the class with the members in the declaration order
+        """
+        return self.struct_layout(self.data_members())[0]
+
+    def optimized_size(self):
+        """
+        @return: size of the class with the members in the optimized order
+        """
+        return self.struct_layout(self.optimized_members())[0]
+
+    def size(self):
+        """
+        @return: size of the class as it is rendered
+        """
+        if getattr(self.cpp_class, "is_optimize_layout", False):
+            return self.optimized_size()
+        return self.original_size()
+
+    def alignment(self):
+        return self.struct_layout(self.data_members())[1]
+
+    def bytes_saved(self):
+        """
+        @return: number of bytes per instance saved by the optimized order
+        """
+        return self.original_size() - self.optimized_size()
+
+    def report(self):
+        """
+        @return: string, e.g. 'Point: 24 -> 16 bytes (8 saved)'
+        """
+        return (
+            f"{self.cpp_class.name}: {self.original_size()} -> "
+            f"{self.optimized_size()} bytes ({self.bytes_saved()} saved)"
+        )
+
+    @staticmethod
+    def _is_static(member):
+        if isinstance(member, CppArray):
+            return member.is_static
+        return member.type.is_static
+
+    @staticmethod
+    def _align(offset, alignment):
+        return (offset + alignment - 1) // alignment * alignment
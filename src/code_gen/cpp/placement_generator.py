@@ -0,0 +1,105 @@
+import io
+import re
+
+from .source_file import CppSourceFile
+
+__doc__ = """Placement of method definitions by the size of their bodies.
+
+Methods defined in a source file could be inlined to other translation units only
+with link time optimization. CppPlacementPolicy measures the rendered body of every
+method (non-empty lines or tokens) and places it:
+- 'class' - small bodies are defined in the class declaration,
+- 'header' - medium bodies are defined 'inline' in the header after the class,
+- 'source' - the other bodies are defined in the source file.
+Constexpr methods are always defined in the class. Methods of nested classes
+are not defined after the class, their 'header' bodies are defined in the class.
+
+Example:
+# Python code
+my_class = CppClass(name='Point', placement=CppPlacementPolicy(class_limit=1,
+                                                               header_limit=5))
+my_class.render_to_header_and_source(header, source)
+print(CppPlacementPolicy.report([my_class]))
+
+// Generated C++ code (header)
+class Point
+{
+public:
+    int GetX() const
+    {
+        return m_x;
+    }
+    double Length() const;
+    ...
+};
+inline double Point::Length() const
+{
+    ...
+}
+"""
+
+_TOKEN = re.compile(r"\w+|[^\w\s]")
+
+
+class CppPlacementPolicy:
+    """
+    Chooses where the method bodies are defined
+    Available properties:
+    class_limit - maximal size of bodies defined in the class, 3 by default
+    header_limit - maximal size of bodies defined 'inline' after the class,
+        0 by default, i.e. no body is defined after the class
+    metric - 'lines' (non-empty lines of the body) or 'tokens'
+    """
+
+    PLACEMENTS = ("class", "header", "source")
+    METRICS = ("lines", "tokens")
+
+    def __init__(self, class_limit=3, header_limit=0, metric="lines"):
+        if metric not in self.METRICS:
+            raise ValueError(f"Unknown metric '{metric}' of the placement policy")
+        if class_limit < 0 or header_limit < 0:
+            raise ValueError("Limits of the placement policy must not be negative")
+        self.class_limit = class_limit
+        self.header_limit = header_limit
+        self.metric = metric
+
+    def measure(self, method):
+        """
+        @return: size of the rendered body of the method
+        """
+        writer = io.StringIO()
+        method.body(CppSourceFile(None, writer=writer))
+        text = writer.getvalue()
+        if self.metric == "lines":
+            return sum(1 for line in text.splitlines() if line.strip())
+        return len(_TOKEN.findall(text))
+
+    def placement(self, method):
+        """
+        @return: 'class', 'header' or 'source' for the method
+        """
+        size = self.measure(method)
+        if size <= self.class_limit:
+            return "class"
+        if size <= self.header_limit:
+            return "header"
+        return "source"
+
+    @staticmethod
+    def report(classes):
+        """
+        Rendered classes report the placements of their last rendering,
+        the methods of the other classes are measured
+        @param: classes - list of CppClass objects, nested classes are included
+        @return: dictionary {'class'|'header'|'source': list of qualified method names}
+        """
+        report = {placement: [] for placement in CppPlacementPolicy.PLACEMENTS}
+        for element in classes:
+            for cpp_class in element.walk():
+                if not hasattr(cpp_class, "method_placement"):
+                    continue
+                for method in cpp_class.ordered_methods():
+                    placement = cpp_class.method_placement(method)
+                    if placement is not None:
+                        report[placement].append(method.fully_qualified_name())
+        return report
@@ -0,0 +1,294 @@
+import math
+import re
+
+from .attribute_generator import CONFLICTING_ATTRIBUTES, CppAttributes
+from .function_generator import CppFunction
+
+__doc__ = """Profile-guided order of generated function definitions.
+
+Functions are defined in the order of addition, so the functions executed together
+are spread over the whole text section. CppHotnessProfile reads the sample counts of
+functions from a profiler output and annotates the generated functions and methods
+with their 'hotness'; the definitions are then emitted hot first (the hottest first),
+the functions without samples follow in the order of addition:
+- CppClassScope.render_methods_implementation() orders the methods of the class,
+- CppRenderJob(role='source') and CppSourceShards order the top-level functions.
+
+Optionally the functions are marked by optimization hints ('hot', 'cold') and placed
+to the sections '.text.hot' and '.text.unlikely', which the GNU linkers group
+across translation units.
+
+Supported profiles:
+- CSV 'symbol,count' lines, e.g. 'Interp::OpAdd,1520' (a header line is skipped),
+- 'perf report --stdio' output, the percentage of samples is the count,
+- 'callgrind_annotate --auto=no' output, the number of instructions is the count.
+Symbols are matched by their qualified name, parameter lists and GCC clone suffixes
+('.cold', '.part.0', ...) are ignored, so overloads share the count. Namespaces
+missing in the generated names are ignored as well: methods match symbols in any
+enclosing scope, top-level functions only in the namespaces given to the profile
+or found for the methods of the generated classes (e.g. 'vm' for 'vm::Interp::OpAdd'),
+so a function 'OpAdd' does not get the samples of a method 'Interp::OpAdd'.
+
+Example:
+# Python code
+profile = CppHotnessProfile.load('perf.txt')
+profile.apply([interp_class, dispatch_function], sections=True)
+CppRenderJob('interp.cpp', [interp_class, dispatch_function], role='source').render()
+"""
+
+_PERF_LINE = re.compile(r"^\s*(\d+(?:\.\d+)?)%.*?\[[.kgu]\]\s+(\S.*?)\s*$")
+_CALLGRIND_LINE = re.compile(
+    r"^\s*(\d[\d,]*)\s+(?:\(\s*\d+(?:\.\d+)?%\)\s+)?"
+    r"(?:[^\s:]*:(?!:))?(\S.*?)(?:\s+\[[^\]]*\])?\s*$"
+)
+# header lines of 'callgrind_annotate' output
+_CALLGRIND_HEADER = re.compile(
+    r"^(?:Events(?: recorded| shown)?:|[\d,]+\s.*\bPROGRAM TOTALS\b)", re.MULTILINE
+)
+_CLONE_SUFFIX = re.compile(r"(\.(cold|part|isra|constprop|lto_priv)(\.\d+)?)+$")
+
+HOT_SECTION = ".text.hot"
+COLD_SECTION = ".text.unlikely"
+
+
+def symbol_name(symbol):
+    """
+    @return: qualified function name of the demangled symbol,
+    e.g. 'Interp::OpAdd' for 'Interp::OpAdd(int) const [clone .cold]'
+    """
+    symbol = symbol.split(" [clone", 1)[0].strip()
+    start = symbol.find("operator()")
+    start = start + len("operator()") if start >= 0 else 0
+    paren = symbol.find("(", start)
+    if paren > 0:
+        symbol = symbol[:paren]
+    return _CLONE_SUFFIX.sub("", symbol.strip())
+
+
+def hot_first(elements):
+    """
+    @return: elements with the functions reordered by their hotness, the hottest first,
+    the functions of the same hotness and other elements keep their positions
+    """
+    functions = [e for e in elements if isinstance(e, CppFunction)]
+    ordered = iter(sorted(functions, key=lambda f: -(f.hotness or 0)))
+    return [next(ordered) if isinstance(e, CppFunction) else e for e in elements]
+
+
+class CppHotnessProfile:
+    """
+    Sample counts of functions
+    Available properties:
+    counts - dictionary {qualified function name: count}
+    hot_coverage - fraction of all samples covered by the hot functions, 0.9 by default
+    namespaces - namespaces of the generated code missing in the generated names,
+    e.g. ['vm'] or ['app::detail']
+    """
+
+    def __init__(self, counts=None, hot_coverage=0.9, namespaces=None):
+        if not 0 < hot_coverage <= 1:
+            raise ValueError("Hot coverage must be in the range (0, 1]")
+        self.counts = {}
+        self.hot_coverage = hot_coverage
+        self.namespaces = set(namespaces or [])
+        for symbol, count in (counts or {}).items():
+            self.add(symbol, count)
+
+    def add(self, symbol, count):
+        """
+        @param: symbol - demangled symbol or qualified function name
+        @param: count - number of samples, added to the count of the function
+        """
+        if count < 0:
+            raise ValueError(f"Count of {symbol} is negative")
+        name = symbol_name(symbol)
+        if name:
+            self.counts[name] = self.counts.get(name, 0) + count
+
+    @classmethod
+    def from_csv(cls, text, **properties):
+        """
+        @param: text - 'symbol,count' lines, the last comma separates the count
+        """
+        profile = cls(**properties)
+        for number, line in enumerate(text.splitlines()):
+            if not line.strip() or line.lstrip().startswith("#"):
+                continue
+            symbol, _, count = line.rpartition(",")
+            try:
+                value = float(count)
+            except ValueError:
+                if number == 0 or not profile.counts:
+                    # header line
+                    continue
+                raise ValueError(f"Invalid count in profile line '{line}'")
+            profile.add(symbol.strip().strip('"'), value)
+        return profile
+
+    @classmethod
+    def from_perf(cls, text, **properties):
+        """
+        @param: text - output of 'perf report --stdio', the percentage of samples
+        of the symbols is the count
+        """
+        profile = cls(**properties)
+        for line in text.splitlines():
+            match = _PERF_LINE.match(line)
+            if match and not line.lstrip().startswith("#"):
+                profile.add(match.group(2), float(match.group(1)))
+        return profile
+
+    @classmethod
+    def from_callgrind(cls, text, **properties):
+        """
+        @param: text - output of 'callgrind_annotate', the number of executed
+        instructions of the functions is the count
+        """
+        profile = cls(**properties)
+        for line in text.splitlines():
+            match = _CALLGRIND_LINE.match(line)
+            if match and "PROGRAM TOTALS" not in line:
+                profile.add(match.group(2), int(match.group(1).replace(",", "")))
+        return profile
+
+    @classmethod
+    def load(cls, path, profile_format=None, **properties):
+        """
+        @param: path - profile file
+        @param: profile_format - 'csv', 'perf' or 'callgrind', detected if None
+        @raise: ValueError, if no samples are found in the profile of a detected format
+        """
+        with open(path) as source:
+            text = source.read()
+        detected = profile_format is None
+        if detected:
+            if path.endswith(".csv"):
+                profile_format = "csv"
+            elif _CALLGRIND_HEADER.search(text):
+                profile_format = "callgrind"
+            else:
+                profile_format = "perf"
+        parsers = {
+            "csv": cls.from_csv,
+            "perf": cls.from_perf,
+            "callgrind": cls.from_callgrind,
+        }
+        if profile_format not in parsers:
+            raise ValueError(f"Unknown profile format '{profile_format}'")
+        profile = parsers[profile_format](text, **properties)
+        if detected and not profile.counts:
+            raise ValueError(
+                f"No samples found in {path} read as '{profile_format}' profile"
+            )
+        return profile
+
+    def count(self, function, namespaces=None):
+        """
+        @param: function - CppFunction or method
+        @param: namespaces - namespaces of top-level functions besides the 'namespaces' property
+        @return: number of samples of the function, 0 if it is not in the profile
+        """
+        name = function.fully_qualified_name()
+        if name in self.counts:
+            return self.counts[name]
+        # the profile symbol could be qualified by namespaces unknown to the generator,
+        # a top-level function must not match a method of the same name
+        namespaces = self.namespaces | set(namespaces or [])
+        return sum(
+            count
+            for scope, count in self._enclosed(name)
+            if "::" in name or scope in namespaces
+        )
+
+    def enclosing_scopes(self, functions):
+        """
+        @param: functions - functions and methods of the generated code
+        @return: set of scopes enclosing the generated classes in the profile symbols,
+        e.g. {'vm'} for the method 'Interp::OpAdd' and the symbol 'vm::Interp::OpAdd'
+        """
+        return {
+            scope
+            for function in functions
+            if "::" in function.fully_qualified_name()
+            for scope, _ in self._enclosed(function.fully_qualified_name())
+        }
+
+    def _enclosed(self, name):
+        """
+        @return: list of (enclosing scope, count) of the symbols qualifying the name
+        """
+        suffix = f"::{name}"
+        return [
+            (symbol[: -len(suffix)], count)
+            for symbol, count in self.counts.items()
+            if symbol.endswith(suffix)
+        ]
+
+    def hot_threshold(self):
+        """
+        @return: the smallest count of a hot function, the hottest functions
+        covering hot_coverage of all samples are hot
+        """
+        counts = sorted((c for c in self.counts.values() if c > 0), reverse=True)
+        target = self.hot_coverage * sum(counts)
+        covered = 0
+        for count in counts:
+            covered += count
+            if covered >= target:
+                return count
+        return math.inf
+
+    def apply(self, elements, hints=False, sections=False):
+        """
+        Set the hotness of the functions and methods of the elements
+        (classes are walked recursively)
+        @param: hints - add 'hot' attribute to hot functions and 'cold' to functions
+        without samples
+        @param: sections - place hot functions to '.text.hot' and functions
+        without samples to '.text.unlikely'
+        @return: dictionary {'hot'|'warm'|'cold': list of qualified names}
+        """
+        threshold = self.hot_threshold()
+        report = {"hot": [], "warm": [], "cold": []}
+        functions = [
+            function
+            for element in elements
+            for function in element.walk()
+            if isinstance(function, CppFunction)
+        ]
+        namespaces = self.enclosing_scopes(functions)
+        for function in functions:
+            function.hotness = self.count(function, namespaces)
+            if function.hotness >= threshold:
+                group = "hot"
+            elif function.hotness > 0:
+                group = "warm"
+            else:
+                group = "cold"
+            report[group].append(function.fully_qualified_name())
+            if group == "warm" or getattr(function, "is_pure_virtual", False):
+                continue
+            if hints:
+                self._annotate(function, group)
+            if sections and not function.is_constexpr:
+                self._annotate(
+                    function,
+                    ("section", HOT_SECTION if group == "hot" else COLD_SECTION),
+                )
+        return report
+
+    @staticmethod
+    def _annotate(function, attribute):
+        """
+        Add the attribute unless the function already has it or a conflicting one
+        """
+        name, value = attribute if isinstance(attribute, tuple) else (attribute, None)
+        attributes = CppAttributes(function.attributes)
+        conflicting = {name}
+        for first, second in CONFLICTING_ATTRIBUTES:
+            if name in (first, second):
+                conflicting.update((first, second))
+        if any(other in attributes for other in conflicting):
+            return
+        attributes.add(name, value)
+        function.attributes = attributes.values
@@ -0,0 +1,181 @@
+import io
+import os
+import pickle
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+
+from .function_generator import CppFunction
+from .profile_order import hot_first
+from .scope_generator import CppClassScope
+from .source_file import CppSourceFile
+from .string_table_generator import CppStringTable
+
+__doc__ = """Project-level driver rendering many independent C++ files in parallel.
+
+Every generated file is described by a picklable CppRenderJob, so the jobs can be
+rendered in worker processes of a ProcessPoolExecutor. Implementation callbacks
+must be picklable as well, i.e. module-level functions or dotted paths
+('my_generator.bodies:factorial_body'); lambdas and closures are reported as errors.
+
+Example:
+# Python code
+jobs = [
+    CppRenderJob('factorial.h', [factorial_function], role='header',
+                 preamble=['#pragma once']),
+    CppRenderJob('factorial.cpp', [factorial_function], role='source',
+                 preamble=['#include "factorial.h"']),
+]
+CppProject(jobs, max_workers=32).render()
+"""
+
+
+class CppRenderError(RuntimeError):
+    """
+    Aggregated error raised when one or more render jobs failed
+    errors - list of (filename, formatted traceback) pairs in the job order
+    """
+
+    def __init__(self, errors):
+        self.errors = errors
+        details = "\n".join(f"{filename}:\n{error}" for filename, error in errors)
+        super().__init__(f"{len(errors)} file(s) could not be rendered\n{details}")
+
+
+class CppRenderJob:
+    """
+    Picklable description of one generated file
+    Available properties:
+    filename - string, output path of the generated file
+    elements - list of C++ language elements rendered to the file
+    role - string, 'header' renders declarations, 'source' renders implementations,
+        'full' renders both (render_to_string), 'full' by default
+    preamble - list of strings written before the elements (e.g. include directives)
+    """
+
+    ROLES = ("header", "source", "full")
+
+    def __init__(self, filename, elements, role="full", preamble=None):
+        if role not in self.ROLES:
+            raise ValueError(f"Unknown render job role '{role}'")
+        self.filename = filename
+        self.elements = list(elements)
+        self.role = role
+        self.preamble = list(preamble) if preamble is not None else []
+
+    def render_element(self, element, cpp):
+        """
+        Render one element according to the job role
+        Only classes, scopes, functions, string tables and extern or inline variables
+        and arrays have separate declaration and implementation, other elements
+        are always rendered with render_to_string()
+        """
+        split = isinstance(element, (CppClassScope, CppFunction, CppStringTable))
+        if self.role == "full" or not (split or element.has_single_definition()):
+            element.render_to_string(cpp)
+        elif self.role == "header":
+            element.render_to_string_declaration(cpp)
+        else:
+            element.render_to_string_implementation(cpp)
+
+    def render(self):
+        """
+        @return: string, the content of the generated file
+        """
+        writer = io.StringIO()
+        cpp = CppSourceFile(self.filename, writer=writer)
+        for line in self.preamble:
+            cpp(line)
+        # definitions are emitted hot first, declarations keep their order
+        elements = hot_first(self.elements) if self.role == "source" else self.elements
+        for element in elements:
+            self.render_element(element, cpp)
+        return writer.getvalue()
+
+
+def _render_job(job):
+    """
+    Render the job in a worker process
+    @return: (text, None) on success, (None, formatted traceback) on failure
+    """
+    try:
+        return job.render(), None
+    except Exception:
+        return None, traceback.format_exc()
+
+
+class CppProject:
+    """
+    Renders a set of independent files, optionally across a pool of worker processes
+    Available properties:
+    jobs - list of CppRenderJob instances
+    max_workers - number of worker processes, os.cpu_count() if None,
+        jobs are rendered in the current process if 1
+    """
+
+    def __init__(self, jobs=None, max_workers=None):
+        self.jobs = list(jobs) if jobs is not None else []
+        self.max_workers = max_workers
+
+    def add_job(self, job):
+        """
+        @param: job CppRenderJob instance
+        """
+        self.jobs.append(job)
+
+    def render_to_strings(self):
+        """
+        Render all jobs, the result does not depend on the number of workers
+        @return: list of (filename, text) pairs in the job order
+        @raise: CppRenderError, if any of the jobs failed
+        """
+        results = [None] * len(self.jobs)
+        errors = {}
+        pending = []
+        for index, job in enumerate(self.jobs):
+            try:
+                pickle.dumps(job)
+            except Exception:
+                errors[index] = (
+                    "Job is not picklable, implementation callbacks must be "
+                    "module-level functions or dotted paths\n" + traceback.format_exc()
+                )
+            else:
+                pending.append(index)
+
+        if self.max_workers == 1:
+            rendered = [_render_job(self.jobs[index]) for index in pending]
+        else:
+            with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+                workers = self.max_workers or os.cpu_count() or 1
+                chunksize = max(1, len(pending) // (workers * 4))
+                rendered = list(
+                    executor.map(
+                        _render_job,
+                        [self.jobs[index] for index in pending],
+                        chunksize=chunksize,
+                    )
+                )
+
+        for index, (text, error) in zip(pending, rendered):
+            if error is not None:
+                errors[index] = error
+            else:
+                results[index] = (self.jobs[index].filename, text)
+
+        if errors:
+            raise CppRenderError(
+                [(self.jobs[index].filename, errors[index]) for index in sorted(errors)]
+            )
+        return results
+
+    def render(self):
+        """
+        Render all jobs and write the generated files
+        Nothing is written if any of the jobs failed
+        @return: list of written filenames in the job order
+        """
+        results = self.render_to_strings()
+        for filename, text in results:
+            with open(filename, "w") as out:
+                out.write(text)
+        return [filename for filename, _ in results]
@@ -1,6 +1,12 @@
 from textwrap import dedent
 
-from .language_element import CppLanguageElement
+from ..core import CodeRecorder
+from .language_element import (
+    CppLanguageElement,
+    cached_qualifiers,
+    is_canonical_order,
+)
+from .profile_order import hot_first
 
 
 class CppClassScope(CppLanguageElement):
@@ -85,6 +91,54 @@ class CppClassScope(CppLanguageElement):
         """
         self.postfix_lines.append(line)
 
+    def children(self):
+        """
+        @return: list of all contained elements
+        """
+        return [
+            *self.scoped_enums,
+            *self.internal_class_elements,
+            *self.methods,
+            *self.variable_members,
+            *self.array_members,
+            *self.internal_scopes,
+        ]
+
+    def ordered_methods(self):
+        """
+        @return: methods in the rendering order, i.e. in the order of addition or,
+        in the canonical_order() context, constructors first and the rest sorted
+        by name and signature
+        """
+        if not is_canonical_order():
+            return self.methods
+        return sorted(
+            self.methods,
+            key=lambda m: (
+                m.ret_type is not None,
+                m.name,
+                m.args(),
+                getattr(m, "is_const", False),
+            ),
+        )
+
+    def implementation_order(self):
+        """
+        @return: methods in the order of their definitions, the rendering order
+        with the methods of a higher hotness first (see CppHotnessProfile)
+        """
+        return hot_first(self.ordered_methods())
+
+    def implemented_methods(self):
+        """
+        @return: methods defined out of the class in the order of their definitions
+        """
+        return [
+            m
+            for m in self.implementation_order()
+            if not m.is_pure_virtual and not m.is_constexpr
+        ]
+
     # render declaration
     def anything_to_declare_local(self):
         """
@@ -145,7 +199,7 @@ class CppClassScope(CppLanguageElement):
         Should be placed in 'public:' section
         Method is protected as it is used by CppClass only
         """
-        for func_item in self.methods:
+        for func_item in self.ordered_methods():
             func_item.render_to_string_declaration(cpp)
 
     def render_internal_scopes_declarations(self, cpp):
@@ -191,28 +245,35 @@ class CppClassScope(CppLanguageElement):
         int MyClass::my_static_array[] = {}
         """
         # generate definition for static variables
+        # inline and constexpr variables and arrays are defined in the class declaration
         static_vars = [
-            variable for variable in self.variable_members if variable.type.is_static
+            variable
+            for variable in self.variable_members
+            if variable.type.is_static and not variable.is_defined_by_declaration()
+        ]
+        static_arrays = [
+            array
+            for array in self.array_members
+            if array.is_static and not array.is_defined_by_declaration()
         ]
 
         for var_item in static_vars:
             var_item.definition().render_to_string(cpp)
 
-        if static_vars and self.array_members:
+        if static_vars and static_arrays:
             cpp.newline()
 
-        for arr_item in self.array_members:
+        for arr_item in static_arrays:
             arr_item.definition().render_to_string(cpp)
 
-        if static_vars or self.array_members:
+        if static_vars or static_arrays:
             cpp.newline()
 
     def render_methods_implementation(self, cpp):
         # generate methods implementation section
-        for func_item in self.methods:
-            if not func_item.is_pure_virtual:
-                func_item.render_to_string_implementation(cpp)
-                cpp.newline()
+        for func_item in self.implemented_methods():
+            func_item.render_to_string_implementation(cpp)
+            cpp.newline()
 
     def render_internal_classes_implementation(self, cpp):
         # do the same for nested classes
@@ -242,3 +303,69 @@ class CppClassScope(CppLanguageElement):
         """
         self.render_to_string_declaration(cpp)
         self.render_to_string_implementation(cpp)
+
+    # render declaration and implementation together
+    def render_to_header_and_source(self, header, source):
+        """
+        Render declaration to 'header' and definition to 'source' in one walk
+        through the nested elements, the output is the same as from
+        render_to_string_declaration(header) and render_to_string_implementation(source)
+        Parent qualifiers are computed only once per nested class or scope
+        """
+        with cached_qualifiers():
+            self._render_split(header, source)
+
+    def _render_methods_split(self, header, methods_source):
+        """
+        Render methods declaration to header and their implementation to methods_source
+        """
+        self.render_methods_declaration(header)
+        for func_item in self.implemented_methods():
+            func_item.render_to_string_implementation(methods_source)
+            methods_source.newline()
+
+    def _render_nested_split(self, header, nested_source, elements):
+        """
+        Render nested classes or scopes declaration to header and their implementation
+        to nested_source
+        """
+        for item in elements:
+            item._render_split(header, nested_source)
+
+    def _render_source_split(
+        self, source, methods_source, classes_source, scopes_source
+    ):
+        """
+        Write recorded implementation parts to source in the implementation order
+        """
+        self.render_static_members_implementation(source)
+        methods_source.replay(source)
+        classes_source.replay(source)
+        scopes_source.replay(source)
+
+    def _render_split(self, header, source):
+        """
+        Render scope declaration to header and definition to source
+        """
+        if not self.anything_to_declare():
+            return
+
+        methods_source = CodeRecorder()
+        classes_source = CodeRecorder()
+        scopes_source = CodeRecorder()
+
+        if self.scope is not None:
+            header.label(self.scope)
+
+        if self.documentation:
+            header(dedent(self.documentation))
+
+        self.render_enum_declaration(header)
+        self._render_nested_split(header, classes_source, self.internal_class_elements)
+        self._render_methods_split(header, methods_source)
+        self.render_variables_declaration(header)
+        self.render_array_declaration(header)
+        self._render_nested_split(header, scopes_source, self.internal_scopes)
+        self.render_postfix_lines(header)
+
+        self._render_source_split(source, methods_source, classes_source, scopes_source)
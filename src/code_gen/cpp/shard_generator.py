@@ -0,0 +1,176 @@
+import io
+import math
+import os
+
+from .function_generator import CppFunction
+from .profile_order import hot_first
+from .language_element import cached_qualifiers
+from .scope_generator import CppClassScope
+from .source_file import CppSourceFile
+
+__doc__ = """Distribution of large implementations across several translation units.
+
+CppSourceShards collects definitions (static class members, static arrays, methods
+and free functions) and splits them into N source files of a similar size,
+so the files could be compiled in parallel and with less memory.
+Shards are contiguous, i.e. the definitions keep their order, which keeps
+unchanged shards stable between generator runs.
+
+Example:
+# Python code
+shards = CppSourceShards('my_class_{index}.cpp',
+                         elements=[my_class],
+                         preamble=['#include "my_class.h"'],
+                         target_size=512 * 1024)
+shards.render()
+"""
+
+
+class CppSourceShards:
+    """
+    Renders definitions of the elements into several source files
+    Available properties:
+    filename - string, shard file name with '{index}' placeholder,
+        '_{index}' is inserted before the extension if the placeholder is missing
+    elements - list of classes, scopes or other C++ elements
+    preamble - list of strings repeated at the beginning of every shard (e.g. includes)
+    shards - number of shards, derived from target_size if None
+    target_size - estimated shard size in bytes, used when shards is None
+    """
+
+    def __init__(
+        self, filename, elements=None, preamble=None, shards=None, target_size=None
+    ):
+        if shards is None and target_size is None:
+            raise ValueError("Either number of shards or target size must be set")
+        if shards is not None and shards < 1:
+            raise ValueError("Number of shards must be positive")
+        if target_size is not None and target_size < 1:
+            raise ValueError("Target size must be positive")
+        self.filename = filename
+        self.elements = list(elements) if elements is not None else []
+        self.preamble = list(preamble) if preamble is not None else []
+        self.shards = shards
+        self.target_size = target_size
+
+    def add_element(self, element):
+        """
+        @param: element - class, scope or other C++ element
+        """
+        self.elements.append(element)
+
+    def shard_filename(self, index):
+        """
+        @return: file name of the shard with the given index
+        """
+        if "{index}" in self.filename:
+            return self.filename.format(index=index)
+        root, ext = os.path.splitext(self.filename)
+        return f"{root}_{index}{ext}"
+
+    def definition_units(self):
+        """
+        Render every definition separately
+        @return: list of rendered definitions in the implementation order
+        """
+        units = []
+        with cached_qualifiers():
+            for element in hot_first(self.elements):
+                self._collect_units(element, units)
+        return units
+
+    def render_to_strings(self):
+        """
+        @return: list of (filename, text) pairs, one for every shard
+        """
+        units = self.definition_units()
+        preamble = self._render(self._render_preamble)
+        return [
+            (self.shard_filename(index), preamble + "".join(shard))
+            for index, shard in enumerate(self._partition(units))
+        ]
+
+    def render(self):
+        """
+        Write all shards
+        @return: list of written filenames
+        """
+        results = self.render_to_strings()
+        for filename, text in results:
+            with open(filename, "w") as out:
+                out.write(text)
+        return [filename for filename, _ in results]
+
+    def _shard_count(self, units):
+        if self.shards is not None:
+            count = self.shards
+        else:
+            total = sum(len(unit) for unit in units)
+            count = math.ceil(total / self.target_size)
+        return max(1, min(count, len(units)))
+
+    def _partition(self, units):
+        """
+        Split units into contiguous non-empty shards of a similar size
+        """
+        count = self._shard_count(units)
+        total = sum(len(unit) for unit in units)
+        cuts = [0]
+        size = 0
+        for position, unit in enumerate(units):
+            remaining_cuts = count - len(cuts)
+            if remaining_cuts and position > cuts[-1]:
+                # start a new shard if the middle of the unit crosses the next boundary
+                # or if every remaining shard needs one of the remaining units
+                boundary = total * len(cuts) / count
+                if (
+                    size + len(unit) / 2 >= boundary
+                    or len(units) - position == remaining_cuts
+                ):
+                    cuts.append(position)
+            size += len(unit)
+        cuts.append(len(units))
+        return [units[begin:end] for begin, end in zip(cuts, cuts[1:])]
+
+    def _render_preamble(self, cpp):
+        for line in self.preamble:
+            cpp(line)
+
+    @staticmethod
+    def _render(render):
+        writer = io.StringIO()
+        render(CppSourceFile(None, writer=writer))
+        return writer.getvalue()
+
+    def _collect_units(self, element, units):
+        if isinstance(element, CppClassScope):
+            for var_item in element.variable_members:
+                if var_item.type.is_static and not var_item.is_defined_by_declaration():
+                    units.append(self._render(var_item.definition().render_to_string))
+            for arr_item in element.array_members:
+                if arr_item.is_static and not arr_item.is_defined_by_declaration():
+                    units.append(self._render(arr_item.definition().render_to_string))
+            for func_item in element.implemented_methods():
+                units.append(self._render(self._method_unit(func_item)))
+            for class_item in element.internal_class_elements:
+                self._collect_units(class_item, units)
+            for scope_item in element.internal_scopes:
+                self._collect_units(scope_item, units)
+        elif isinstance(element, CppFunction):
+            if not element.is_constexpr:
+                units.append(self._render(self._method_unit(element)))
+        elif element.has_single_definition():
+            # extern variables and arrays are defined once, inline ones in the header
+            unit = self._render(element.render_to_string_implementation)
+            if unit:
+                units.append(unit)
+        else:
+            units.append(self._render(element.render_to_string))
+
+    @staticmethod
+    def _method_unit(func_item):
+        def render(cpp):
+            func_item.render_to_string_implementation(cpp)
+            cpp.newline()
+
+        return render
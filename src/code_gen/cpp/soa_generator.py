@@ -0,0 +1,344 @@
+from .array_generator import CppArray
+from .class_generator import CppClass
+from .language_element import CppLanguageElement
+from .string_table_generator import chunked
+from .variable_generator import CppVariable
+
+__doc__ = """Struct-of-arrays containers generated from record descriptions.
+
+A loop reading one field of an array of structures loads whole structures to the cache.
+CppStructOfArrays takes a CppClass describing a record (its non-static data members)
+and generates a container storing every field in a separate contiguous array aligned
+to the cache line, so such loops read only the memory of the used fields and could be
+vectorized. The container has a vector-like interface: push_back(), resize(), reserve(),
+operator[] returning a proxy with references to the fields, iterators and pointers
+to the field arrays.
+
+render_static_tables() renders constant tables of the same layout from columnar
+Python data (lists, NumPy arrays or anything with tolist()).
+
+Example:
+# Python code
+particle = CppClass(name='Particle', is_struct=True)
+particle.add_variable(CppVariable(name='x', type='float'))
+particle.add_variable(CppVariable(name='alive', type='uint8_t'))
+particles = CppStructOfArrays(record=particle)
+particles.render_to_string(cpp)
+particles.render_static_tables(cpp, 'kParticles', {'x': [1.0, 2.5], 'alive': [1, 0]})
+
+// Generated C++ code
+class ParticleArray
+{
+public:
+    ...
+    struct Reference
+    {
+        float& x;
+        uint8_t& alive;
+    };
+    ...
+    void push_back(const Particle& value)
+    {
+        m_x.push_back(value.x);
+        m_alive.push_back(value.alive);
+    }
+    ...
+private:
+    std::vector<float, Allocator<float>> m_x;
+    std::vector<uint8_t, Allocator<uint8_t>> m_alive;
+};
+constexpr size_t kParticles_size = 2;
+alignas(64) constexpr float kParticles_x[2] = {1.0f, 2.5f};
+alignas(64) constexpr uint8_t kParticles_alive[2] = {1, 0};
+
+NOTE: 'bool' fields are not supported, std::vector<bool> packs bits and has no
+references to its items, use 'uint8_t' instead.
+"""
+
+_FLOAT_TYPES = {"float": "f", "double": "", "long double": "L"}
+
+
+def _literal(value, ctype):
+    """
+    @return: C++ literal of the Python value for the field type
+    """
+    if isinstance(value, str):
+        return '"{}"'.format(value.replace("\\", "\\\\").replace('"', '\\"'))
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if ctype in _FLOAT_TYPES:
+        text = repr(float(value))
+        if text in ("inf", "-inf", "nan"):
+            raise ValueError(f"Value {text} has no literal")
+        return f"{text}{_FLOAT_TYPES[ctype]}"
+    return str(int(value))
+
+
+class CppStructOfArrays(CppLanguageElement):
+    """
+    The Python class that generates a struct-of-arrays container for records
+    Available properties:
+    record - CppClass, the non-static data members are the fields of the container
+    name - name of the container, '<record name>Array' by default
+    alignment - alignment of the field arrays, 64 (cache line) by default
+    includes - headers required by the container
+    """
+
+    PROPERTIES = CppLanguageElement.PROPERTIES | {
+        "record",
+        "alignment",
+    }
+
+    def __init__(self, **properties):
+        super().__init__()
+        self.record = None
+        self.alignment = 64
+        self.includes = ["<cstddef>", "<new>", "<vector>"]
+        self.init_properties(properties)
+
+    def container_name(self):
+        return self.name or f"{self.record.name}Array"
+
+    def fields(self):
+        """
+        @return: list of (field name, field type) pairs in the declaration order
+        """
+        self._sanity_check()
+        fields = []
+        for member in self.record.variable_members:
+            if member.type.is_static:
+                continue
+            if member.type.is_ref or member.type.is_const:
+                raise ValueError(
+                    f"Field {member.name} of {self.record.name} must not be const or reference"
+                )
+            if member.type.type == "bool" and not member.type.is_ptr:
+                raise ValueError(
+                    f"Field {member.name} of {self.record.name} is 'bool', use 'uint8_t'"
+                )
+            fields.append((member.name, member.type.scoped_name(local_scope=False)))
+        if not fields:
+            raise ValueError(f"Record {self.record.name} has no fields")
+        return fields
+
+    def reference_struct(self, name, const):
+        """
+        @return: CppClass of the proxy with references to the fields of one record
+        """
+        reference = CppClass(name=name, is_struct=True)
+        for field, field_type in self.fields():
+            reference.add_variable(
+                CppVariable(name=field, type=field_type, is_const=const, is_ref=True)
+            )
+        return reference
+
+    def methods(self):
+        """
+        @return: list of CppClass.CppMethod of the container interface
+        """
+        fields = self.fields()
+        first = fields[0][0]
+        record_name = self.record.fully_qualified_name()
+        container = CppClass(name=self.container_name())
+
+        def method(name, ret_type, arguments=(), body=(), is_const=False):
+            cpp_method = CppClass.CppMethod(
+                name=name,
+                ret_type=ret_type,
+                arguments=list(arguments),
+                implementation=list(body),
+                is_const=is_const,
+            )
+            container.add_method(cpp_method)
+            return cpp_method
+
+        def each(statement):
+            return [statement.format(field=field) for field, _ in fields]
+
+        def proxy(reference):
+            items = ", ".join(f"m_{field}[index]" for field, _ in fields)
+            return f"return {reference}{{{items}}};"
+
+        methods = [
+            method("size", "size_t", body=[f"return m_{first}.size();"], is_const=True),
+            method("empty", "bool", body=[f"return m_{first}.empty();"], is_const=True),
+            method(
+                "reserve", "void", ["size_t count"], each("m_{field}.reserve(count);")
+            ),
+            method(
+                "resize", "void", ["size_t count"], each("m_{field}.resize(count);")
+            ),
+            method("clear", "void", body=each("m_{field}.clear();")),
+            method(
+                "push_back",
+                "void",
+                [f"const {record_name}& value"],
+                each("m_{field}.push_back(value.{field});"),
+            ),
+            method("operator[]", "Reference", ["size_t index"], [proxy("Reference")]),
+            method(
+                "operator[]",
+                "ConstReference",
+                ["size_t index"],
+                [proxy("ConstReference")],
+                is_const=True,
+            ),
+            method("begin", "Iterator", body=["return Iterator{this, 0};"]),
+            method("end", "Iterator", body=["return Iterator{this, size()};"]),
+            method(
+                "begin",
+                "ConstIterator",
+                body=["return ConstIterator{this, 0};"],
+                is_const=True,
+            ),
+            method(
+                "end",
+                "ConstIterator",
+                body=["return ConstIterator{this, size()};"],
+                is_const=True,
+            ),
+        ]
+        for field, field_type in fields:
+            methods.append(
+                method(
+                    f"{field}_data",
+                    f"{field_type}*",
+                    body=[f"return m_{field}.data();"],
+                )
+            )
+            methods.append(
+                method(
+                    f"{field}_data",
+                    f"const {field_type}*",
+                    body=[f"return m_{field}.data();"],
+                    is_const=True,
+                )
+            )
+        return methods
+
+    def render_to_string(self, cpp):
+        """
+        Render the container class, all methods are defined in the class
+        """
+        name = self.container_name()
+        fields = self.fields()
+        with cpp.block(f"class {name}", postfix=";") as block:
+            block.label("public")
+            block(f"static constexpr size_t alignment = {self.alignment};")
+            block.newline()
+            self._render_allocator(block)
+            block.newline()
+            for reference, const in (("Reference", False), ("ConstReference", True)):
+                self.reference_struct(reference, const).render_to_string_declaration(
+                    block
+                )
+                block.newline()
+            for iterator, reference, container in (
+                ("Iterator", "Reference", name),
+                ("ConstIterator", "ConstReference", f"const {name}"),
+            ):
+                self._render_iterator(block, iterator, reference, container)
+                block.newline()
+            for method in self.methods():
+                method.render_to_string(block)
+            block.newline()
+            block.label("private")
+            for field, field_type in fields:
+                block(f"std::vector<{field_type}, Allocator<{field_type}>> m_{field};")
+
+    def render_to_string_declaration(self, cpp):
+        """
+        Same as render_to_string(), the container is defined in a header
+        """
+        self.render_to_string(cpp)
+
+    def render_to_string_implementation(self, cpp):
+        """
+        Nothing to render, the container is defined by its declaration
+        """
+
+    def render_static_tables(self, cpp, name, columns):
+        """
+        Render constant aligned field arrays from columnar data, e.g.
+        constexpr size_t kParticles_size = 2;
+        alignas(64) constexpr float kParticles_x[2] = {1.0f, 2.5f};
+        @param: name - prefix of the generated names
+        @param: columns - dictionary {field name: sequence of Python values}
+        """
+        fields = self.fields()
+        missing = [field for field, _ in fields if field not in columns]
+        if missing:
+            raise ValueError(f"Columns {', '.join(missing)} are missing")
+        rows = [self._column(columns[field]) for field, _ in fields]
+        size = len(rows[0])
+        if not size or any(len(row) != size for row in rows):
+            raise ValueError("Columns must be non-empty and of the same length")
+        cpp(f"constexpr size_t {name}_size = {size};")
+        for (field, field_type), row in zip(fields, rows):
+            array = CppArray(
+                name=f"{name}_{field}",
+                type=field_type,
+                is_constexpr=True,
+                array_size=size,
+                newline_align=size > 8,
+                attributes={"alignas": self.alignment},
+            )
+            array.add_array_items(chunked([_literal(v, field_type) for v in row], 8))
+            array.render_to_string(cpp)
+
+    @staticmethod
+    def _column(column):
+        return list(column.tolist() if hasattr(column, "tolist") else column)
+
+    def _render_allocator(self, cpp):
+        """
+        Render the allocator aligning the field arrays
+        """
+        cpp("template <typename T>")
+        with cpp.block("struct Allocator", postfix=";") as block:
+            block("using value_type = T;")
+            block("Allocator() = default;")
+            block("template <typename U>")
+            block("Allocator(const Allocator<U>&) noexcept {}")
+            with block.block("T* allocate(size_t count)") as body:
+                body("return static_cast<T*>(")
+                body(
+                    "    ::operator new(count * sizeof(T), std::align_val_t{alignment}));"
+                )
+            with block.block("void deallocate(T* pointer, size_t) noexcept") as body:
+                body("::operator delete(pointer, std::align_val_t{alignment});")
+            block("template <typename U>")
+            with block.block(
+                "bool operator==(const Allocator<U>&) const noexcept"
+            ) as body:
+                body("return true;")
+            block("template <typename U>")
+            with block.block(
+                "bool operator!=(const Allocator<U>&) const noexcept"
+            ) as body:
+                body("return false;")
+
+    @staticmethod
+    def _render_iterator(cpp, name, reference, container):
+        with cpp.block(f"struct {name}", postfix=";") as block:
+            block(f"{container}* container;")
+            block("size_t index;")
+            with block.block(f"{reference} operator*() const") as body:
+                body("return (*container)[index];")
+            with block.block(f"{name}& operator++()") as body:
+                body("++index;")
+                body("return *this;")
+            with block.block(f"bool operator==(const {name}& other) const") as body:
+                body("return index == other.index;")
+            with block.block(f"bool operator!=(const {name}& other) const") as body:
+                body("return index != other.index;")
+
+    def _sanity_check(self):
+        if self.record is None:
+            raise RuntimeError("Record is not set")
+        if self.record.array_members:
+            raise ValueError(
+                f"Array members of {self.record.name} are not supported as fields"
+            )
+        if self.alignment <= 0 or self.alignment & (self.alignment - 1):
+            raise ValueError(f"Alignment {self.alignment} is not a power of two")
@@ -1,4 +1,5 @@
 from ..core import CodeFormat, SourceFile
+from .include_generator import CppIncludes
 
 __doc__ = """
 """
@@ -7,16 +8,90 @@ __doc__ = """
 class CppSourceFile(SourceFile):
     """
     This class extends SourceFile class with some specific C++ constructions
+    and declares the sections of a typical C++ file:
+    includes, forward_declarations, types, inline_definitions, definitions
+    Ex.
+    # Python code
+    for cpp_class in classes:
+        cpp_class.render_to_string_declaration(cpp.section('types'))
+        cpp_class.render_to_string_implementation(cpp.section('definitions'))
+        cpp.add_include(f'"{cpp_class.name}.h"')
+
+    Included headers are registered in the include registry ('includes' property),
+    which deduplicates, sorts and groups them. Sections share the registry of the file.
+    The includes are written once, in one block: at the beginning of 'includes' section
+    by flush_sections() if the section is declared, otherwise by render_includes().
+    A header registered after the block has been written raises RuntimeError.
+    Elements could declare headers they need, e.g.
+    CppVariable(name='names', type='std::vector<std::string>', includes=['<vector>', '<string>'])
     """
 
     default_formatter = CodeFormat.ANSI_CPP
+    default_sections = (
+        "includes",
+        "forward_declarations",
+        "types",
+        "inline_definitions",
+        "definitions",
+    )
 
-    def __init__(self, filename, formatter=None, writer=None):
+    def __init__(self, filename, formatter=None, writer=None, sections=None):
         """
         Create C++ source file
         """
         formatter = self.default_formatter if formatter is None else formatter
-        SourceFile.__init__(self, filename, formatter=formatter, writer=writer)
+        SourceFile.__init__(
+            self, filename, formatter=formatter, writer=writer, sections=sections
+        )
+        self.includes = CppIncludes()
+
+    def fork(self):
+        """
+        Create a buffered copy of the file, which registers includes in the registry of the file
+        """
+        fork = SourceFile.fork(self)
+        fork.includes = self.includes
+        return fork
+
+    def add_include(self, header):
+        """
+        Register included header, e.g. '<vector>' or '"my_class.h"'
+        @raise: RuntimeError, if the includes of the file have been written without the header
+        """
+        if self.includes.is_rendered and header not in self.includes:
+            raise RuntimeError(
+                f"Include {header} is registered after the includes of {self.filename} "
+                "have been written"
+            )
+        self.includes.add(header)
+
+    def add_includes_from(self, *elements):
+        """
+        Register headers required by the elements and their children
+        @raise: RuntimeError, if the includes of the file have been written without a header
+        """
+        for element in elements:
+            for header in element.required_includes():
+                self.add_include(header)
+
+    def render_includes(self, cpp=None):
+        """
+        Write registered includes in one block, headers registered later raise RuntimeError
+        @param: cpp - target code handle, the file itself if None
+        """
+        self.includes.render(self if cpp is None else cpp)
+
+    def flush_sections(self):
+        """
+        Write registered includes at the beginning of 'includes' section and flush all sections
+        """
+        if "includes" in self.sections and not self.includes.is_rendered:
+            section = self._section_files.pop("includes", None)
+            includes = self.section("includes")
+            self.render_includes(includes)
+            if section is not None:
+                includes.out.write(section.out.getvalue())
+        SourceFile.flush_sections(self)
 
     def label(self, text):
         """
@@ -0,0 +1,197 @@
+import hashlib
+import json
+from string import Template
+
+__doc__ = """Declarative representation of function and method bodies.
+
+CppBody is an alternative to Python callables passed as 'implementation' property.
+It is a plain sequence of statement lines and nested blocks, so unlike callables
+it could be pickled, hashed, compared, serialized and used as a cache key.
+Lines may contain placeholders ($name or ${name}), which are substituted
+with the body parameters at render time; C++ braces need no escaping.
+
+Example:
+# Python code
+body = CppBody(
+    [
+        'if (n < 1)',
+        CppBlock(None, ['return 1;']),
+        'return n * ${name}(n - 1);',
+    ],
+    params={'name': 'factorial'},
+)
+func = CppFunction(name='factorial', ret_type='int', implementation=body)
+
+// Generated code
+int factorial(int n) {
+    if (n < 1)
+    {
+        return 1;
+    }
+    return n * factorial(n - 1);
+}
+"""
+
+
+class CppBlock:
+    """
+    Nested block of statements, rendered as
+    text
+    {
+        statements
+    }postfix
+    Available properties:
+    text - string, block heading (e.g. 'for (int i = 0; i < n; ++i)') or None
+    statements - sequence of strings and nested CppBlock instances
+    postfix - string, terminating symbol after the closing brace (e.g. ';')
+    """
+
+    def __init__(self, text, statements=(), postfix=None):
+        self.text = text
+        self.statements = _freeze(statements)
+        self.postfix = postfix
+
+    def __eq__(self, other):
+        return isinstance(other, CppBlock) and self._key() == other._key()
+
+    def __hash__(self):
+        return hash(self._key())
+
+    def __repr__(self):
+        statements = list(self.statements)
+        return f"CppBlock({self.text!r}, {statements!r}, postfix={self.postfix!r})"
+
+    def _key(self):
+        return self.text, self.statements, self.postfix
+
+    def render(self, cpp, params):
+        text = _substitute(self.text, params)
+        postfix = _substitute(self.postfix, params)
+        with cpp.block(text, postfix=postfix) as block:
+            _render_statements(self.statements, block, params)
+
+    def to_dict(self):
+        return {
+            "block": self.text,
+            "postfix": self.postfix,
+            "statements": _statements_to_list(self.statements),
+        }
+
+
+class CppBody:
+    """
+    Declarative implementation of a function, method or ctor body
+    Available properties:
+    statements - sequence of strings (lines) and CppBlock instances, empty string is an empty line
+    params - dictionary of placeholder values
+    CppBody instances are immutable, use bind() to get a body with other parameters
+    """
+
+    def __init__(self, statements=(), params=None):
+        self.statements = _freeze(statements)
+        self.params = tuple(sorted((params or {}).items()))
+
+    def __call__(self, cpp):
+        """
+        Render the body, so CppBody could be used wherever implementation callable is expected
+        """
+        self.render(cpp)
+
+    def __eq__(self, other):
+        return isinstance(other, CppBody) and self._key() == other._key()
+
+    def __hash__(self):
+        return hash(self._key())
+
+    def __repr__(self):
+        return f"CppBody({list(self.statements)!r}, params={dict(self.params)!r})"
+
+    def _key(self):
+        return self.statements, self.params
+
+    def bind(self, **params):
+        """
+        @return: new CppBody with updated placeholder values
+        """
+        return CppBody(self.statements, {**dict(self.params), **params})
+
+    def render(self, cpp):
+        """
+        Render statements into the code handle (source file or code block)
+        """
+        _render_statements(self.statements, cpp, dict(self.params))
+
+    def to_dict(self):
+        """
+        @return: JSON serializable representation of the body
+        """
+        return {
+            "statements": _statements_to_list(self.statements),
+            "params": dict(self.params),
+        }
+
+    @staticmethod
+    def from_dict(data):
+        """
+        Create CppBody from the representation returned by to_dict()
+        """
+        return CppBody(_statements_from_list(data["statements"]), data.get("params"))
+
+    def fingerprint(self):
+        """
+        @return: stable hex digest of the body, e.g. for caching of generated code
+        """
+        serialized = json.dumps(self.to_dict(), sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+
+def _freeze(statements):
+    if isinstance(statements, str):
+        raise TypeError("Statements must be a sequence of strings and CppBlock objects")
+    result = tuple(statements)
+    for statement in result:
+        if not isinstance(statement, (str, CppBlock)):
+            raise TypeError(f"Unsupported statement {statement!r}")
+    return result
+
+
+def _substitute(text, params):
+    if text is None or not params:
+        return text
+    try:
+        return Template(text).substitute(params)
+    except KeyError as e:
+        raise ValueError(f"Missing value for placeholder {e} in '{text}'") from e
+
+
+def _render_statements(statements, cpp, params):
+    for statement in statements:
+        if isinstance(statement, CppBlock):
+            statement.render(cpp, params)
+        elif statement:
+            cpp(_substitute(statement, params))
+        else:
+            cpp.newline()
+
+
+def _statements_to_list(statements):
+    return [
+        statement.to_dict() if isinstance(statement, CppBlock) else statement
+        for statement in statements
+    ]
+
+
+def _statements_from_list(items):
+    statements = []
+    for item in items:
+        if isinstance(item, dict):
+            statements.append(
+                CppBlock(
+                    item["block"],
+                    _statements_from_list(item["statements"]),
+                    postfix=item.get("postfix"),
+                )
+            )
+        else:
+            statements.append(item)
+    return statements
@@ -0,0 +1,263 @@
+from .array_generator import CppArray
+from .function_generator import CppFunction
+from .language_element import CppLanguageElement
+
+__doc__ = """String tables stored as one character pool and an array of offsets.
+
+An array of 'const char*' needs one pointer, i.e. one relocation in position-independent
+code, for every string. CppStringTable stores all strings in a single 'char' pool
+terminated by '\\0' and keeps their offsets in a 'uint16_t' or 'uint32_t' array,
+so the table has no relocations and is placed to read-only data.
+Equal strings are stored once, strings which are suffixes of other strings
+could share their storage (merge_suffixes).
+
+Example:
+# Python code
+table = CppStringTable(name='color_name', strings=['red', 'green', 'dark green'],
+                       merge_suffixes=True)
+table.render_to_string(cpp)
+
+// Generated C++ code
+static const char color_name_pool[] =
+    "red\\0"
+    "dark green";
+static const uint16_t color_name_offsets[] = {0, 9, 4};
+const char* color_name(size_t index) {
+    return color_name_pool + color_name_offsets[index];
+}
+"""
+
+
+def _escape_byte(byte, quote):
+    """
+    @return: C++ representation of the byte inside a literal enclosed in quote
+    """
+    char = chr(byte)
+    if char in ("\\", quote):
+        return f"\\{char}"
+    if char == "?":
+        # avoid trigraphs
+        return "\\?"
+    if 0x20 <= byte < 0x7F:
+        return char
+    if byte == 0:
+        # zeros terminate the pooled strings, i.e. they are never followed by a digit
+        return "\\0"
+    # octal escapes have at most 3 digits, so the following characters are never consumed
+    return f"\\{byte:03o}"
+
+
+def chunked(items, size):
+    """
+    Join the items into comma separated groups of the given size, the groups are
+    used as array items to render several items on one line
+    """
+    size = max(1, size)
+    return [", ".join(items[i : i + size]) for i in range(0, len(items), size)]
+
+
+class CppStringTable(CppLanguageElement):
+    """
+    The Python class that generates a string table with an accessor function
+    Available properties:
+    strings - list of Python strings, the accessor returns them by their index
+    merge_suffixes - boolean, strings which are suffixes of other strings share their storage
+    offset_type - 'uint16_t' or 'uint32_t', the smallest sufficient type if not set
+    pool_format - 'string' renders the pool as string literals,
+        'chars' renders character literals, which are not limited in length by compilers
+        (e.g. MSVC limits string literals to 64 KB)
+    accessor - name of the accessor function, the table name by default
+    chunk_size - maximum number of bytes rendered on one line of the pool
+    includes - headers required by the table, ['<cstddef>', '<cstdint>'] by default
+    """
+
+    PROPERTIES = CppLanguageElement.PROPERTIES | {
+        "strings",
+        "is_merge_suffixes",
+        "offset_type",
+        "pool_format",
+        "accessor",
+        "chunk_size",
+    }
+
+    OFFSET_TYPES = {"uint16_t": 0xFFFF, "uint32_t": 0xFFFFFFFF}
+    POOL_FORMATS = ("string", "chars")
+
+    def __init__(self, **properties):
+        super().__init__()
+        self.strings = []
+        self.is_merge_suffixes = False
+        self.offset_type = None
+        self.pool_format = "string"
+        self.accessor = None
+        self.chunk_size = 64
+        self.includes = ["<cstddef>", "<cstdint>"]
+        self.init_properties(properties)
+
+    def add_string(self, string):
+        """
+        @param: string - Python string
+        @return: index of the string in the table
+        """
+        self.strings.append(string)
+        return len(self.strings) - 1
+
+    def add_strings(self, strings):
+        """
+        @param: strings - list of Python strings
+        """
+        self.strings.extend(strings)
+
+    def layout(self):
+        """
+        Place the strings to the pool
+        @return: (pool, offsets) - bytes of the pool (UTF-8, every string terminated by 0)
+        and the list of offsets of the strings
+        """
+        self._sanity_check()
+        encoded = list(dict.fromkeys(s.encode("utf-8") for s in self.strings))
+        # string -> (string sharing its storage, position of the string in it)
+        owners = {s: (s, 0) for s in encoded}
+        if self.is_merge_suffixes:
+            # a string is a suffix of other strings if its reversed form is a prefix
+            # of their reversed forms, which directly follow it in the sorted order
+            by_suffix = sorted(encoded, key=lambda s: s[::-1])
+            for current, following in reversed(list(zip(by_suffix, by_suffix[1:]))):
+                if following.endswith(current):
+                    owner = owners[following][0]
+                    owners[current] = (owner, len(owner) - len(current))
+        positions = {}
+        pool = bytearray()
+        for s in encoded:
+            owner = owners[s][0]
+            if owner not in positions:
+                positions[owner] = len(pool)
+                pool += owner + b"\0"
+        offsets = []
+        for s in self.strings:
+            owner, shift = owners[s.encode("utf-8")]
+            offsets.append(positions[owner] + shift)
+        return bytes(pool), offsets
+
+    def pool_name(self):
+        return f"{self.name}_pool"
+
+    def offsets_name(self):
+        return f"{self.name}_offsets"
+
+    def accessor_function(self):
+        """
+        @return: CppFunction returning the string by its index
+        """
+        return CppFunction(
+            name=self.accessor or self.name,
+            ret_type="const char*",
+            arguments=["size_t index"],
+            implementation=[
+                f"return {self.pool_name()} + {self.offsets_name()}[index];"
+            ],
+        )
+
+    def offsets_array(self, pool=None, offsets=None):
+        """
+        @return: CppArray of the offsets
+        """
+        if pool is None or offsets is None:
+            pool, offsets = self.layout()
+        array = CppArray(
+            name=self.offsets_name(),
+            type=self._offset_type(len(pool)),
+            is_static=True,
+            is_const=True,
+            newline_align=len(offsets) > self.chunk_size // 4,
+        )
+        array.add_array_items(
+            chunked([str(offset) for offset in offsets], self.chunk_size // 4)
+        )
+        return array
+
+    def render_tables(self, cpp):
+        """
+        Render the pool and the offsets without the accessor function
+        """
+        pool, offsets = self.layout()
+        self._render_pool(cpp, pool)
+        self.offsets_array(pool, offsets).render_to_string(cpp)
+
+    def render_to_string(self, cpp):
+        """
+        Render the pool, the offsets and the accessor function
+        """
+        self.render_tables(cpp)
+        self.accessor_function().render_to_string(cpp)
+
+    def render_to_string_declaration(self, cpp):
+        """
+        Render the accessor function declaration, e.g.
+        const char* color_name(size_t index);
+        """
+        self.accessor_function().render_to_string_declaration(cpp)
+
+    def render_to_string_implementation(self, cpp):
+        """
+        Same as render_to_string(), the pool and the offsets have internal linkage
+        """
+        self.render_to_string(cpp)
+
+    def _sanity_check(self):
+        if not self.name:
+            raise RuntimeError("String table name is not set")
+        if self.pool_format not in self.POOL_FORMATS:
+            raise ValueError(f"Unknown pool format '{self.pool_format}'")
+        if self.offset_type is not None and self.offset_type not in self.OFFSET_TYPES:
+            raise ValueError(f"Unsupported offset type '{self.offset_type}'")
+        if not self.strings:
+            raise ValueError("String table is empty")
+        for string in self.strings:
+            if "\0" in string:
+                raise ValueError(f"String {string!r} contains a null character")
+
+    def _offset_type(self, pool_size):
+        """
+        @return: offset type, which could address the whole pool
+        """
+        if self.offset_type is not None:
+            if pool_size - 1 > self.OFFSET_TYPES[self.offset_type]:
+                raise ValueError(
+                    f"Pool of {pool_size} bytes could not be addressed by '{self.offset_type}'"
+                )
+            return self.offset_type
+        for offset_type, limit in self.OFFSET_TYPES.items():
+            if pool_size - 1 <= limit:
+                return offset_type
+        raise ValueError(f"Pool of {pool_size} bytes is too large")
+
+    def _render_pool(self, cpp, pool):
+        if self.pool_format == "chars":
+            array = CppArray(
+                name=self.pool_name(),
+                type="char",
+                is_static=True,
+                is_const=True,
+                newline_align=len(pool) > self.chunk_size // 4,
+            )
+            chars = [f"'{_escape_byte(byte, chr(39))}'" for byte in pool]
+            array.add_array_items(chunked(chars, self.chunk_size // 4))
+            array.render_to_string(cpp)
+            return
+        # the terminating zero of the last string is added by the literal itself
+        lines = []
+        line = ""
+        for byte in pool[:-1]:
+            line += _escape_byte(byte, '"')
+            if byte == 0 or len(line) >= self.chunk_size:
+                lines.append(f'"{line}"')
+                line = ""
+        if line or not lines:
+            lines.append(f'"{line}"')
+        with cpp.block(
+            f"static const char {self.pool_name()}[] =", braces=False
+        ) as block:
+            for text in lines[:-1]:
+                block(text)
+            block(f"{lines[-1]};")
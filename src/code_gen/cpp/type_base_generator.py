@@ -8,17 +8,24 @@ class CppBaseType(CppLanguageElement):
     """
     The Python class that provides the base type used in other elements:
         array, variable, template type
+    size, alignment - integers, layout of the type for CppStructLayout,
+        if the type is missing in its table
     """
 
     PROPERTIES = CppLanguageElement.PROPERTIES | {
         "type",
         "is_static",
         "is_extern",
+        "is_inline",
         "is_const",
         "is_constexpr",
+        "is_constinit",
+        "is_ptr",
         "is_ref",
         "is_integral",
         "documentation",
+        "size",
+        "alignment",
     }
 
     def __init__(self, **properties):
@@ -26,11 +33,16 @@ class CppBaseType(CppLanguageElement):
         self.type = None
         self.is_static = False
         self.is_extern = False
+        self.is_inline = False
         self.is_const = False
         self.is_constexpr = False
+        self.is_constinit = False
+        self.is_ptr = False
         self.is_ref = False
         self.is_integral = False
         self.documentation = None
+        self.size = None
+        self.alignment = None
         self.init_properties(properties)
 
     @staticmethod
@@ -40,15 +52,26 @@ class CppBaseType(CppLanguageElement):
             return CppBaseType(type=ctype, **properties)
         return ctype
 
-    def scoped_name(self, local_scope):
+    def referenced_elements(self):
+        if isinstance(self.type, CppBaseType):
+            return [self.type]
+        return []
+
+    def scoped_name(self, local_scope, extern=True):
+        """
+        @param: extern - False omits 'extern' prefix, i.e. in the definition
+        of an extern variable without initializer
+        """
         self._sanity_check()
         s_name = CppLanguageElement.resolved_name(self.type, local_scope)
         declarators = [
             f"{self._static()}",
-            f"{self._extern()}",
+            f"{self._extern()}" if extern else "",
+            f"{self._inline()}",
+            f"{self._constinit()}",
             f"{self._const()}",
             f"{self._constexpr()}",
-            f"{s_name}{self._ref()}",
+            f"{s_name}{self._ptr()}{self._ref()}",
         ]
         return " ".join(d for d in declarators if d)
 
@@ -62,6 +85,12 @@ class CppBaseType(CppLanguageElement):
             )
         if self.is_static and self.is_extern:
             raise ValueError("Type object can be either 'extern' or 'static', not both")
+        if self.is_inline and self.is_extern:
+            raise ValueError("Type object can be either 'extern' or 'inline', not both")
+        if self.is_constinit and self.is_constexpr:
+            raise ValueError(
+                "Type object can be either 'constinit' or 'constexpr', not both"
+            )
 
     def _static(self):
         """
@@ -75,6 +104,12 @@ class CppBaseType(CppLanguageElement):
         """
         return "extern" if self.is_extern else ""
 
+    def _inline(self):
+        """
+        @return: 'inline' prefix (C++17 inline variables), can't be used with 'extern'
+        """
+        return "inline" if self.is_inline else ""
+
     def _const(self):
         """
         @return: 'const' prefix, can't be used with 'constexpr'
@@ -87,12 +122,31 @@ class CppBaseType(CppLanguageElement):
         """
         return "constexpr" if self.is_constexpr else ""
 
+    def _constinit(self):
+        """
+        @return: 'constinit' prefix (C++20), can't be used with 'constexpr'
+        """
+        return "constinit" if self.is_constinit else ""
+
+    def _ptr(self):
+        return "*" if self.is_ptr else ""
+
     def _ref(self):
         return "&" if self.is_ref else ""
 
+    def is_indirect(self):
+        """
+        @return: True if the type is a pointer or a reference, i.e. it could be incomplete
+        """
+        return bool(self.is_ptr or self.is_ref)
+
 
 class CppTemplateType(CppBaseType):
-    """Implements an abstraction of a C++ templated type."""
+    """
+    Implements an abstraction of a C++ templated type.
+    Headers required by the template (e.g. includes=['<map>']) and by its template
+    arguments are reported by required_includes()
+    """
 
     PROPERTIES = CppBaseType.PROPERTIES | {
         "template_args",
@@ -103,7 +157,12 @@ class CppTemplateType(CppBaseType):
         self.template_args = []
         self.init_properties(properties)
 
-    def scoped_name(self, local_scope):
+    def referenced_elements(self):
+        return super().referenced_elements() + [
+            t_arg for t_arg in self.template_args if isinstance(t_arg, CppBaseType)
+        ]
+
+    def scoped_name(self, local_scope, extern=True):
         self._sanity_check()
         s_name = super().resolved_name(self.type, local_scope)
         t_args_names = []
@@ -0,0 +1,218 @@
+import io
+import json
+import os
+import re
+
+from ..core import SourceFile
+from .source_file import CppSourceFile
+
+__doc__ = """Unity (jumbo) build generation for many small generated source files.
+
+CppUnityBuild groups source files into unity translation units, which just
+include the grouped sources, by a size budget and/or a fixed count.
+Names with internal linkage (static variables and functions, const variables,
+definitions in anonymous namespaces) defined in more than one source of a group
+would clash in the unity file,
+so they are detected before the files reach the compiler.
+
+Example:
+# Python code
+unity = CppUnityBuild('unity_{index}.cpp', max_size=256 * 1024)
+for filename in generated_sources:
+    unity.add_source(filename)
+unity.render(manifest='unity_manifest.json')
+
+// Generated C++ code (unity_0.cpp)
+#include "generated_a.cpp"
+#include "generated_b.cpp"
+"""
+
+# namespace scope declaration, e.g.
+# static void helper(int n)
+# const char* const names[] = {...};
+_DECLARATION = re.compile(
+    r"^(?P<declarator>[^=;({\[]*?)(?<!:)\b(?P<name>[A-Za-z_]\w*)\s*(?P<end>[=;({\[])"
+)
+_NAMESPACE = re.compile(r"^(?:inline\s+)?namespace\b\s*(?P<name>[\w:]*)")
+_LINKAGE_SPECIFICATION = re.compile(r'^extern\s+""\s*(?:\{|$)')
+_LITERAL = re.compile(r"\"(?:\\.|[^\"\\])*\"|'(?:\\.|[^'\\])*'")
+# declarations, which do not define a function or a variable
+_NOT_DEFINITIONS = {"class", "struct", "union", "enum", "typedef", "using", "friend"}
+
+
+def _internal_linkage_name(code, anonymous):
+    """
+    @param: code - namespace scope line without literals and comments
+    @param: anonymous - True inside of an anonymous namespace
+    @return: name of the function or variable defined with internal linkage or None
+    """
+    match = _DECLARATION.match(code)
+    if not match or not match.group("declarator").strip():
+        return None
+    declarator = match.group("declarator")
+    keywords = set(re.findall(r"\w+", declarator))
+    if keywords & _NOT_DEFINITIONS or match.group("name") == "operator":
+        return None
+    if anonymous or "static" in keywords:
+        return match.group("name")
+    # const variables only, 'extern' and 'inline' ones have external linkage
+    if (
+        match.group("end") == "("
+        or keywords & {"extern", "inline"}
+        or "&" in declarator
+    ):
+        return None
+    if "constexpr" in keywords:
+        return match.group("name")
+    # 'const char* names[]' is not const, 'const char* const names[]' is
+    qualifiers = declarator.rsplit("*", 1)[-1]
+    return match.group("name") if "const" in re.findall(r"\w+", qualifiers) else None
+
+
+def internal_linkage_names(text):
+    """
+    Find names of functions and variables defined with internal linkage on the namespace
+    scope: static functions and variables, const variables and all definitions
+    in anonymous namespaces
+    @return: set of names
+    """
+    names = set()
+    # kind of every open brace: 'namespace', 'anonymous' or 'block'
+    scopes = []
+    pending = None
+    for line in text.splitlines():
+        code = _LITERAL.sub('""', line).split("//", 1)[0].strip()
+        if not code or code.startswith("#"):
+            continue
+        if "block" not in scopes:
+            namespace = _NAMESPACE.match(code)
+            if namespace and "=" not in code:
+                pending = "namespace" if namespace.group("name") else "anonymous"
+            elif _LINKAGE_SPECIFICATION.match(code):
+                pending = "namespace"
+            else:
+                name = _internal_linkage_name(code, "anonymous" in scopes)
+                if name:
+                    names.add(name)
+        for char in code:
+            if char == "{":
+                scopes.append(pending or "block")
+                pending = None
+            elif char == "}" and scopes:
+                scopes.pop()
+    return names
+
+
+class CppUnityBuild:
+    """
+    Groups source files into unity translation units
+    Available properties:
+    filename - string, unity file name with '{index}' placeholder
+    max_size - size budget of one unity file in bytes (sum of grouped sources)
+    max_count - maximum number of sources in one unity file
+    split_on_clash - start a new unity file when a source would introduce an internal linkage
+        name clash, clashes raise ValueError otherwise
+    """
+
+    def __init__(self, filename, max_size=None, max_count=None, split_on_clash=False):
+        if max_size is None and max_count is None:
+            raise ValueError("Either size budget or maximum count must be set")
+        self.filename = filename
+        self.max_size = max_size
+        self.max_count = max_count
+        self.split_on_clash = split_on_clash
+        # list of (filename, text)
+        self.sources = []
+
+    def add_source(self, source, text=None):
+        """
+        @param: source - file name or SourceFile instance of a generated source
+        @param: text - content of the source, read from the file if None
+        """
+        filename = source.filename if isinstance(source, SourceFile) else source
+        if text is None:
+            with open(filename) as f:
+                text = f.read()
+        self.sources.append((filename, text))
+
+    def unity_filename(self, index):
+        """
+        @return: file name of the unity file with the given index
+        """
+        return self.filename.format(index=index)
+
+    def groups(self):
+        """
+        Group the sources in the order of addition
+        @return: list of lists of (filename, text) pairs
+        @raise: ValueError, if the names with internal linkage clash and split_on_clash is False
+        """
+        groups = []
+        clashes = []
+        group, size, names = [], 0, {}
+        for filename, text in self.sources:
+            source_names = internal_linkage_names(text)
+            clashing = sorted(source_names & names.keys())
+            if group and (
+                (self.max_size is not None and size + len(text) > self.max_size)
+                or (self.max_count is not None and len(group) >= self.max_count)
+                or (clashing and self.split_on_clash)
+            ):
+                groups.append(group)
+                group, size, names = [], 0, {}
+                clashing = []
+            for name in clashing:
+                clashes.append(
+                    f"'{name}' in {names[name]} and {filename} "
+                    f"({self.unity_filename(len(groups))})"
+                )
+            for name in source_names:
+                names.setdefault(name, filename)
+            group.append((filename, text))
+            size += len(text)
+        if group:
+            groups.append(group)
+        if clashes:
+            raise ValueError(
+                "Internal linkage names clash in unity build:\n" + "\n".join(clashes)
+            )
+        return groups
+
+    def manifest(self):
+        """
+        @return: dictionary mapping unity file names to the list of grouped sources
+        """
+        return {
+            self.unity_filename(index): [filename for filename, _ in group]
+            for index, group in enumerate(self.groups())
+        }
+
+    def render_to_strings(self):
+        """
+        @return: list of (unity filename, text) pairs
+        """
+        results = []
+        for unity_filename, sources in self.manifest().items():
+            directory = os.path.dirname(unity_filename) or "."
+            writer = io.StringIO()
+            cpp = CppSourceFile(unity_filename, writer=writer)
+            for source in sources:
+                path = os.path.relpath(source, directory).replace(os.sep, "/")
+                cpp(f'#include "{path}"')
+            results.append((unity_filename, writer.getvalue()))
+        return results
+
+    def render(self, manifest=None):
+        """
+        Write the unity files and optionally the JSON manifest
+        @param: manifest - file name of the manifest
+        @return: list of written unity file names
+        """
+        results = self.render_to_strings()
+        for filename, text in results:
+            with open(filename, "w") as out:
+                out.write(text)
+        if manifest is not None:
+            with open(manifest, "w") as out:
+                json.dump(self.manifest(), out, indent=2)
+        return [filename for filename, _ in results]
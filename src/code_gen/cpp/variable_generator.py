@@ -1,5 +1,6 @@
 from textwrap import dedent
 
+from .attribute_generator import CppAttributes
 from .language_element import CppLanguageElement
 from .type_base_generator import CppBaseType
 
@@ -71,17 +72,29 @@ class CppVariable(CppLanguageElement):
     Available properties:
     type - string, variable type
     is_static - boolean, 'static' prefix
-    is_extern - boolean, 'extern' prefix
+    is_extern - boolean, 'extern' prefix, the variable is declared in a header
+        and defined once in a source file by render_to_string_implementation()
+    is_inline - boolean, 'inline' prefix (C++17), the variable is defined in a header,
+        the linker keeps one copy for all translation units
     is_const - boolean, 'const' prefix
     is_constexpr - boolean, 'constexpr' prefix
+    is_constinit - boolean, 'constinit' prefix (C++20), static initialization of a mutable variable
+    is_ptr - boolean, pointer to the type, e.g. 'Node*'
     value - string, value to be initialized with.
         'a = value;' for automatic variables, 'a(value)' for the class member
     documentation - string, '/// Example doxygen'
+    includes - list of headers required by the variable type, e.g. ['<string>']
+    size, alignment - integers, layout of the type if it is unknown to CppStructLayout
+    is_pinned - boolean, the class member keeps its position when the class layout is optimized
+    attributes - list of attributes, e.g. [('alignas', 64)], ['restrict'] for pointers
+        (see CppAttributes)
     """
 
     PROPERTIES = CppLanguageElement.PROPERTIES | {
         "value",
         "documentation",
+        "is_pinned",
+        "attributes",
     }
 
     def __init__(self, **properties):
@@ -89,10 +102,48 @@ class CppVariable(CppLanguageElement):
         self.type = CppBaseType(**properties)
         self.value = None
         self.documentation = None
+        self.is_pinned = False
+        self.attributes = None
         self.init_properties(properties)
 
-    def _declaration(self, local_scope):
-        return f"{self.type.scoped_name(local_scope)} {self.scoped_name(local_scope)}"
+    def referenced_elements(self):
+        return [self.type]
+
+    def is_defined_by_declaration(self):
+        """
+        @return: True if the declaration is the definition as well, i.e. inline variables
+        and constexpr class members, which are not defined in a source file
+        """
+        return bool(
+            self.type.is_inline or (self.type.is_constexpr and self.is_class_member())
+        )
+
+    def has_single_definition(self):
+        """
+        @return: True for extern and inline variables outside of classes
+        """
+        if self.is_class_member():
+            return False
+        return bool(self.type.is_extern or self.type.is_inline)
+
+    def _attributes(self):
+        """
+        @return: validated CppAttributes of the variable
+        """
+        attributes = CppAttributes(self.attributes)
+        attributes.validate("variable", self.name, is_ptr=self.type.is_ptr)
+        return attributes
+
+    def _declaration(self, local_scope, definition=False):
+        attributes = self._attributes()
+        declaration = [
+            attributes.prefix(definition),
+            # 'extern' without initializer would not define the variable
+            self.type.scoped_name(local_scope, not definition or bool(self.value)),
+            attributes.declarator(),
+            self.scoped_name(local_scope),
+        ]
+        return " ".join(d for d in declaration if d)
 
     def _assignment(self, value, local_scope):
         """
@@ -128,15 +179,21 @@ class CppVariable(CppLanguageElement):
         """
         Generates declaration for the class member variables, for example
         int m_var;
+
+        Extern and inline variables could be declared outside of classes as well
+        extern const int a;
         """
         if not self.is_class_member():
-            raise RuntimeError(
-                "For automatic variable use its render_to_string() method"
-            )
+            if not (self.type.is_extern or self.type.is_inline):
+                raise RuntimeError(
+                    "For automatic variable use its render_to_string() method"
+                )
+            self.render_to_string(cpp)
+            return
 
         if self.documentation and self.is_class_member():
             cpp(dedent(self.documentation))
-        if self.type.is_constexpr:
+        if self.type.is_constexpr or self.type.is_inline:
             cpp(f"{self._assignment(self.value, local_scope=True)};")
         elif self.value and not self.type.is_static:
             cpp(f"{self._declaration(local_scope=True)}{{{self._init_value()}}};")
@@ -155,11 +212,29 @@ class CppVariable(CppLanguageElement):
         m_var(0)
         for non-static class members.
         That string could be used in constructor initialization string
+
+        The only definition of an extern variable keeps 'extern', e.g.
+        extern const int a = 10;
+        otherwise a const variable would have internal linkage in source files,
+        which do not include its declaration. Definitions without initializer
+        are rendered without 'extern', e.g.
+        int b;
+        Inline variables and constexpr class members are defined by their declaration,
+        nothing is rendered
         """
+        if self.is_defined_by_declaration():
+            return
         if not self.is_class_member():
-            raise RuntimeError(
-                "For automatic variable use its render_to_string() method"
-            )
+            if not self.type.is_extern:
+                raise RuntimeError(
+                    "For automatic variable use its render_to_string() method"
+                )
+            self._sanity_check()
+            if self.documentation:
+                cpp(dedent(self.documentation))
+            declaration = self._declaration(local_scope=True, definition=True)
+            cpp(f"{declaration} = {self.value};" if self.value else f"{declaration};")
+            return
 
         # generate definition for the static class member
         if not self.type.is_constexpr:
@@ -180,6 +255,12 @@ class CppVariable(CppLanguageElement):
         """
         if self.type.is_constexpr and not self.value:
             raise ValueError("Variable object must be initialized when 'constexpr'")
+        if self.type.is_extern and self.is_class_member():
+            raise ValueError("Class member variable could not be 'extern'")
+        if self.type.is_inline and self.type.is_static and not self.is_class_member():
+            raise ValueError(
+                "Static inline variable has a copy in every translation unit, remove 'static'"
+            )
 
     def _static(self):
         """
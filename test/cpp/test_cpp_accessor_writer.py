@@ -0,0 +1,174 @@
+import io
+import unittest
+from textwrap import dedent
+
+from code_gen.cpp import (
+    CppSourceFile,
+    CppAccessors,
+    CppArray,
+    CppClass,
+    CppEnum,
+    CppPlacementPolicy,
+    CppVariable,
+)
+from test.comparing_tools import normalize_code, debug_dump, is_debug
+
+__doc__ = """Unit tests for C++ code generator
+"""
+
+
+class TestCppAccessors(unittest.TestCase):
+    """
+    Test generation of getters and setters
+    """
+
+    def test_declaration(self):
+        user = CppClass(name="User")
+        user.add_variable(CppVariable(name="m_id", type="int"))
+        user.add_variable(CppVariable(name="m_name", type="std::string"))
+        user.add_variable(CppVariable(name="m_limit", type="size_t", is_const=True))
+        user.add_accessors()
+        writer = io.StringIO()
+        cpp = CppSourceFile(None, writer=writer)
+        user.render_to_string_declaration(cpp)
+        expected_output = dedent("""\
+            class User
+            {
+            public:
+                [[nodiscard]] int GetId() const noexcept;
+                void SetId(int id) noexcept;
+                [[nodiscard]] const std::string& GetName() const noexcept;
+                void SetName(std::string name) noexcept;
+                [[nodiscard]] size_t GetLimit() const noexcept;
+            private:
+                int m_id;
+                std::string m_name;
+                const size_t m_limit;
+            };""")
+        actual_output = writer.getvalue().strip()
+        expected_output_normalized = normalize_code(expected_output)
+        actual_output_normalized = normalize_code(actual_output)
+        if is_debug():
+            debug_dump(expected_output_normalized, actual_output_normalized, "cpp")
+        self.assertEqual(expected_output_normalized, actual_output_normalized)
+        self.assertEqual(user.required_includes(), ["<utility>"])
+
+    def test_definitions_in_class(self):
+        user = CppClass(name="User", placement=CppPlacementPolicy(class_limit=1))
+        user.add_variable(CppVariable(name="m_name", type="std::string"))
+        user.add_accessors(getter="{name}", setter="set{name}")
+        writer = io.StringIO()
+        cpp = CppSourceFile(None, writer=writer)
+        user.render_to_string(cpp)
+        expected_output = dedent("""\
+            class User
+            {
+            public:
+                [[nodiscard]] const std::string& Name() const noexcept
+                {
+                    return m_name;
+                }
+                void setName(std::string name) noexcept
+                {
+                    m_name = std::move(name);
+                }
+            private:
+                std::string m_name;
+            };""")
+        actual_output = writer.getvalue().strip()
+        expected_output_normalized = normalize_code(expected_output)
+        actual_output_normalized = normalize_code(actual_output)
+        if is_debug():
+            debug_dump(expected_output_normalized, actual_output_normalized, "cpp")
+        self.assertEqual(expected_output_normalized, actual_output_normalized)
+
+    def test_const_pointers(self):
+        writer = io.StringIO()
+        cpp = CppSourceFile(None, writer=writer)
+        user = CppClass(name="User")
+        user.add_variable(CppVariable(name="m_label", type="char*", is_const=True))
+        user.add_accessors()
+        user.render_to_string(cpp)
+        # the pointed-to data stays const, the pointer could be set
+        expected_output = dedent("""\
+            class User
+            {
+            public:
+                [[nodiscard]] const char* GetLabel() const noexcept;
+                void SetLabel(const char* label) noexcept;
+            private:
+                const char* m_label;
+            };
+            const char* User::GetLabel() const noexcept
+            {
+                return m_label;
+            }
+
+            void User::SetLabel(const char* label) noexcept
+            {
+                m_label = label;
+            }""")
+        actual_output = writer.getvalue().strip()
+        expected_output_normalized = normalize_code(expected_output)
+        actual_output_normalized = normalize_code(actual_output)
+        if is_debug():
+            debug_dump(expected_output_normalized, actual_output_normalized, "cpp")
+        self.assertEqual(expected_output_normalized, actual_output_normalized)
+
+    def test_passing(self):
+        vec = CppClass(name="Vec3", is_struct=True)
+        for name in "xyz":
+            vec.add_variable(CppVariable(name=name, type="float"))
+        matrix = CppClass(name="Matrix", is_struct=True)
+        matrix.add_array(CppArray(name="m", type="float", array_size=16))
+        color = CppEnum(name="Color", enum_class=True)
+        color.add_items(["Red"])
+        shape = CppClass(name="Shape")
+        shape.add_variable(CppVariable(name="m_center", type=vec))
+        shape.add_variable(CppVariable(name="m_transform", type=matrix))
+        shape.add_variable(CppVariable(name="m_color", type=color))
+        shape.add_variable(CppVariable(name="m_parent", type="Shape", is_ptr=True))
+        shape.add_variable(CppVariable(name="m_points", type="std::vector<Vec3>"))
+        shape.add_variable(CppVariable(name="m_style", type="Style"))
+        shape.add_variable(CppVariable(name="m_count", type="int", is_static=True))
+        self.assertEqual(
+            CppAccessors(shape).report(),
+            {
+                "m_center": "value",
+                "m_transform": "reference",
+                "m_color": "value",
+                "m_parent": "value",
+                "m_points": "move",
+                "m_style": "reference",
+            },
+        )
+        self.assertEqual(
+            CppAccessors(shape, trivial_types=["Style"]).passing(
+                shape.variable_members[5]
+            ),
+            "reference",
+        )
+        self.assertEqual(
+            CppAccessors(
+                shape, type_layouts={"Style": (4, 4)}, trivial_types=["Style"]
+            ).passing(shape.variable_members[5]),
+            "value",
+        )
+        methods = shape.add_accessors(members=["m_style"], getters=False)
+        self.assertEqual(
+            methods[0].short_header_declaration_to_string(),
+            "void SetStyle(const Style& style)",
+        )
+
+    def test_errors(self):
+        user = CppClass(name="User")
+        user.add_variable(CppVariable(name="m_id", type="int"))
+        with self.assertRaises(ValueError):
+            user.add_accessors(members=["m_unknown"])
+        user.add_accessors(members=["m_id"])
+        with self.assertRaises(ValueError):
+            user.add_accessors(members=["m_id"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -71,6 +71,56 @@ class TestCppArrayStringIo(unittest.TestCase):
         expected_output = "static int Cls::m_my_static_array[] = {1, 2, 0};"
         self.assertEqual(expected_output, writer.getvalue().strip())
 
+    def test_extern_single_definition(self):
+        header = io.StringIO()
+        source = io.StringIO()
+        arr = CppArray(name="my_table", type="int", is_const=True, is_extern=True)
+        arr.add_array_items(["1", "2", "0"])
+        arr.render_to_string(CppSourceFile(None, writer=header))
+        arr.render_to_string_implementation(CppSourceFile(None, writer=source))
+        self.assertEqual("extern const int my_table[3];\n", header.getvalue())
+        self.assertEqual(
+            "extern const int my_table[] = {1, 2, 0};\n", source.getvalue()
+        )
+
+    def test_extern_definition_without_items(self):
+        writer = io.StringIO()
+        cpp = CppSourceFile(None, writer=writer)
+        arr = CppArray(name="handlers", type="Handler*", is_extern=True, array_size=4)
+        arr.render_to_string_implementation(cpp)
+        # the initializer makes it the definition, 'extern' keeps the linkage
+        self.assertEqual(
+            "extern Handler* handlers[4] = {nullptr};\n", writer.getvalue()
+        )
+
+    def test_inline(self):
+        writer = io.StringIO()
+        cpp = CppSourceFile(None, writer=writer)
+        arr = CppArray(name="my_table", type="int", is_const=True, is_inline=True)
+        arr.add_array_items(["1", "2", "0"])
+        arr.render_to_string_declaration(cpp)
+        arr.render_to_string_implementation(cpp)
+        self.assertEqual(
+            "inline const int my_table[] = {1, 2, 0};\n", writer.getvalue()
+        )
+
+    def test_inline_class_member(self):
+        writer = io.StringIO()
+        cpp = CppSourceFile(None, writer=writer)
+        cls = CppClass(name="Cls")
+        arr = CppArray(
+            name="s_table", type="int", is_static=True, is_const=True, is_inline=True
+        )
+        arr.add_array_items(["1", "2"])
+        cls.add_array(arr)
+        cls.render_to_string(cpp)
+        self.assertIn("static inline const int s_table[] = {1, 2};", writer.getvalue())
+        self.assertNotIn("Cls::s_table", writer.getvalue())
+
+    def test_extern_static_raises(self):
+        arr = CppArray(name="my_table", type="int", is_static=True, is_extern=True)
+        self.assertRaises(ValueError, arr.render_to_string, None)
+
     def test_missing_type(self):
         arr = CppArray(name="my_array", array_size=5)
         self.assertRaises(RuntimeError, arr.render_to_string, None)
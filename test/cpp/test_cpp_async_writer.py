@@ -0,0 +1,184 @@
+import asyncio
+import io
+import unittest
+from textwrap import dedent
+
+from code_gen.core import CodeRecorder
+from code_gen.cpp import (
+    CppSourceFile,
+    CppFunction,
+    CppClass,
+    CppVariable,
+    render_elements_async,
+)
+from test.comparing_tools import normalize_code, debug_dump, is_debug
+
+__doc__ = """Unit tests for C++ code generator
+"""
+
+
+class TestCppAsyncRender(unittest.TestCase):
+    """
+    Test rendering of elements with coroutine callbacks
+    """
+
+    def test_code_recorder_replay(self):
+        recorder = CodeRecorder()
+        recorder("int a = 0;")
+        with recorder.block("if (a == 0)") as block:
+            block("return;")
+        recorder.newline()
+        writer = io.StringIO()
+        cpp = CppSourceFile(None, writer=writer)
+        with cpp.block("void f()") as block:
+            recorder.replay(block)
+        expected_output = dedent("""\
+            void f()
+            {
+                int a = 0;
+                if (a == 0)
+                {
+                    return;
+                }
+
+            }""")
+        actual_output = writer.getvalue().strip()
+        expected_output_normalized = normalize_code(expected_output)
+        actual_output_normalized = normalize_code(actual_output)
+        if is_debug():
+            debug_dump(expected_output_normalized, actual_output_normalized, "cpp")
+        self.assertEqual(expected_output_normalized, actual_output_normalized)
+
+    def test_code_recorder_block_arguments(self):
+        recorder = CodeRecorder()
+        with recorder.block("struct X", False, ";") as block:
+            block("int a;")
+        writer = io.StringIO()
+        recorder.replay(CppSourceFile(None, writer=writer))
+        expected_output = dedent("""\
+            struct X {
+                int a;
+            };""")
+        actual_output = writer.getvalue().strip()
+        expected_output_normalized = normalize_code(expected_output)
+        actual_output_normalized = normalize_code(actual_output)
+        if is_debug():
+            debug_dump(expected_output_normalized, actual_output_normalized, "cpp")
+        self.assertEqual(expected_output_normalized, actual_output_normalized)
+
+    def test_render_async_function(self):
+        writer = io.StringIO()
+        cpp = CppSourceFile(None, writer=writer)
+
+        async def body(cpp):
+            await asyncio.sleep(0)
+            cpp("return 42;")
+
+        func = CppFunction(name="GetAnswer", ret_type="int", implementation=body)
+        asyncio.run(func.render_async(cpp))
+        expected_output = dedent("""\
+            int GetAnswer() {
+                return 42;
+            }""")
+        actual_output = writer.getvalue().strip()
+        expected_output_normalized = normalize_code(expected_output)
+        actual_output_normalized = normalize_code(actual_output)
+        if is_debug():
+            debug_dump(expected_output_normalized, actual_output_normalized, "cpp")
+        self.assertEqual(expected_output_normalized, actual_output_normalized)
+
+    def test_sync_render_of_coroutine_raises(self):
+        writer = io.StringIO()
+        cpp = CppSourceFile(None, writer=writer)
+
+        async def body(cpp):
+            cpp("return 42;")
+
+        func = CppFunction(name="GetAnswer", ret_type="int", implementation=body)
+        self.assertRaises(RuntimeError, func.render_to_string, cpp)
+
+    def test_siblings_are_deterministic(self):
+        writer = io.StringIO()
+        cpp = CppSourceFile(None, writer=writer)
+        for index in range(5):
+            func = CppFunction(
+                name=f"f{index}",
+                ret_type="int",
+                implementation=lambda cpp, index=index: cpp(f"return {index};"),
+            )
+            func.render_to_string(cpp)
+        expected_output = writer.getvalue()
+
+        writer = io.StringIO()
+        cpp = CppSourceFile(None, writer=writer)
+        functions = []
+        for index in range(5):
+
+            async def body(cpp, index=index):
+                # later siblings finish first
+                await asyncio.sleep(0.01 * (5 - index))
+                cpp(f"return {index};")
+
+            functions.append(
+                CppFunction(name=f"f{index}", ret_type="int", implementation=body)
+            )
+        asyncio.run(render_elements_async(cpp, functions))
+        actual_output = writer.getvalue()
+
+        expected_output_normalized = normalize_code(expected_output)
+        actual_output_normalized = normalize_code(actual_output)
+        if is_debug():
+            debug_dump(expected_output_normalized, actual_output_normalized, "cpp")
+        self.assertEqual(expected_output_normalized, actual_output_normalized)
+
+    def test_class_with_async_ctor_and_methods(self):
+        writer = io.StringIO()
+        cpp = CppSourceFile(None, writer=writer)
+        cpp_class = CppClass(name="MyClass", is_struct=True)
+        cpp_class.add_variable(CppVariable(name="m_var", type="int"))
+
+        async def initializers():
+            await asyncio.sleep(0)
+            return ["m_var{ 0 }"]
+
+        async def ctor_body(cpp):
+            pass
+
+        async def body(cpp):
+            await asyncio.sleep(0)
+            cpp("return m_var;")
+
+        cpp_class.add_method(
+            CppClass.CppCtor(
+                name="MyClass", initializers=initializers, implementation=ctor_body
+            )
+        )
+        cpp_class.add_method(
+            CppClass.CppMethod(name="GetVar", ret_type="int", implementation=body)
+        )
+        asyncio.run(cpp_class.render_async(cpp))
+        expected_output = dedent("""\
+            struct MyClass
+            {
+                MyClass();
+                int GetVar();
+                int m_var;
+            };
+            MyClass::MyClass() : m_var{ 0 }
+            {
+            }
+
+            int MyClass::GetVar()
+            {
+                return m_var;
+            }""")
+        actual_output = writer.getvalue().strip()
+        expected_output_normalized = normalize_code(expected_output)
+        actual_output_normalized = normalize_code(actual_output)
+        if is_debug():
+            debug_dump(expected_output_normalized, actual_output_normalized, "cpp")
+        self.assertEqual(expected_output_normalized, actual_output_normalized)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,196 @@
+import io
+import unittest
+from textwrap import dedent
+
+from code_gen.cpp import (
+    CppSourceFile,
+    CppArray,
+    CppAttributes,
+    CppClass,
+    CppFunction,
+    CppVariable,
+    compiler_profile,
+)
+from test.comparing_tools import normalize_code, debug_dump, is_debug
+
+__doc__ = """Unit tests for C++ code generator
+"""
+
+
+class TestCppAttributes(unittest.TestCase):
+    """
+    Test rendering and validation of element attributes
+    """
+
+    def test_class(self):
+        writer = io.StringIO()
+        cpp = CppSourceFile(None, writer=writer)
+        my_class = CppClass(name="Table")
+        my_class.add_method(
+            CppClass.CppMethod(
+                name="Find",
+                ret_type="int",
+                arguments=["int key"],
+                is_const=True,
+                attributes=["nodiscard", "noexcept", "always_inline"],
+                implementation=["return key;"],
+            )
+        )
+        my_class.add_method(
+            CppClass.CppCtor(
+                name="Table",
+                attributes=["noexcept"],
+                initializers=["m_data(nullptr)"],
+                implementation=[],
+            )
+        )
+        my_class.add_variable(
+            CppVariable(
+                name="m_data", type="float", is_ptr=True, attributes=["restrict"]
+            )
+        )
+        my_class.render_to_string(cpp)
+        expected_output = dedent("""\
+            class Table
+            {
+            public:
+                [[nodiscard]] [[gnu::always_inline]] int Find(int key) const noexcept;
+                Table() noexcept;
+            private:
+                float* __restrict m_data;
+            };
+            int Table::Find(int key) const noexcept
+            {
+                return key;
+            }
+
+            Table::Table() noexcept : m_data(nullptr)
+            {
+            }""")
+        actual_output = writer.getvalue().strip()
+        expected_output_normalized = normalize_code(expected_output)
+        actual_output_normalized = normalize_code(actual_output)
+        if is_debug():
+            debug_dump(expected_output_normalized, actual_output_normalized, "cpp")
+        self.assertEqual(expected_output_normalized, actual_output_normalized)
+
+    def test_msvc_profile(self):
+        writer = io.StringIO()
+        cpp = CppSourceFile(None, writer=writer)
+        function = CppFunction(
+            name="Slow",
+            ret_type="void",
+            attributes=["cold", "noinline", ("section", ".text.unlikely")],
+            implementation=[],
+        )
+        function.render_to_string_declaration(cpp)
+        function.render_to_string_implementation(cpp)
+        my_class = CppClass(name="Table")
+        method = CppClass.CppMethod(
+            name="Find",
+            ret_type="int",
+            arguments=["int key"],
+            is_const=True,
+            attributes=["nodiscard", "noexcept", "always_inline"],
+            implementation=["return key;"],
+        )
+        my_class.add_method(method)
+        with compiler_profile("msvc"):
+            function.render_to_string_declaration(cpp)
+            method.render_to_string_declaration(cpp)
+        expected_output = dedent("""\
+            [[gnu::cold]] [[gnu::noinline]] [[gnu::section(".text.unlikely")]] void Slow();
+            [[gnu::section(".text.unlikely")]] void Slow() {
+            }
+            __declspec(noinline) void Slow();
+            [[nodiscard]] __forceinline int Find(int key) const noexcept;""")
+        actual_output = writer.getvalue().strip()
+        expected_output_normalized = normalize_code(expected_output)
+        actual_output_normalized = normalize_code(actual_output)
+        if is_debug():
+            debug_dump(expected_output_normalized, actual_output_normalized, "cpp")
+        self.assertEqual(expected_output_normalized, actual_output_normalized)
+
+    def test_profile_of_rendering_threads(self):
+        writer = io.StringIO()
+        cpp = CppSourceFile(None, writer=writer)
+        functions = [
+            CppFunction(
+                name=f"Slow{index}",
+                ret_type="void",
+                attributes=["noinline"],
+                implementation=[],
+            )
+            for index in range(4)
+        ]
+        with compiler_profile("msvc"):
+            cpp.render_elements(
+                functions,
+                render=lambda element, cpp: element.render_to_string_declaration(cpp),
+                max_workers=4,
+            )
+        expected_output = dedent("""\
+            __declspec(noinline) void Slow0();
+            __declspec(noinline) void Slow1();
+            __declspec(noinline) void Slow2();
+            __declspec(noinline) void Slow3();""")
+        actual_output = writer.getvalue().strip()
+        expected_output_normalized = normalize_code(expected_output)
+        actual_output_normalized = normalize_code(actual_output)
+        if is_debug():
+            debug_dump(expected_output_normalized, actual_output_normalized, "cpp")
+        self.assertEqual(expected_output_normalized, actual_output_normalized)
+
+    def test_variables_and_arrays(self):
+        writer = io.StringIO()
+        cpp = CppSourceFile(None, writer=writer)
+        CppArray(
+            name="lut",
+            type="int",
+            is_constexpr=True,
+            items=["1", "2"],
+            attributes={"alignas": 64, "section": ".rodata.hot"},
+        ).render_to_string(cpp)
+        buffer = CppVariable(
+            name="buffer", type="char", is_extern=True, attributes=[("alignas", 16)]
+        )
+        buffer.render_to_string_declaration(cpp)
+        buffer.render_to_string_implementation(cpp)
+        expected_output = dedent("""\
+            [[gnu::section(".rodata.hot")]] alignas(64) constexpr int lut[] = {1, 2};
+            alignas(16) extern char buffer;
+            alignas(16) char buffer;""")
+        actual_output = writer.getvalue().strip()
+        expected_output_normalized = normalize_code(expected_output)
+        actual_output_normalized = normalize_code(actual_output)
+        if is_debug():
+            debug_dump(expected_output_normalized, actual_output_normalized, "cpp")
+        self.assertEqual(expected_output_normalized, actual_output_normalized)
+
+    def test_validation(self):
+        cpp = CppSourceFile(None, writer=io.StringIO())
+        for kind, attributes in [
+            ("function", ["hot", "cold"]),
+            ("function", ["always_inline", "noinline"]),
+            ("function", ["alignas"]),
+            ("function", ["likely"]),
+            ("variable", ["noexcept"]),
+            ("variable", ["restrict"]),
+            ("array", [("alignas", 48)]),
+            ("array", [("section", "")]),
+            ("array", [("alignas", 16), ("noexcept", 1)]),
+        ]:
+            attributes = CppAttributes(attributes)
+            self.assertRaises(ValueError, attributes.validate, kind, "element")
+        self.assertRaises(ValueError, CppAttributes, ["fast"])
+        function = CppFunction(
+            name="f", ret_type="int", attributes=["hot", "cold"], implementation=[]
+        )
+        self.assertRaises(ValueError, function.render_to_string, cpp)
+        with self.assertRaises(ValueError):
+            with compiler_profile("icc"):
+                pass
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,7 +2,14 @@ import unittest
 import io
 from textwrap import dedent
 
-from code_gen.cpp import CppSourceFile, CppEnum, CppArray, CppVariable, CppClass
+from code_gen.cpp import (
+    CppSourceFile,
+    CppEnum,
+    CppArray,
+    CppVariable,
+    CppClass,
+    CppClassScope,
+)
 from test.comparing_tools import normalize_code, debug_dump, is_debug
 
 __doc__ = """Unit tests for C++ code generator"""
@@ -265,5 +272,74 @@ class TestCppClassStringIo(unittest.TestCase):
         self.assertEqual(expected_output_normalized, actual_output_normalized)
 
 
+class TestCppClassHeaderAndSource(unittest.TestCase):
+    """
+    Test rendering of class declaration and definition in one walk
+    """
+
+    def make_class(self, name, depth):
+        cpp_class = CppClass(name=name, documentation="/// Generated class")
+        cpp_enum = CppEnum(name="Items")
+        cpp_enum.add_items(["One", "Two"])
+        cpp_class.add_enum(cpp_enum)
+        cpp_class.add_variable(
+            CppVariable(name="m_count", type="int", is_static=True, value="0")
+        )
+        cpp_class.add_variable(CppVariable(name="m_var", type="int", value="1"))
+        array = CppArray(name="m_items", type="int", is_static=True, is_const=True)
+        array.add_array_items(["1", "2"])
+        cpp_class.add_array(array)
+        cpp_class.add_method(
+            CppClass.CppMethod(
+                name="Get", ret_type="int", implementation=["return m_var;"]
+            )
+        )
+        cpp_class.add_method(
+            CppClass.CppMethod(
+                name="Run", ret_type="void", is_virtual=True, is_pure_virtual=True
+            )
+        )
+        scope = CppClassScope(scope="protected")
+        scope.add_method(
+            CppClass.CppMethod(
+                name="Set", ret_type="void", implementation=["m_var = 0;"]
+            )
+        )
+        cpp_class.add_internal_scope(scope)
+        cpp_class.add_postfix_line("// end")
+        if depth:
+            cpp_class.add_internal_class(self.make_class(f"{name}Nested", depth - 1))
+            scope.add_internal_class(self.make_class(f"{name}Scoped", depth - 1))
+        return cpp_class
+
+    def test_same_output_as_separate_rendering(self):
+        for cpp_class in [self.make_class("MyClass", 3), CppClass(name="Empty")]:
+            header = io.StringIO()
+            source = io.StringIO()
+            cpp_class.render_to_string_declaration(CppSourceFile(None, writer=header))
+            cpp_class.render_to_string_implementation(
+                CppSourceFile(None, writer=source)
+            )
+
+            split_header = io.StringIO()
+            split_source = io.StringIO()
+            cpp_class.render_to_header_and_source(
+                CppSourceFile(None, writer=split_header),
+                CppSourceFile(None, writer=split_source),
+            )
+            self.assertEqual(header.getvalue(), split_header.getvalue())
+            self.assertEqual(source.getvalue(), split_source.getvalue())
+
+    def test_qualifiers_of_nested_classes(self):
+        source = io.StringIO()
+        self.make_class("Outer", 2).render_to_header_and_source(
+            CppSourceFile(None, writer=io.StringIO()),
+            CppSourceFile(None, writer=source),
+        )
+        self.assertIn(
+            "void Outer::OuterScoped::OuterScopedNested::Set()", source.getvalue()
+        )
+
+
 if __name__ == "__main__":
     unittest.main()
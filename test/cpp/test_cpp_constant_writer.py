@@ -0,0 +1,158 @@
+import io
+import unittest
+from textwrap import dedent
+
+from code_gen.cpp import (
+    CppSourceFile,
+    CppConstantPromotion,
+    CppArray,
+    CppClass,
+    CppEnum,
+    CppVariable,
+    is_literal_value,
+)
+
+__doc__ = """Unit tests for C++ code generator
+"""
+
+
+class TestCppConstantPromotion(unittest.TestCase):
+    """
+    Test promotion of literal-initialized variables and arrays
+    """
+
+    def test_literal_values(self):
+        for value in [
+            "1",
+            "-0x1F'FFu",
+            "2.5e-3f",
+            '"name"',
+            "u8'a'",
+            "{1, {true, nullptr}}",
+        ]:
+            self.assertTrue(is_literal_value(value), value)
+        for value in ["", "x", "f(1)", "new int", "std::string()"]:
+            self.assertFalse(is_literal_value(value), value)
+        self.assertTrue(is_literal_value("kSize * 2 + 1", constants={"kSize"}))
+
+    def test_promote_namespace_constants(self):
+        size = CppVariable(name="kSize", type="size_t", is_const=True, value="16")
+        double_size = CppVariable(
+            name="kDoubleSize", type="size_t", is_const=True, value="kSize * 2"
+        )
+        counter = CppVariable(name="g_counter", type="int", value="0")
+        names = CppArray(name="kNames", type="const char*", is_const=True)
+        names.add_array_items(['"a"', '"b"'])
+        dynamic = CppVariable(name="kStart", type="long", is_const=True, value="now()")
+        promotion = CppConstantPromotion([double_size, size, counter, names, dynamic])
+        self.assertEqual(
+            [(double_size, "constexpr"), (size, "constexpr"), (names, "constexpr")],
+            promotion.apply(),
+        )
+
+        writer = io.StringIO()
+        cpp = CppSourceFile(None, writer=writer)
+        for element in [size, double_size, counter, names, dynamic]:
+            element.render_to_string(cpp)
+        expected = dedent("""\
+            constexpr size_t kSize = 16;
+            constexpr size_t kDoubleSize = kSize * 2;
+            int g_counter = 0;
+            constexpr const char* kNames[] = {"a", "b"};
+            const long kStart = now();
+            """)
+        self.assertEqual(expected, writer.getvalue())
+
+    def test_const_pointers(self):
+        name = CppVariable(name="kName", type="char*", is_const=True, value='"x"')
+        label = CppVariable(
+            name="kLabel", type="char", is_ptr=True, is_const=True, value='"y"'
+        )
+        names = CppArray(name="kNames", type="char*", is_const=True)
+        names.add_array_items(['"a"', '"b"'])
+        node = CppClass(name="Node")
+        root = CppVariable(
+            name="kRoot", type=node, is_ptr=True, is_const=True, value="nullptr"
+        )
+        promotion = CppConstantPromotion([name, label, names, root])
+        self.assertEqual(
+            [(name, "constexpr"), (label, "constexpr"), (names, "constexpr")],
+            promotion.apply(),
+        )
+        writer = io.StringIO()
+        cpp = CppSourceFile(None, writer=writer)
+        for element in [name, label, names, root]:
+            element.render_to_string(cpp)
+        # the pointed-to data stays const
+        expected = dedent("""\
+            constexpr const char* kName = "x";
+            constexpr const char* kLabel = "y";
+            constexpr const char* kNames[] = {"a", "b"};
+            const Node* kRoot = nullptr;
+            """)
+        self.assertEqual(expected, writer.getvalue())
+
+    def test_constinit(self):
+        counter = CppVariable(name="g_counter", type="uint32_t", value="0")
+        table = CppArray(name="g_table", type="int", is_static=True)
+        table.add_array_items(["1", "2"])
+        self.assertEqual([], CppConstantPromotion([counter, table]).promotions())
+        promotion = CppConstantPromotion([counter, table], standard=20)
+        self.assertEqual(
+            [(counter, "constinit"), (table, "constinit")], promotion.apply()
+        )
+        writer = io.StringIO()
+        cpp = CppSourceFile(None, writer=writer)
+        counter.render_to_string(cpp)
+        table.render_to_string(cpp)
+        expected = dedent("""\
+            constinit uint32_t g_counter = 0;
+            static constinit int g_table[] = {1, 2};
+            """)
+        self.assertEqual(expected, writer.getvalue())
+
+    def test_static_constexpr_class_members(self):
+        my_class = CppClass(name="Limits")
+        colors = CppEnum(name="Color", enum_class=True, add_counter=False)
+        colors.add_items(["Red", "Green"])
+        my_class.add_enum(colors)
+        my_class.add_variable(
+            CppVariable(
+                name="kMax", type="int", is_static=True, is_const=True, value="100"
+            )
+        )
+        my_class.add_variable(CppVariable(name="m_value", type="int", value="0"))
+        defaults = CppArray(
+            name="kDefaults", type="Color", is_static=True, is_const=True
+        )
+        defaults.add_array_items(["Color::eRed", "Limits::Color::eGreen"])
+        my_class.add_array(defaults)
+        promotion = CppConstantPromotion(
+            [my_class], literal_types={"Color"}, standard=20
+        )
+        self.assertEqual(
+            ["kMax", "kDefaults"], [item.name for item, _ in promotion.apply()]
+        )
+
+        writer = io.StringIO()
+        cpp = CppSourceFile(None, writer=writer)
+        my_class.render_to_string(cpp)
+        expected = dedent("""\
+            class Limits
+            {
+            public:
+                enum class Color {
+                    eRed = 0,
+                    eGreen = 1,
+                };
+            private:
+                static constexpr int kMax = 100;
+                int m_value{0};
+                static constexpr Color kDefaults[] = {Color::eRed, Limits::Color::eGreen};
+            };
+            """)
+        self.assertEqual(expected, writer.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,181 @@
+import io
+import unittest
+from textwrap import dedent
+
+from code_gen.cpp import (
+    CppSourceFile,
+    CppClass,
+    CppClassHierarchy,
+    CppVariable,
+)
+from test.comparing_tools import normalize_code, debug_dump, is_debug
+
+__doc__ = """Unit tests for C++ code generator
+"""
+
+
+class TestCppCrtp(unittest.TestCase):
+    """
+    Test rendering of interfaces with static polymorphism
+    """
+
+    def test_interface(self):
+        shape = CppClass(name="Shape", is_crtp=True)
+        shape.add_method(
+            CppClass.CppMethod(
+                name="Area", ret_type="double", is_virtual=True, is_pure_virtual=True
+            )
+        )
+        shape.add_method(
+            CppClass.CppMethod(
+                name="Scale",
+                ret_type="void",
+                arguments=["double factor", "std::string&& label"],
+                is_virtual=True,
+                implementation=[],
+            )
+        )
+        shape.add_method(
+            CppClass.CppMethod(
+                name="Sides", ret_type="int", implementation=["return 0;"]
+            )
+        )
+        circle = CppClass(name="Circle", parent_class="Shape")
+        circle.add_method(
+            CppClass.CppMethod(
+                name="Area",
+                ret_type="double",
+                is_virtual=True,
+                is_override=True,
+                implementation=["return 3.0;"],
+            )
+        )
+        shape.crtp_derive(circle)
+        writer = io.StringIO()
+        cpp = CppSourceFile(None, writer=writer)
+        shape.render_to_string(cpp)
+        circle.render_to_string(cpp)
+        expected_output = dedent("""\
+            template <class Derived>
+            class Shape
+            {
+            public:
+                double Area()
+                {
+                    return static_cast<Derived*>(this)->AreaImpl();
+                }
+                void Scale(double factor, std::string&& label)
+                {
+                    return static_cast<Derived*>(this)->ScaleImpl(factor, static_cast<decltype(label)>(label));
+                }
+                void ScaleImpl(double factor, std::string&& label)
+                {
+                }
+                int Sides()
+                {
+                    return 0;
+                }
+            };
+            class Circle : public Shape<Circle>
+            {
+            public:
+                double AreaImpl();
+            };
+            double Circle::AreaImpl()
+            {
+                return 3.0;
+            }""")
+        actual_output = writer.getvalue().strip()
+        expected_output_normalized = normalize_code(expected_output)
+        actual_output_normalized = normalize_code(actual_output)
+        if is_debug():
+            debug_dump(expected_output_normalized, actual_output_normalized, "cpp")
+        self.assertEqual(expected_output_normalized, actual_output_normalized)
+
+    def test_header_and_source(self):
+        shape = CppClass(name="Shape", is_crtp=True)
+        shape.add_method(
+            CppClass.CppMethod(
+                name="Area", ret_type="double", is_virtual=True, is_pure_virtual=True
+            )
+        )
+        header = io.StringIO()
+        source = io.StringIO()
+        shape.render_to_header_and_source(
+            CppSourceFile(None, writer=header), CppSourceFile(None, writer=source)
+        )
+        # the template is defined in the header only
+        self.assertEqual(source.getvalue(), "")
+        expected_output = dedent("""\
+            template <class Derived>
+            class Shape
+            {
+            public:
+                double Area()
+                {
+                    return static_cast<Derived*>(this)->AreaImpl();
+                }
+            };""")
+        actual_output = header.getvalue().strip()
+        expected_output_normalized = normalize_code(expected_output)
+        actual_output_normalized = normalize_code(actual_output)
+        if is_debug():
+            debug_dump(expected_output_normalized, actual_output_normalized, "cpp")
+        self.assertEqual(expected_output_normalized, actual_output_normalized)
+
+    def test_derive(self):
+        shape = CppClass(name="Shape", is_crtp=True)
+        shape.add_method(
+            CppClass.CppMethod(
+                name="Area", ret_type="double", is_virtual=True, is_pure_virtual=True
+            )
+        )
+        circle = CppClass(name="Circle", parent_class="Shape")
+        circle.add_method(
+            CppClass.CppMethod(
+                name="Area",
+                ret_type="double",
+                is_virtual=True,
+                is_override=True,
+                implementation=["return 3.0;"],
+            )
+        )
+        counter = CppClass(name="Counter", parent_class=[("Base", "protected")])
+        shape.crtp_derive(counter)
+        self.assertEqual(counter.inherits(), " : protected Base, public Shape<Counter>")
+        shape.crtp_derive(circle)
+        hierarchy = CppClassHierarchy([shape, circle, counter])
+        self.assertEqual(hierarchy.parents(circle), [shape])
+        # the implementations are not virtual after the rewrite
+        self.assertFalse(circle.methods[0].is_virtual)
+        with self.assertRaises(RuntimeError):
+            circle.crtp_derive(counter)
+
+    def test_errors(self):
+        shape = CppClass(name="Shape", is_crtp=True)
+        shape.add_method(
+            CppClass.CppMethod(
+                name="Area", ret_type="double", is_virtual=True, is_pure_virtual=True
+            )
+        )
+        shape.add_variable(CppVariable(name="count", type="int", is_static=True))
+        with self.assertRaises(ValueError):
+            shape.render_to_string_declaration(
+                CppSourceFile(None, writer=io.StringIO())
+            )
+        shape = CppClass(name="Shape", is_crtp=True)
+        shape.add_method(
+            CppClass.CppMethod(
+                name="Call",
+                ret_type="void",
+                arguments=["void (*callback)(int)"],
+                is_virtual=True,
+                is_pure_virtual=True,
+            )
+        )
+        with self.assertRaises(ValueError):
+            shape.crtp_methods()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,142 @@
+import io
+import unittest
+from textwrap import dedent
+
+from code_gen.cpp import (
+    CppSourceFile,
+    CppClass,
+    CppFunction,
+    CppVariable,
+    CppDeterminismError,
+    audit_determinism,
+    canonical_order,
+    check_determinism,
+)
+
+__doc__ = """Unit tests for C++ code generator
+"""
+
+BUILD_CLASS = "test.cpp.test_cpp_determinism:build_class"
+GETTERS = {"Width", "Height", "Depth", "Color", "Name", "Weight", "Mass", "Speed"}
+
+
+def build_class():
+    """
+    Class with methods added from a set, the order depends on the hash seed
+    """
+    my_class = CppClass(name="Box")
+    for name in GETTERS:
+        my_class.add_method(
+            CppClass.CppMethod(
+                name=f"Get{name}",
+                ret_type="int",
+                is_pure_virtual=True,
+                is_virtual=True,
+            )
+        )
+    my_class.add_method(CppClass.CppCtor(name="Box"))
+    writer = io.StringIO()
+    cpp = CppSourceFile(None, writer=writer)
+    my_class.declaration().render_to_string(cpp)
+    return {"box.h": writer.getvalue()}
+
+
+def build_members():
+    """
+    Data members keep their order even in the canonical mode
+    """
+    my_class = CppClass(name="Box")
+    for name in GETTERS:
+        my_class.add_variable(CppVariable(name=f"m_{name}", type="int"))
+    writer = io.StringIO()
+    my_class.declaration().render_to_string(CppSourceFile(None, writer=writer))
+    return writer.getvalue()
+
+
+class TestCppCanonicalOrder(unittest.TestCase):
+    """
+    Test canonical order of methods
+    """
+
+    def test_methods_order(self):
+        my_class = CppClass(name="Box")
+        my_class.add_method(CppClass.CppMethod(name="Size", ret_type="int"))
+        my_class.add_method(
+            CppClass.CppMethod(name="Area", ret_type="int", arguments=["int scale"])
+        )
+        my_class.add_method(CppClass.CppMethod(name="Area", ret_type="int"))
+        my_class.add_method(CppClass.CppCtor(name="Box", arguments=["int size"]))
+        my_class.add_method(CppFunction(name="Reset", ret_type="void"))
+
+        writer = io.StringIO()
+        with canonical_order():
+            my_class.declaration().render_to_string(CppSourceFile(None, writer=writer))
+        expected = dedent("""\
+            class Box
+            {
+            public:
+                Box(int size);
+                int Area();
+                int Area(int scale);
+                void Reset();
+                int Size();
+            };
+            """)
+        self.assertEqual(expected, writer.getvalue())
+        self.assertEqual(
+            ["Size", "Area", "Area", "Box", "Reset"],
+            [m.name for m in my_class.ordered_methods()],
+        )
+
+    def test_render_elements_in_threads(self):
+        classes = []
+        for index in range(4):
+            my_class = CppClass(name=f"Box{index}")
+            for name in ("z", "b", "a"):
+                my_class.add_method(
+                    CppClass.CppMethod(name=name, ret_type="void", implementation=[])
+                )
+            classes.append(my_class)
+        outputs = []
+        for max_workers in (1, 4):
+            writer = io.StringIO()
+            cpp = CppSourceFile(None, writer=writer)
+            with canonical_order():
+                cpp.render_elements(classes, max_workers=max_workers)
+            outputs.append(writer.getvalue())
+        self.assertEqual(outputs[0], outputs[1])
+        self.assertLess(
+            outputs[1].index("void Box3::a()"), outputs[1].index("void Box3::z()")
+        )
+
+
+class TestCppDeterminismAudit(unittest.TestCase):
+    """
+    Test rendering in processes with different hash seeds
+    """
+
+    def test_canonical_output_is_stable(self):
+        self.assertEqual([], audit_determinism(BUILD_CLASS, hash_seeds=(1, 2, 3)))
+        check_determinism(BUILD_CLASS, hash_seeds=(1, 2))
+
+    def test_unordered_output_is_reported(self):
+        diffs = audit_determinism(BUILD_CLASS, hash_seeds=(1, 2), canonical=False)
+        self.assertEqual(1, len(diffs))
+        self.assertIn("--- box.h (hash seed 1)", diffs[0])
+        self.assertIn("+++ box.h (hash seed 2)", diffs[0])
+
+    def test_data_members_are_not_reordered(self):
+        with self.assertRaises(CppDeterminismError) as context:
+            check_determinism(
+                "test.cpp.test_cpp_determinism:build_members", hash_seeds=(1, 2)
+            )
+        self.assertEqual(1, len(context.exception.diffs))
+        self.assertIn("<output>", context.exception.diffs[0])
+
+    def test_local_builder_is_rejected(self):
+        with self.assertRaises(TypeError):
+            audit_determinism(lambda: "")
+
+
+if __name__ == "__main__":
+    unittest.main()
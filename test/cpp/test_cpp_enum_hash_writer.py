@@ -0,0 +1,108 @@
+import io
+import unittest
+from textwrap import dedent
+
+from code_gen.cpp import (
+    CppSourceFile,
+    CppClass,
+    CppEnum,
+    CppEnumPerfectHash,
+    build_perfect_hash,
+    perfect_hash,
+)
+
+__doc__ = """Unit tests for C++ code generator
+"""
+
+
+def lookup(keys, displacements, slots, key):
+    """
+    Python version of the generated lookup
+    """
+    size = len(slots)
+    displacement = displacements[perfect_hash(key, 0) % size]
+    if displacement < 0:
+        slot = -displacement - 1
+    else:
+        slot = perfect_hash(key, displacement) % size
+    return slots[slot] if keys[slots[slot]] == key else None
+
+
+class TestCppEnumPerfectHash(unittest.TestCase):
+    """
+    Test perfect hash lookup of enum values
+    """
+
+    def test_build_perfect_hash(self):
+        keys = [f"item_{i}".encode() for i in range(5000)]
+        displacements, slots = build_perfect_hash(keys)
+        self.assertEqual(list(range(len(keys))), sorted(slots))
+        for index, key in enumerate(keys):
+            self.assertEqual(index, lookup(keys, displacements, slots, key))
+        self.assertIsNone(lookup(keys, displacements, slots, b"unknown"))
+
+    def test_render(self):
+        writer = io.StringIO()
+        cpp = CppSourceFile(None, writer=writer)
+        enum = CppEnum(name="Items", enum_class=True)
+        enum.add_items(["Chair", "Table", "Shelve"])
+        CppEnumPerfectHash(enum=enum).render_to_string(cpp)
+        expected = dedent("""\
+            constexpr uint32_t ItemsFromString_hash(std::string_view key, uint32_t seed) {
+                uint32_t h = seed ? seed : 0x01000193u;
+                for (char c : key)
+                {
+                    h = (h * 0x01000193u) ^ static_cast<unsigned char>(c);
+                }
+                return h;
+            }
+            static constexpr int32_t ItemsFromString_displacements[] = {-1, -2, -3};
+            static constexpr Items ItemsFromString_values[] = {Items::eChair, Items::eTable, Items::eShelve};
+            static const char ItemsFromString_keys_pool[] =
+                "Chair\\0"
+                "Table\\0"
+                "Shelve";
+            static const uint16_t ItemsFromString_keys_offsets[] = {0, 6, 12};
+            bool ItemsFromString(std::string_view name, Items& value) {
+                const uint32_t bucket = ItemsFromString_hash(name, 0) % 3;
+                const int32_t displacement = ItemsFromString_displacements[bucket];
+                const uint32_t slot = displacement < 0
+                    ? static_cast<uint32_t>(-displacement - 1)
+                    : ItemsFromString_hash(name, static_cast<uint32_t>(displacement)) % 3;
+                if (name != ItemsFromString_keys_pool + ItemsFromString_keys_offsets[slot])
+                {
+                    return false;
+                }
+                value = ItemsFromString_values[slot];
+                return true;
+            }
+            """)
+        self.assertEqual(expected, writer.getvalue())
+
+    def test_nested_enum_declaration(self):
+        writer = io.StringIO()
+        cpp = CppSourceFile(None, writer=writer)
+        my_class = CppClass(name="Parser")
+        enum = CppEnum(name="Token", prefix="k")
+        enum.add_items(["Begin", "End"])
+        my_class.add_enum(enum)
+        lookup = CppEnumPerfectHash(enum=enum, name="ParseToken", names=["{", "}"])
+        lookup.render_to_string_declaration(cpp)
+        self.assertEqual(
+            "bool ParseToken(std::string_view name, Parser::Token& value);\n",
+            writer.getvalue(),
+        )
+        self.assertEqual(
+            ["Parser::Token::kBegin", "Parser::Token::kEnd"], lookup.enum_values()
+        )
+
+    def test_duplicate_names(self):
+        enum = CppEnum(name="Items")
+        enum.add_items(["A", "B"])
+        self.assertRaises(
+            ValueError, CppEnumPerfectHash(enum=enum, names=["a", "a"]).table
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import io
+import unittest
+from textwrap import dedent
+
+from code_gen.cpp import CppSourceFile, CppClass, CppEnum, CppEnumNames
+
+__doc__ = """Unit tests for C++ code generator
+"""
+
+
+class TestCppEnumNames(unittest.TestCase):
+    """
+    Test enum to name lookup generation
+    """
+
+    def test_contiguous(self):
+        writer = io.StringIO()
+        cpp = CppSourceFile(None, writer=writer)
+        enum = CppEnum(name="Items", enum_class=True)
+        enum.add_items(["Chair", "Table", "Shelve"])
+        names = CppEnumNames(enum=enum)
+        names.render_to_string(cpp)
+        expected = dedent("""\
+            static const char ItemsToString_names_pool[] =
+                "Chair\\0"
+                "Table\\0"
+                "Shelve";
+            static const uint16_t ItemsToString_names_offsets[] = {0, 6, 12};
+            const char* ItemsToString(Items value) {
+                const size_t index = static_cast<size_t>(value);
+                if (index >= 3)
+                {
+                    return nullptr;
+                }
+                return ItemsToString_names_pool + ItemsToString_names_offsets[index];
+            }
+            """)
+        self.assertEqual(expected, writer.getvalue())
+        self.assertFalse(names.is_sparse())
+        self.assertEqual(["<cstddef>", "<cstdint>"], names.required_includes())
+
+    def test_contiguous_with_base(self):
+        enum = CppEnum(name="Level")
+        enum.add_items([("Low", -1), "Normal", "High"])
+        names = CppEnumNames(enum=enum, names=["low", "normal", "high"])
+        self.assertEqual([(-1, "low"), (0, "normal"), (1, "high")], names.entries())
+        self.assertIn(
+            "const size_t index = static_cast<size_t>(static_cast<int64_t>(value) + 1);",
+            names.lookup_function().implementation,
+        )
+
+    def test_sparse(self):
+        writer = io.StringIO()
+        cpp = CppSourceFile(None, writer=writer)
+        enum = CppEnum(name="Code", enum_class=True)
+        enum.add_items([("Ok", 200), ("NotFound", 404), ("Found", 302), ("Alias", 200)])
+        names = CppEnumNames(enum=enum)
+        names.render_to_string(cpp)
+        expected = dedent("""\
+            static constexpr int32_t CodeToString_values[] = {200, 302, 404};
+            static const char CodeToString_names_pool[] =
+                "Ok\\0"
+                "Found\\0"
+                "NotFound";
+            static const uint16_t CodeToString_names_offsets[] = {0, 3, 9};
+            const char* CodeToString(Code value) {
+                const int32_t key = static_cast<int32_t>(value);
+                const int32_t* end = CodeToString_values + 3;
+                const int32_t* found = std::lower_bound(CodeToString_values, end, key);
+                if (found == end || *found != key)
+                {
+                    return nullptr;
+                }
+                return CodeToString_names_pool + CodeToString_names_offsets[found - CodeToString_values];
+            }
+            """)
+        self.assertEqual(expected, writer.getvalue())
+        self.assertIn("<algorithm>", names.required_includes())
+
+    def test_nested_enum_declaration(self):
+        writer = io.StringIO()
+        cpp = CppSourceFile(None, writer=writer)
+        my_class = CppClass(name="Parser")
+        enum = CppEnum(name="Token", prefix="k")
+        enum.add_items([("Begin", 1), ("End", 1 << 40)])
+        my_class.add_enum(enum)
+        names = CppEnumNames(enum=enum)
+        names.render_to_string_declaration(cpp)
+        self.assertEqual(
+            "const char* TokenToString(Parser::Token value);\n", writer.getvalue()
+        )
+        self.assertEqual("int64_t", names.value_type())
+
+    def test_invalid(self):
+        enum = CppEnum(name="Items")
+        self.assertRaises(ValueError, CppEnumNames(enum=enum).entries)
+        enum.add_items(["A", "B"])
+        self.assertRaises(ValueError, CppEnumNames(enum=enum, names=["a"]).entries)
+        self.assertRaises(RuntimeError, CppEnumNames().entries)
+
+
+if __name__ == "__main__":
+    unittest.main()
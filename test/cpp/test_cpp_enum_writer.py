@@ -2,7 +2,7 @@ import unittest
 import io
 from textwrap import dedent
 
-from code_gen.cpp import CppSourceFile, CppEnum
+from code_gen.cpp import CppSourceFile, CppClass, CppEnum
 from test.comparing_tools import normalize_code, debug_dump, is_debug
 
 __doc__ = """Unit tests for C++ code generator
@@ -83,6 +83,118 @@ class TestCppEnumStringIo(unittest.TestCase):
 
         self.assertEqual(expected_output_normalized, actual_output_normalized)
 
+    def test_explicit_values(self):
+        writer = io.StringIO()
+        cpp = CppSourceFile(None, writer=writer)
+        enum = CppEnum(name="Items", enum_class=True)
+        enum.add_items([("A", 1), "B", ("C", 8)])
+        enum.add_item("D", -1)
+        enum.render_to_string(cpp)
+        expected_output = dedent(
+            """\
+            enum class Items {
+                eA = 1,
+                eB = 2,
+                eC = 8,
+                eD = -1,
+                eItemsCount = 0
+            };"""
+        )
+        actual_output = writer.getvalue().strip()
+        expected_output_normalized = normalize_code(expected_output)
+        actual_output_normalized = normalize_code(actual_output)
+        if is_debug():
+            debug_dump(expected_output_normalized, actual_output_normalized, "cpp")
+
+        self.assertEqual(expected_output_normalized, actual_output_normalized)
+        self.assertEqual([1, 2, 8, -1], enum.values())
+        self.assertFalse(enum.is_contiguous())
+        self.assertRaises(ValueError, enum.add_item, "E", "1")
+
+    def test_flags(self):
+        writer = io.StringIO()
+        cpp = CppSourceFile(None, writer=writer)
+        enum = CppEnum(name="Access", enum_class=True, is_flags=True)
+        enum.add_items(["Read", "Write", ("Exec", 4)])
+        enum.render_to_string(cpp)
+        expected_output = dedent(
+            """\
+            enum class Access : uint8_t {
+                eRead = 1u << 0,
+                eWrite = 1u << 1,
+                eExec = 1u << 4,
+                eAccessAll = 0x13u
+            };
+            constexpr Access operator|(Access lhs, Access rhs) {
+                return static_cast<Access>(static_cast<uint32_t>(lhs) | static_cast<uint32_t>(rhs));
+            }
+            constexpr Access operator&(Access lhs, Access rhs) {
+                return static_cast<Access>(static_cast<uint32_t>(lhs) & static_cast<uint32_t>(rhs));
+            }
+            constexpr Access operator^(Access lhs, Access rhs) {
+                return static_cast<Access>(static_cast<uint32_t>(lhs) ^ static_cast<uint32_t>(rhs));
+            }
+            constexpr Access operator~(Access value) {
+                return static_cast<Access>(~static_cast<uint32_t>(value) & 0x13u);
+            }
+            constexpr Access& operator|=(Access& lhs, Access rhs) {
+                return lhs = lhs | rhs;
+            }
+            constexpr Access& operator&=(Access& lhs, Access rhs) {
+                return lhs = lhs & rhs;
+            }
+            constexpr Access& operator^=(Access& lhs, Access rhs) {
+                return lhs = lhs ^ rhs;
+            }
+            constexpr bool AccessHasAll(Access value, Access flags) {
+                return (static_cast<uint32_t>(value) & static_cast<uint32_t>(flags))"""
+            """ == static_cast<uint32_t>(flags);
+            }
+            constexpr bool AccessHasAny(Access value, Access flags) {
+                return (static_cast<uint32_t>(value) & static_cast<uint32_t>(flags)) != 0;
+            }
+            constexpr int AccessPopcount(Access value) {
+                return std::popcount(static_cast<uint32_t>(value));
+            }"""
+        )
+        actual_output = writer.getvalue().strip()
+        expected_output_normalized = normalize_code(expected_output)
+        actual_output_normalized = normalize_code(actual_output)
+        if is_debug():
+            debug_dump(expected_output_normalized, actual_output_normalized, "cpp")
+
+        self.assertEqual(expected_output_normalized, actual_output_normalized)
+        self.assertEqual([1, 2, 16], enum.values())
+        self.assertEqual(["<bit>", "<cstdint>"], enum.required_includes())
+
+    def test_flags_underlying_type(self):
+        enum = CppEnum(name="Mode", is_flags=True)
+        for count, underlying_type in [
+            (8, "uint8_t"),
+            (9, "uint16_t"),
+            (32, "uint32_t"),
+            (64, "uint64_t"),
+        ]:
+            enum.enum_items = [f"F{i}" for i in range(count)]
+            self.assertEqual(underlying_type, enum.underlying_type())
+        enum.add_item("Overflow")
+        cpp = CppSourceFile(None, writer=io.StringIO())
+        self.assertRaises(ValueError, enum.render_to_string, cpp)
+
+    def test_flags_class_member(self):
+        writer = io.StringIO()
+        cpp = CppSourceFile(None, writer=writer)
+        my_class = CppClass(name="File")
+        enum = CppEnum(name="Mode", is_flags=True, add_counter=False)
+        enum.add_items(["Read", ("Sync", 40)])
+        my_class.add_enum(enum)
+        my_class.render_to_string(cpp)
+        output = writer.getvalue()
+        self.assertIn("enum Mode : uint64_t {", output)
+        self.assertIn("eSync = 1ull << 40,", output)
+        self.assertIn("friend constexpr Mode operator|(Mode lhs, Mode rhs) {", output)
+        self.assertIn("~static_cast<uint64_t>(value) & 0x10000000001ull", output)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,6 +1,8 @@
+import io
 import os
 import unittest
 import filecmp
+from textwrap import dedent
 
 from code_gen.cpp import (
     CppSourceFile,
@@ -237,5 +239,77 @@ class TestCppFileIo(unittest.TestCase):
             os.remove("var.cpp")
 
 
+class TestCppFileSections(unittest.TestCase):
+    """
+    Test C++ code generation into named sections
+    """
+
+    def make_class(self, name):
+        cpp_class = CppClass(name=name, is_struct=True)
+        cpp_class.add_method(
+            CppClass.CppMethod(name="Get", ret_type="int", implementation=["return 0;"])
+        )
+        return cpp_class
+
+    def test_sections_are_written_in_order(self):
+        writer = io.StringIO()
+        cpp = CppSourceFile(None, writer=writer)
+        cpp("// generated")
+        for name in ["A", "B"]:
+            cpp_class = self.make_class(name)
+            cpp_class.render_to_string_implementation(cpp.section("definitions"))
+            cpp_class.render_to_string_declaration(cpp.section("types"))
+            cpp.section("forward_declarations")(f"struct {name};")
+        cpp.section("includes")("#include <cstddef>")
+        cpp.flush_sections()
+        self.assertEqual(
+            dedent("""\
+                // generated
+                #include <cstddef>
+                struct A;
+                struct B;
+                struct A
+                {
+                    int Get();
+                };
+                struct B
+                {
+                    int Get();
+                };
+                int A::Get()
+                {
+                    return 0;
+                }
+
+                int B::Get()
+                {
+                    return 0;
+                }
+
+                """),
+            writer.getvalue(),
+        )
+
+    def test_custom_sections(self):
+        writer = io.StringIO()
+        cpp = CppSourceFile(None, writer=writer, sections=("second", "first"))
+        cpp.section("first")("int a = 1;")
+        cpp.section("second")("int b = 2;")
+        self.assertRaises(ValueError, cpp.section, "includes")
+        cpp.flush_sections()
+        cpp.section("first")("int c = 3;")
+        cpp.flush_sections()
+        self.assertEqual("int b = 2;\nint a = 1;\nint c = 3;\n", writer.getvalue())
+
+    def test_close_flushes_sections(self):
+        cpp = CppSourceFile("sections.cpp")
+        cpp.section("definitions")("int a = 1;")
+        cpp.section("includes")("#include <cstddef>")
+        cpp.close()
+        with open("sections.cpp") as f:
+            self.assertEqual("#include <cstddef>\nint a = 1;\n", f.read())
+        os.remove("sections.cpp")
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,104 @@
+import io
+import time
+import unittest
+
+from code_gen.cpp import CppSourceFile, CppFunction, CppClass
+from test.comparing_tools import normalize_code, debug_dump, is_debug
+
+__doc__ = """Unit tests for C++ code generator
+"""
+
+
+class TestCppFileConcurrent(unittest.TestCase):
+    """
+    Test rendering of independent elements on a thread pool
+    """
+
+    def test_output_identical_to_serial(self):
+        def body(cpp, index):
+            # later elements finish first
+            time.sleep(0.001 * (10 - index % 10))
+            cpp(f"return {index};")
+            with cpp.block("if (n > 0)") as block:
+                block("--n;")
+
+        elements = []
+        for index in range(40):
+            implementation = lambda cpp, index=index: body(cpp, index)
+            if index % 2:
+                func = CppFunction(
+                    name=f"f{index}", ret_type="int", implementation=implementation
+                )
+                func.add_argument("int n")
+                elements.append(func)
+            else:
+                cpp_class = CppClass(name=f"C{index}")
+                cpp_class.add_method(
+                    CppClass.CppMethod(
+                        name="get", ret_type="int", implementation=implementation
+                    )
+                )
+                elements.append(cpp_class)
+
+        writer = io.StringIO()
+        cpp = CppSourceFile(None, writer=writer)
+        cpp("#include <cstddef>")
+        cpp.render_elements(elements)
+        expected_output = writer.getvalue()
+
+        writer = io.StringIO()
+        cpp = CppSourceFile(None, writer=writer)
+        cpp("#include <cstddef>")
+        cpp.render_elements(elements, max_workers=8)
+        actual_output = writer.getvalue()
+
+        # byte-identical output, including whitespace and line order
+        if is_debug():
+            debug_dump(expected_output, actual_output, "cpp")
+        self.assertEqual(expected_output, actual_output)
+
+    def test_custom_render(self):
+        elements = []
+        for index in range(6):
+            func = CppFunction(
+                name=f"f{index}",
+                ret_type="int",
+                implementation=lambda cpp, index=index: cpp(f"return {index};"),
+            )
+            func.add_argument("int n")
+            elements.append(func)
+
+        writer = io.StringIO()
+        cpp = CppSourceFile(None, writer=writer)
+        for element in elements:
+            element.declaration().render_to_string(cpp)
+        expected_output = writer.getvalue()
+
+        writer = io.StringIO()
+        cpp = CppSourceFile(None, writer=writer)
+        cpp.render_elements(
+            elements,
+            render=lambda element, cpp: element.declaration().render_to_string(cpp),
+            max_workers=4,
+        )
+        actual_output = writer.getvalue()
+
+        expected_output_normalized = normalize_code(expected_output)
+        actual_output_normalized = normalize_code(actual_output)
+        if is_debug():
+            debug_dump(expected_output_normalized, actual_output_normalized, "cpp")
+        self.assertEqual(expected_output_normalized, actual_output_normalized)
+
+    def test_error_propagates(self):
+        writer = io.StringIO()
+        cpp = CppSourceFile(None, writer=writer)
+        elements = [
+            CppFunction(name=f"f{index}", ret_type="int", implementation=["return 0;"])
+            for index in range(4)
+        ]
+        elements.append(CppFunction(name="broken", ret_type="int", is_constexpr=True))
+        self.assertRaises(ValueError, cpp.render_elements, elements, max_workers=4)
+
+
+if __name__ == "__main__":
+    unittest.main()
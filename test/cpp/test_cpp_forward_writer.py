@@ -0,0 +1,102 @@
+import io
+import unittest
+from textwrap import dedent
+
+from code_gen.cpp import (
+    CppSourceFile,
+    CppForwardDeclarations,
+    CppClass,
+    CppFunction,
+    CppVariable,
+    CppBaseType,
+    CppTemplateType,
+)
+
+__doc__ = """Unit tests for C++ code generator
+"""
+
+
+class TestCppForwardDeclarations(unittest.TestCase):
+    """
+    Test detection of classes used only by pointer or reference
+    """
+
+    def setUp(self):
+        self.node = CppClass(name="Node", header='"node.h"')
+        self.tree = CppClass(name="Tree", is_struct=True, header='"tree.h"')
+        self.base = CppClass(name="Base", header='"base.h"')
+
+    def test_pointer_and_reference_members(self):
+        my_class = CppClass(name="Graph", parent_class=self.base)
+        my_class.add_variable(
+            CppVariable(name="m_root", type=CppBaseType(type=self.node, is_ptr=True))
+        )
+        my_class.add_variable(CppVariable(name="m_tree", type=self.tree))
+        forward = CppForwardDeclarations([my_class])
+        self.assertEqual([self.node], forward.forward_declared())
+        self.assertEqual([self.base, self.tree], forward.required())
+        self.assertEqual(['"base.h"', '"tree.h"'], forward.required_includes())
+
+    def test_string_types_and_arguments(self):
+        my_class = CppClass(name="Graph")
+        my_class.add_variable(CppVariable(name="m_next", type="Node*"))
+        my_class.add_variable(
+            CppVariable(name="s_default", type="Tree", is_static=True)
+        )
+        my_class.add_method(
+            CppClass.CppMethod(
+                name="Visit",
+                ret_type="void",
+                arguments=["const Tree& tree", "Node * node"],
+                is_pure_virtual=True,
+                is_virtual=True,
+            )
+        )
+        forward = CppForwardDeclarations(
+            [my_class], classes=[self.node, self.tree, self.base]
+        )
+        self.assertEqual([self.tree, self.node], forward.forward_declared())
+        self.assertEqual([], forward.required())
+
+    def test_by_value_wins(self):
+        func = CppFunction(name="Find", ret_type="Node*", arguments=["Node key"])
+        forward = CppForwardDeclarations([func], classes=[self.node])
+        self.assertEqual([], forward.forward_declared())
+        self.assertEqual([self.node], forward.required())
+
+    def test_template_arguments(self):
+        vector_ptr = CppTemplateType(
+            type="std::vector", template_args=[CppBaseType(type=self.node, is_ptr=True)]
+        )
+        vector_tree = CppTemplateType(type="std::vector", template_args=[self.tree])
+        my_class = CppClass(name="Forest")
+        my_class.add_variable(CppVariable(name="m_nodes", type=vector_ptr))
+        my_class.add_variable(CppVariable(name="m_trees", type=vector_tree))
+        forward = CppForwardDeclarations([my_class])
+        self.assertEqual([self.node], forward.forward_declared())
+        self.assertEqual([self.tree], forward.required())
+
+    def test_defined_classes_are_skipped(self):
+        my_class = CppClass(name="Node")
+        my_class.add_variable(CppVariable(name="m_next", type="Node*"))
+        forward = CppForwardDeclarations([my_class], classes=[my_class])
+        self.assertEqual([], forward.forward_declared())
+        self.assertEqual([], forward.required())
+
+    def test_render(self):
+        writer = io.StringIO()
+        cpp = CppSourceFile(None, writer=writer)
+        my_class = CppClass(name="Graph")
+        my_class.add_variable(CppVariable(name="m_tree", type="Tree&"))
+        my_class.add_variable(CppVariable(name="m_node", type="const Node*"))
+        forward = CppForwardDeclarations([my_class], classes=[self.tree, self.node])
+        forward.render_to_string(cpp)
+        expected = dedent("""\
+            struct Tree;
+            class Node;
+            """)
+        self.assertEqual(expected, writer.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
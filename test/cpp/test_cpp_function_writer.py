@@ -84,6 +84,21 @@ class TestCppFunctionStringIo(unittest.TestCase):
             writer.getvalue(),
         )
 
+    def test_is_friend(self):
+        declaration = io.StringIO()
+        definition = io.StringIO()
+        func = CppFunction(
+            name="factorial",
+            ret_type="int",
+            implementation=handle_to_factorial,
+            is_friend=True,
+        )
+        func.add_argument("int n")
+        func.render_to_string_declaration(CppSourceFile(None, writer=declaration))
+        func.render_to_string_implementation(CppSourceFile(None, writer=definition))
+        self.assertEqual("friend int factorial(int n);\n", declaration.getvalue())
+        self.assertTrue(definition.getvalue().startswith("int factorial(int n) {"))
+
     def test_docstring_example(self):
         writer = io.StringIO()
         cpp = CppSourceFile(None, writer=writer)
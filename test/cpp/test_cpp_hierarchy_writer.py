@@ -0,0 +1,258 @@
+import io
+import unittest
+from textwrap import dedent
+
+from code_gen.cpp import (
+    CppSourceFile,
+    CppClass,
+    CppClassHierarchy,
+    CppForwardDeclarations,
+)
+from test.comparing_tools import normalize_code, debug_dump, is_debug
+
+__doc__ = """Unit tests for C++ code generator
+"""
+
+
+class TestCppClassHierarchy(unittest.TestCase):
+    """
+    Test multiple inheritance and the devirtualization pass
+    """
+
+    def test_multiple_inheritance(self):
+        base = CppClass(name="Base")
+        derived = CppClass(
+            name="Derived",
+            is_struct=True,
+            parent_class=[base, ("Mixin", "virtual protected")],
+        )
+        self.assertEqual(derived.inherits(), " : public Base, virtual protected Mixin")
+        forward = CppForwardDeclarations([derived], classes=[base])
+        self.assertEqual(forward.required(), [base])
+        with self.assertRaises(ValueError):
+            CppClass(name="Bad", parent_class=("Base", "friend")).inherits()
+
+    def test_resolve(self):
+        visitor = CppClass(name="Visitor")
+        printer = CppClass(name="Printer", parent_class=visitor)
+        counter = CppClass(
+            name="Counter", parent_class=["Printer", ("Serializable", "protected")]
+        )
+        hierarchy = CppClassHierarchy([visitor, printer, counter])
+        self.assertEqual(hierarchy.parents(counter), [printer])
+        self.assertEqual(hierarchy.external_parents(counter), ["Serializable"])
+        self.assertEqual(hierarchy.descendants(visitor), [printer, counter])
+        self.assertEqual(hierarchy.leaves(), [counter])
+
+    def test_devirtualize(self):
+        visitor = CppClass(name="Visitor")
+        visitor.add_method(
+            CppClass.CppMethod(
+                name="Visit", ret_type="void", is_virtual=True, is_pure_virtual=True
+            )
+        )
+        visitor.add_method(
+            CppClass.CppMethod(
+                name="Reset", ret_type="void", is_virtual=True, implementation=[]
+            )
+        )
+        printer = CppClass(name="Printer", parent_class=visitor)
+        printer.add_method(
+            CppClass.CppMethod(
+                name="Visit",
+                ret_type="void",
+                is_virtual=True,
+                is_override=True,
+                implementation=[],
+            )
+        )
+        counter = CppClass(
+            name="Counter", parent_class=["Printer", ("Serializable", "protected")]
+        )
+        counter.add_method(
+            CppClass.CppMethod(
+                name="Count",
+                ret_type="int",
+                is_virtual=True,
+                implementation=["return 0;"],
+            )
+        )
+        report = CppClassHierarchy([visitor, printer, counter]).devirtualize()
+        self.assertEqual(
+            report,
+            {
+                "final_classes": ["Counter"],
+                "final_methods": ["Visitor::Reset", "Printer::Visit"],
+                "never_overridden": ["Visitor::Reset", "Counter::Count"],
+            },
+        )
+        writer = io.StringIO()
+        cpp = CppSourceFile(None, writer=writer)
+        printer.render_to_string_declaration(cpp)
+        counter.render_to_string_declaration(cpp)
+        expected_output = dedent("""\
+            class Printer : public Visitor
+            {
+            public:
+                virtual void Visit() override final;
+            };
+            class Counter final : public Printer, protected Serializable
+            {
+            public:
+                virtual int Count();
+            };""")
+        actual_output = writer.getvalue().strip()
+        expected_output_normalized = normalize_code(expected_output)
+        actual_output_normalized = normalize_code(actual_output)
+        if is_debug():
+            debug_dump(expected_output_normalized, actual_output_normalized, "cpp")
+        self.assertEqual(expected_output_normalized, actual_output_normalized)
+
+    def test_abstract_classes(self):
+        visitor = CppClass(name="Visitor")
+        visitor.add_method(
+            CppClass.CppMethod(
+                name="Visit", ret_type="void", is_virtual=True, is_pure_virtual=True
+            )
+        )
+        report = CppClassHierarchy([visitor]).devirtualize()
+        self.assertEqual(
+            report, {"final_classes": [], "final_methods": [], "never_overridden": []}
+        )
+        self.assertFalse(visitor.is_final)
+        # a derived class without the implementation is abstract as well
+        logger = CppClass(name="Logger", parent_class=visitor)
+        logger.add_method(
+            CppClass.CppMethod(name="Flush", ret_type="void", implementation=[])
+        )
+        hierarchy = CppClassHierarchy([visitor, logger])
+        self.assertTrue(hierarchy.is_abstract(logger))
+        self.assertEqual(hierarchy.devirtualize()["final_classes"], [])
+
+    def test_implicit_destructors(self):
+        writer = io.StringIO()
+        cpp = CppSourceFile(None, writer=writer)
+        base = CppClass(name="Base")
+        base.add_method(
+            CppClass.CppMethod(
+                name="~Base", ret_type="", is_virtual=True, implementation=[]
+            )
+        )
+        base.add_method(
+            CppClass.CppMethod(
+                name="Run", ret_type="void", is_virtual=True, is_pure_virtual=True
+            )
+        )
+        mid = CppClass(name="Mid", parent_class=base)
+        mid.add_method(
+            CppClass.CppMethod(
+                name="Run",
+                ret_type="void",
+                is_virtual=True,
+                is_override=True,
+                implementation=[],
+            )
+        )
+        leaf = CppClass(name="Leaf", parent_class=mid)
+        report = CppClassHierarchy([base, mid, leaf]).devirtualize()
+        # Mid and Leaf override the destructor implicitly
+        self.assertEqual(
+            report,
+            {
+                "final_classes": ["Leaf"],
+                "final_methods": ["Mid::Run"],
+                "never_overridden": [],
+            },
+        )
+        self.assertFalse(base.methods[0].is_final)
+        mid.render_to_string_declaration(cpp)
+        leaf.render_to_string_declaration(cpp)
+        expected_output = dedent("""\
+            class Mid : public Base
+            {
+            public:
+                virtual void Run() override final;
+            };
+            class Leaf final : public Mid
+            {
+            };""")
+        actual_output = writer.getvalue().strip()
+        expected_output_normalized = normalize_code(expected_output)
+        actual_output_normalized = normalize_code(actual_output)
+        if is_debug():
+            debug_dump(expected_output_normalized, actual_output_normalized, "cpp")
+        self.assertEqual(expected_output_normalized, actual_output_normalized)
+
+    def test_crtp(self):
+        shape = CppClass(name="Shape", is_crtp=True)
+        shape.add_method(
+            CppClass.CppMethod(
+                name="Area",
+                ret_type="double",
+                is_virtual=True,
+                is_pure_virtual=True,
+                is_const=True,
+            )
+        )
+        circle = CppClass(name="Circle", parent_class=shape)
+        circle.add_method(
+            CppClass.CppMethod(
+                name="Area",
+                ret_type="double",
+                is_virtual=True,
+                is_override=True,
+                is_const=True,
+                implementation=["return 3.14;"],
+            )
+        )
+        shape.crtp_derive(circle)
+        hierarchy = CppClassHierarchy([shape, circle])
+        self.assertTrue(hierarchy.is_overridden(shape, shape.methods[0]))
+        self.assertEqual(
+            hierarchy.devirtualize(),
+            {"final_classes": ["Circle"], "final_methods": [], "never_overridden": []},
+        )
+        self.assertFalse(shape.methods[0].is_final)
+
+    def test_excluded(self):
+        visitor = CppClass(name="Visitor")
+        visitor.add_method(
+            CppClass.CppMethod(
+                name="Visit", ret_type="void", is_virtual=True, is_pure_virtual=True
+            )
+        )
+        visitor.add_method(
+            CppClass.CppMethod(
+                name="Reset", ret_type="void", is_virtual=True, implementation=[]
+            )
+        )
+        printer = CppClass(name="Printer", parent_class=visitor)
+        printer.add_method(
+            CppClass.CppMethod(
+                name="Visit",
+                ret_type="void",
+                is_virtual=True,
+                is_override=True,
+                implementation=[],
+            )
+        )
+        counter = CppClass(
+            name="Counter", parent_class=["Printer", ("Serializable", "protected")]
+        )
+        counter.add_method(
+            CppClass.CppMethod(
+                name="Count",
+                ret_type="int",
+                is_virtual=True,
+                implementation=["return 0;"],
+            )
+        )
+        hierarchy = CppClassHierarchy([visitor, printer, counter], excluded=["Counter"])
+        report = hierarchy.devirtualize()
+        self.assertEqual(report["final_classes"], [])
+        self.assertEqual(report["final_methods"], [])
+        self.assertFalse(counter.methods[0].is_final)
+
+
+if __name__ == "__main__":
+    unittest.main()
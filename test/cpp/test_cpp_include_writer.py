@@ -0,0 +1,208 @@
+import io
+import unittest
+from textwrap import dedent
+
+from code_gen.cpp import (
+    CppSourceFile,
+    CppIncludes,
+    CppClass,
+    CppFunction,
+    CppVariable,
+    CppBaseType,
+    CppTemplateType,
+)
+
+__doc__ = """Unit tests for C++ code generator
+"""
+
+
+class TestCppIncludes(unittest.TestCase):
+    """
+    Test include registry and includes required by elements
+    """
+
+    def test_deduplicate_sort_and_group(self):
+        writer = io.StringIO()
+        cpp = CppSourceFile(None, writer=writer, sections=())
+        for header in [
+            '"b.h"',
+            "vector",
+            "<string>",
+            "<vector>",
+            '"a.h"',
+            "#include <map>",
+        ]:
+            cpp.add_include(header)
+        cpp.render_includes()
+        self.assertEqual(
+            dedent("""\
+                #include <map>
+                #include <string>
+                #include <vector>
+
+                #include "a.h"
+                #include "b.h"
+                """),
+            writer.getvalue(),
+        )
+
+    def test_render_only_new_includes(self):
+        includes = CppIncludes(["<vector>"])
+        writer = io.StringIO()
+        cpp = CppSourceFile(None, writer=writer)
+        includes.render(cpp)
+        includes.add("<vector>")
+        includes.add("<string>")
+        self.assertEqual(1, len(includes))
+        includes.render(cpp)
+        self.assertEqual("#include <vector>\n#include <string>\n", writer.getvalue())
+
+    def test_required_includes(self):
+        cpp_class = CppClass(name="Registry", includes=["<cstddef>"])
+        cpp_class.add_variable(
+            CppVariable(
+                name="m_names",
+                type="std::vector<std::string>",
+                includes=["<vector>", "<string>"],
+            )
+        )
+        cpp_class.add_variable(
+            CppVariable(
+                name="m_index",
+                type=CppTemplateType(
+                    type="std::map",
+                    includes=["<map>"],
+                    template_args=[
+                        CppBaseType(type="std::string", includes=["<string>"]),
+                        "int",
+                    ],
+                ),
+            )
+        )
+        cpp_class.add_method(
+            CppClass.CppMethod(
+                name="Find",
+                ret_type=CppTemplateType(
+                    type="std::optional", includes=["<optional>"], template_args=["int"]
+                ),
+                includes=["<algorithm>"],
+                implementation=["return {};"],
+            )
+        )
+        self.assertEqual(
+            ["<cstddef>", "<algorithm>", "<optional>", "<vector>", "<string>", "<map>"],
+            cpp_class.required_includes(),
+        )
+
+    def test_includes_section(self):
+        writer = io.StringIO()
+        cpp = CppSourceFile(None, writer=writer)
+        func = CppFunction(
+            name="Names",
+            ret_type="std::vector<int>",
+            includes=["<vector>"],
+            implementation=["return {};"],
+        )
+        func.render_to_string(cpp.section("definitions"))
+        cpp.section("includes")('#include "names.h"')
+        cpp.add_includes_from(func)
+        cpp.add_include("<vector>")
+        cpp.flush_sections()
+        self.assertEqual(
+            dedent("""\
+                #include <vector>
+                #include "names.h"
+                std::vector<int> Names() {
+                    return {};
+                }
+                """),
+            writer.getvalue(),
+        )
+
+    def test_includes_in_one_block(self):
+        writer = io.StringIO()
+        cpp = CppSourceFile(None, writer=writer)
+        cpp("#pragma once")
+        cpp.add_include("<vector>")
+        cpp.section("types")("struct A;")
+        cpp.add_include("<string>")
+        cpp.flush_sections()
+        self.assertEqual(
+            dedent("""\
+                #pragma once
+                #include <string>
+                #include <vector>
+                struct A;
+                """),
+            writer.getvalue(),
+        )
+        # the includes have been written, only known headers could be registered
+        cpp.add_include("vector")
+        with self.assertRaises(RuntimeError):
+            cpp.section("definitions").add_include("<map>")
+        with self.assertRaises(RuntimeError):
+            cpp.add_includes_from(
+                CppVariable(name="m_map", type="std::map<int, int>", includes=["<map>"])
+            )
+        cpp.flush_sections()
+        self.assertNotIn("<map>", writer.getvalue())
+
+    def test_late_include_without_section(self):
+        writer = io.StringIO()
+        cpp = CppSourceFile(None, writer=writer, sections=())
+        cpp.render_includes()
+        with self.assertRaises(RuntimeError):
+            cpp.add_include("<vector>")
+
+    def test_includes_of_sections(self):
+        writer = io.StringIO()
+        cpp = CppSourceFile(None, writer=writer)
+        cpp.section("types").add_include("<map>")
+        cpp.section("definitions").add_include("<vector>")
+        cpp.section("types")("using Map = std::map<int, int>;")
+        cpp.flush_sections()
+        self.assertEqual(
+            dedent("""\
+                #include <map>
+                #include <vector>
+                using Map = std::map<int, int>;
+                """),
+            writer.getvalue(),
+        )
+
+    def test_includes_of_rendered_elements(self):
+        writer = io.StringIO()
+        cpp = CppSourceFile(None, writer=writer)
+
+        def body(block):
+            cpp.add_include("<vector>")
+            block("return {};")
+
+        cpp.section("definitions").render_elements(
+            [
+                CppFunction(
+                    name=f"Names{index}",
+                    ret_type="std::vector<int>",
+                    implementation=body,
+                )
+                for index in range(2)
+            ],
+            max_workers=2,
+        )
+        cpp.flush_sections()
+        self.assertEqual(
+            dedent("""\
+                #include <vector>
+                std::vector<int> Names0() {
+                    return {};
+                }
+                std::vector<int> Names1() {
+                    return {};
+                }
+                """),
+            writer.getvalue(),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
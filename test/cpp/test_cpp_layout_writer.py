@@ -0,0 +1,146 @@
+import io
+import unittest
+from textwrap import dedent
+
+from code_gen.cpp import (
+    CppSourceFile,
+    CppArray,
+    CppClass,
+    CppStructLayout,
+    CppVariable,
+)
+from test.comparing_tools import normalize_code, debug_dump, is_debug
+
+__doc__ = """Unit tests for C++ code generator
+"""
+
+
+class TestCppStructLayout(unittest.TestCase):
+    """
+    Test data member layout optimization
+    """
+
+    def test_optimized_declaration(self):
+        writer = io.StringIO()
+        cpp = CppSourceFile(None, writer=writer)
+        record = CppClass(name="Record", is_struct=True, optimize_layout=True)
+        record.add_variable(CppVariable(name="id", type="uint8_t"))
+        record.add_variable(CppVariable(name="value", type="double"))
+        record.add_variable(CppVariable(name="flags", type="uint16_t"))
+        record.add_variable(CppVariable(name="next", type="Record", is_ptr=True))
+        record.add_array(CppArray(name="tag", type="char", array_size=3))
+        record.add_variable(CppVariable(name="instances", type="int", is_static=True))
+        record.render_to_string_declaration(cpp)
+        expected_output = dedent("""\
+            struct Record
+            {
+                double value;
+                Record* next;
+                uint16_t flags;
+                uint8_t id;
+                char tag[3];
+                static int instances;
+            };
+            static_assert(sizeof(Record) == 24, "Unexpected size of Record");""")
+        actual_output = writer.getvalue().strip()
+        expected_output_normalized = normalize_code(expected_output)
+        actual_output_normalized = normalize_code(actual_output)
+        if is_debug():
+            debug_dump(expected_output_normalized, actual_output_normalized, "cpp")
+        self.assertEqual(expected_output_normalized, actual_output_normalized)
+        layout = record.layout()
+        self.assertEqual(40, layout.original_size())
+        self.assertEqual(16, layout.bytes_saved())
+        self.assertEqual("Record: 40 -> 24 bytes (16 saved)", layout.report())
+
+    def test_declaration_order_by_default(self):
+        writer = io.StringIO()
+        cpp = CppSourceFile(None, writer=writer)
+        record = CppClass(name="Record", is_struct=True)
+        record.add_variable(CppVariable(name="id", type="uint8_t"))
+        record.add_variable(CppVariable(name="value", type="double"))
+        record.add_variable(CppVariable(name="flags", type="uint16_t"))
+        record.add_variable(CppVariable(name="next", type="Record", is_ptr=True))
+        record.add_array(CppArray(name="tag", type="char", array_size=3))
+        record.render_to_string_declaration(cpp)
+        expected_output = dedent("""\
+            struct Record
+            {
+                uint8_t id;
+                double value;
+                uint16_t flags;
+                Record* next;
+                char tag[3];
+            };""")
+        actual_output = writer.getvalue().strip()
+        expected_output_normalized = normalize_code(expected_output)
+        actual_output_normalized = normalize_code(actual_output)
+        if is_debug():
+            debug_dump(expected_output_normalized, actual_output_normalized, "cpp")
+        self.assertEqual(expected_output_normalized, actual_output_normalized)
+
+    def test_pinned_members(self):
+        record = CppClass(name="Record", is_struct=True, optimize_layout=True)
+        record.add_variable(CppVariable(name="id", type="uint8_t", is_pinned=True))
+        record.add_variable(CppVariable(name="value", type="double"))
+        record.add_variable(CppVariable(name="flags", type="uint16_t"))
+        record.add_variable(CppVariable(name="next", type="Record", is_ptr=True))
+        record.add_array(CppArray(name="tag", type="char", array_size=3))
+        layout = record.layout()
+        self.assertEqual(
+            ["id", "value", "next", "flags", "tag"],
+            [member.name for member in layout.optimized_members()],
+        )
+        self.assertEqual(32, layout.optimized_size())
+
+    def test_alignas(self):
+        writer = io.StringIO()
+        cpp = CppSourceFile(None, writer=writer)
+        packet = CppClass(name="Packet", is_struct=True, optimize_layout=True)
+        packet.add_variable(CppVariable(name="a", type="uint8_t"))
+        packet.add_variable(
+            CppVariable(name="b", type="int", attributes=[("alignas", 64)])
+        )
+        packet.add_array(
+            CppArray(name="c", type="char", array_size=3, attributes={"alignas": 16})
+        )
+        packet.render_to_string_declaration(cpp)
+        expected_output = dedent("""\
+            struct Packet
+            {
+                alignas(64) int b;
+                alignas(16) char c[3];
+                uint8_t a;
+            };
+            static_assert(sizeof(Packet) == 64, "Unexpected size of Packet");""")
+        actual_output = writer.getvalue().strip()
+        expected_output_normalized = normalize_code(expected_output)
+        actual_output_normalized = normalize_code(actual_output)
+        if is_debug():
+            debug_dump(expected_output_normalized, actual_output_normalized, "cpp")
+        self.assertEqual(expected_output_normalized, actual_output_normalized)
+        self.assertEqual(
+            (4, 64), packet.layout().member_layout(packet.variable_members[1])
+        )
+
+    def test_type_overrides(self):
+        node = CppClass(name="Node", is_struct=True, optimize_layout=True)
+        node.add_variable(CppVariable(name="alive", type="bool"))
+        node.add_variable(
+            CppVariable(name="position", type="Vec3", size=12, alignment=4)
+        )
+        node.add_variable(CppVariable(name="id", type="Id"))
+        self.assertRaises(ValueError, node.layout().optimized_size)
+        node.type_layouts = {"Id": (8, 8)}
+        self.assertEqual(24, node.layout().optimized_size())
+
+        scene = CppClass(name="Scene", is_struct=True)
+        scene.add_variable(CppVariable(name="root", type=node))
+        scene.add_variable(CppVariable(name="count", type="int"))
+        layout = CppStructLayout(scene, {"Id": (8, 8)})
+        self.assertEqual(32, layout.original_size())
+        self.assertEqual(0, layout.bytes_saved())
+
+
+if __name__ == "__main__":
+    unittest.main()
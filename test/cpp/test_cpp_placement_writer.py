@@ -0,0 +1,286 @@
+import asyncio
+import io
+import unittest
+from textwrap import dedent
+
+from code_gen.cpp import (
+    CppSourceFile,
+    CppClass,
+    CppPlacementPolicy,
+)
+from test.comparing_tools import normalize_code, debug_dump, is_debug
+
+__doc__ = """Unit tests for C++ code generator
+"""
+
+
+class TestCppPlacementPolicy(unittest.TestCase):
+    """
+    Test placement of method definitions by the size of their bodies
+    """
+
+    def test_header_and_source(self):
+        point = CppClass(
+            name="Point", placement=CppPlacementPolicy(class_limit=1, header_limit=2)
+        )
+        point.add_method(
+            CppClass.CppMethod(
+                name="GetX",
+                ret_type="int",
+                is_const=True,
+                implementation=["return m_x;"],
+            )
+        )
+        point.add_method(
+            CppClass.CppMethod(
+                name="Length",
+                ret_type="int",
+                is_const=True,
+                implementation=["const int square = m_x * m_x;", "return square;"],
+            )
+        )
+        point.add_method(
+            CppClass.CppMethod(
+                name="Reset",
+                ret_type="void",
+                implementation=["m_x = 0;", "m_y = 0;", "m_z = 0;"],
+            )
+        )
+        point.add_method(
+            CppClass.CppMethod(
+                name="Zero",
+                ret_type="int",
+                is_constexpr=True,
+                implementation=["return 0;"],
+            )
+        )
+        header = io.StringIO()
+        source = io.StringIO()
+        point.render_to_header_and_source(
+            CppSourceFile(None, writer=header), CppSourceFile(None, writer=source)
+        )
+        expected_output = dedent("""\
+            class Point
+            {
+            public:
+                int GetX() const
+                {
+                    return m_x;
+                }
+                int Length() const;
+                void Reset();
+                constexpr int Zero()
+                {
+                    return 0;
+                }
+            };
+            inline int Point::Length() const
+            {
+                const int square = m_x * m_x;
+                return square;
+            }""")
+        actual_output = header.getvalue().strip()
+        expected_output_normalized = normalize_code(expected_output)
+        actual_output_normalized = normalize_code(actual_output)
+        if is_debug():
+            debug_dump(expected_output_normalized, actual_output_normalized, "cpp")
+        self.assertEqual(expected_output_normalized, actual_output_normalized)
+        expected_output = dedent("""\
+            void Point::Reset()
+            {
+                m_x = 0;
+                m_y = 0;
+                m_z = 0;
+            }""")
+        actual_output = source.getvalue().strip()
+        expected_output_normalized = normalize_code(expected_output)
+        actual_output_normalized = normalize_code(actual_output)
+        if is_debug():
+            debug_dump(expected_output_normalized, actual_output_normalized, "cpp")
+        self.assertEqual(expected_output_normalized, actual_output_normalized)
+
+    def test_same_output(self):
+        point = CppClass(
+            name="Point", placement=CppPlacementPolicy(class_limit=1, header_limit=2)
+        )
+        point.add_method(
+            CppClass.CppMethod(
+                name="GetX",
+                ret_type="int",
+                is_const=True,
+                implementation=["return m_x;"],
+            )
+        )
+        point.add_method(
+            CppClass.CppMethod(
+                name="Length",
+                ret_type="int",
+                is_const=True,
+                implementation=["const int square = m_x * m_x;", "return square;"],
+            )
+        )
+        point.add_method(
+            CppClass.CppMethod(
+                name="Reset",
+                ret_type="void",
+                implementation=["m_x = 0;", "m_y = 0;", "m_z = 0;"],
+            )
+        )
+        point.add_method(
+            CppClass.CppMethod(
+                name="Zero",
+                ret_type="int",
+                is_constexpr=True,
+                implementation=["return 0;"],
+            )
+        )
+        split_header = io.StringIO()
+        split_source = io.StringIO()
+        point.render_to_header_and_source(
+            CppSourceFile(None, writer=split_header),
+            CppSourceFile(None, writer=split_source),
+        )
+        header = io.StringIO()
+        source = io.StringIO()
+        point.render_to_string_declaration(CppSourceFile(None, writer=header))
+        point.render_to_string_implementation(CppSourceFile(None, writer=source))
+        expected_output = split_header.getvalue() + split_source.getvalue()
+        actual_output = header.getvalue() + source.getvalue()
+        expected_output_normalized = normalize_code(expected_output)
+        actual_output_normalized = normalize_code(actual_output)
+        if is_debug():
+            debug_dump(expected_output_normalized, actual_output_normalized, "cpp")
+        self.assertEqual(expected_output_normalized, actual_output_normalized)
+
+    def test_tokens(self):
+        policy = CppPlacementPolicy(class_limit=4, metric="tokens")
+        point = CppClass(name="Point", placement=policy)
+        point.add_method(
+            CppClass.CppMethod(
+                name="GetX",
+                ret_type="int",
+                is_const=True,
+                implementation=["return m_x;"],
+            )
+        )
+        point.add_method(
+            CppClass.CppMethod(
+                name="Length",
+                ret_type="int",
+                is_const=True,
+                implementation=["const int square = m_x * m_x;", "return square;"],
+            )
+        )
+        point.add_method(
+            CppClass.CppMethod(
+                name="Reset",
+                ret_type="void",
+                implementation=["m_x = 0;", "m_y = 0;", "m_z = 0;"],
+            )
+        )
+        point.add_method(
+            CppClass.CppMethod(
+                name="Zero",
+                ret_type="int",
+                is_constexpr=True,
+                implementation=["return 0;"],
+            )
+        )
+        # 'return m_x ;' has 3 tokens, 'm_x = 0 ;' 4 tokens per line
+        self.assertEqual(policy.measure(point.methods[0]), 3)
+        self.assertEqual(policy.measure(point.methods[2]), 12)
+        self.assertEqual(
+            CppPlacementPolicy.report([point]),
+            {
+                "class": ["Point::GetX", "Point::Zero"],
+                "header": [],
+                "source": ["Point::Length", "Point::Reset"],
+            },
+        )
+
+    def test_nested_class(self):
+        outer = CppClass(name="Outer")
+        inner = CppClass(
+            name="Point", placement=CppPlacementPolicy(class_limit=0, header_limit=10)
+        )
+        inner.add_method(
+            CppClass.CppMethod(
+                name="GetX",
+                ret_type="int",
+                is_const=True,
+                implementation=["return m_x;"],
+            )
+        )
+        inner.add_method(
+            CppClass.CppMethod(
+                name="Length",
+                ret_type="int",
+                is_const=True,
+                implementation=["const int square = m_x * m_x;", "return square;"],
+            )
+        )
+        inner.add_method(
+            CppClass.CppMethod(
+                name="Reset",
+                ret_type="void",
+                implementation=["m_x = 0;", "m_y = 0;", "m_z = 0;"],
+            )
+        )
+        inner.add_method(
+            CppClass.CppMethod(
+                name="Zero",
+                ret_type="int",
+                is_constexpr=True,
+                implementation=["return 0;"],
+            )
+        )
+        outer.add_internal_class(inner)
+        report = CppPlacementPolicy.report([outer])
+        # no inline definitions between the members of the enclosing class
+        self.assertEqual(report["header"], [])
+        self.assertEqual(len(report["class"]), 4)
+
+    def test_body_measured_once(self):
+        calls = []
+
+        def body(cpp):
+            calls.append(cpp)
+            cpp("return m_x;")
+
+        point = CppClass(name="Point", placement=CppPlacementPolicy(header_limit=2))
+        point.add_method(
+            CppClass.CppMethod(name="GetX", ret_type="int", implementation=body)
+        )
+        point.render_to_string(CppSourceFile(None, writer=io.StringIO()))
+        # the body is measured once and rendered once
+        self.assertEqual(len(calls), 2)
+        report = CppPlacementPolicy.report([point])
+        self.assertEqual(report["class"], ["Point::GetX"])
+        self.assertEqual(len(calls), 2)
+
+    def test_report_after_async_render(self):
+        async def body(cpp):
+            await asyncio.sleep(0)
+            cpp("return m_x;")
+
+        point = CppClass(name="Point", placement=CppPlacementPolicy())
+        point.add_method(
+            CppClass.CppMethod(name="GetX", ret_type="int", implementation=body)
+        )
+        writer = io.StringIO()
+        asyncio.run(point.render_async(CppSourceFile(None, writer=writer)))
+        self.assertIn("return m_x;", writer.getvalue())
+        self.assertEqual(
+            CppPlacementPolicy.report([point]),
+            {"class": ["Point::GetX"], "header": [], "source": []},
+        )
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            CppPlacementPolicy(metric="bytes")
+        with self.assertRaises(ValueError):
+            CppPlacementPolicy(class_limit=-1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,227 @@
+import io
+import os
+import tempfile
+import unittest
+from textwrap import dedent
+
+from code_gen.cpp import (
+    CppSourceFile,
+    CppClass,
+    CppFunction,
+    CppHotnessProfile,
+    CppRenderJob,
+    CppSourceShards,
+    symbol_name,
+)
+from test.comparing_tools import normalize_code, debug_dump, is_debug
+
+__doc__ = """Unit tests for C++ code generator
+"""
+
+
+class TestCppHotnessProfile(unittest.TestCase):
+    """
+    Test parsing of profiles and the profile-guided order of definitions
+    """
+
+    def test_symbol_name(self):
+        self.assertEqual(symbol_name("Interp::OpLoad(int) const"), "Interp::OpLoad")
+        self.assertEqual(symbol_name("Interp::OpAdd() [clone .cold]"), "Interp::OpAdd")
+        self.assertEqual(symbol_name("Interp::OpAdd.part.0"), "Interp::OpAdd")
+        self.assertEqual(symbol_name("Visitor::operator()(int)"), "Visitor::operator()")
+
+    def test_csv(self):
+        profile = CppHotnessProfile.from_csv(
+            "symbol,count\nInterp::OpAdd,70\nInterp::OpLoad(int),20\n"
+            "Interp::OpLoad(double),10\n"
+        )
+        self.assertEqual(profile.counts, {"Interp::OpAdd": 70, "Interp::OpLoad": 30})
+        with self.assertRaises(ValueError):
+            CppHotnessProfile.from_csv("Interp::OpAdd,70\nInterp::OpLoad,many\n")
+
+    def test_perf(self):
+        perf_report = dedent("""\
+            # Samples: 10K of event 'cycles'
+            #
+            # Overhead  Command  Shared Object  Symbol
+            # ........  .......  .............  ......
+            #
+                61.20%  interp   interp         [.] vm::Interp::OpAdd
+                30.10%  interp   interp         [.] vm::Interp::OpLoad(int) const
+                 8.70%  interp   interp         [.] Dispatch
+            """)
+        profile = CppHotnessProfile.from_perf(perf_report)
+        self.assertEqual(
+            profile.counts,
+            {"vm::Interp::OpAdd": 61.2, "vm::Interp::OpLoad": 30.1, "Dispatch": 8.7},
+        )
+        # namespaces unknown to the generator are ignored
+        interp = CppClass(name="Interp")
+        for name in ("OpNop", "OpLoad", "OpAdd"):
+            interp.add_method(
+                CppClass.CppMethod(name=name, ret_type="void", implementation=[])
+            )
+        self.assertEqual(profile.count(interp.methods[2]), 61.2)
+
+    def test_callgrind(self):
+        callgrind_report = dedent("""\
+            --------------------------------------------------------------------------------
+            Ir
+            --------------------------------------------------------------------------------
+            1,000,000 (100.0%)  PROGRAM TOTALS
+
+            --------------------------------------------------------------------------------
+            Ir                file:function
+            --------------------------------------------------------------------------------
+            700,000 (70.00%)  src/interp.cpp:Interp::OpAdd() [/usr/bin/interp]
+            300,000 (30.00%)  src/interp.cpp:Interp::OpLoad(int) const [/usr/bin/interp]
+            """)
+        profile = CppHotnessProfile.from_callgrind(callgrind_report)
+        self.assertEqual(
+            profile.counts, {"Interp::OpAdd": 700000, "Interp::OpLoad": 300000}
+        )
+
+    def test_load(self):
+        perf_report = dedent("""\
+            # Samples: 10K of event 'cycles'
+            #
+            # Overhead  Command  Shared Object  Symbol
+            # ........  .......  .............  ......
+            #
+                61.20%  interp   interp         [.] vm::Interp::OpAdd
+                30.10%  interp   interp         [.] vm::Interp::OpLoad(int) const
+                 8.70%  interp   interp         [.] Dispatch
+            """)
+        callgrind_report = dedent("""\
+            --------------------------------------------------------------------------------
+            Ir
+            --------------------------------------------------------------------------------
+            1,000,000 (100.0%)  PROGRAM TOTALS
+
+            --------------------------------------------------------------------------------
+            Ir                file:function
+            --------------------------------------------------------------------------------
+            700,000 (70.00%)  src/interp.cpp:Interp::OpAdd() [/usr/bin/interp]
+            300,000 (30.00%)  src/interp.cpp:Interp::OpLoad(int) const [/usr/bin/interp]
+            """)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "profile.csv")
+            with open(path, "w") as out:
+                out.write("Interp::OpAdd,5\n")
+            self.assertEqual(CppHotnessProfile.load(path).counts, {"Interp::OpAdd": 5})
+            path = os.path.join(directory, "profile.txt")
+            with open(path, "w") as out:
+                out.write(callgrind_report)
+            self.assertIn("Interp::OpLoad", CppHotnessProfile.load(path).counts)
+            # 'Ir' in a symbol of a perf report does not make it a callgrind output
+            path = os.path.join(directory, "perf.txt")
+            with open(path, "w") as out:
+                out.write(
+                    perf_report
+                    + "     1.00%  interp  interp  [.] Interp::FirstIrPass\n"
+                )
+            self.assertIn("Interp::FirstIrPass", CppHotnessProfile.load(path).counts)
+            path = os.path.join(directory, "empty.txt")
+            with open(path, "w") as out:
+                out.write("# no samples\n")
+            with self.assertRaises(ValueError):
+                CppHotnessProfile.load(path)
+
+    def test_methods_of_the_same_name(self):
+        interp = CppClass(name="Interp")
+        jit = CppClass(name="Jit")
+        for cpp_class in (interp, jit):
+            cpp_class.add_method(
+                CppClass.CppMethod(name="OpAdd", ret_type="void", implementation=[])
+            )
+        function = CppFunction(name="OpAdd", ret_type="void", implementation=[])
+        profile = CppHotnessProfile(
+            {"vm::Interp::OpAdd": 70, "vm::Jit::OpAdd": 20, "vm::OpAdd": 10}
+        )
+        profile.apply([interp, jit, function])
+        self.assertEqual(
+            [70, 20, 10],
+            [interp.methods[0].hotness, jit.methods[0].hotness, function.hotness],
+        )
+        # the namespace of the generated code is known only from the methods
+        self.assertEqual(0, profile.count(function))
+        self.assertEqual(0, CppHotnessProfile({"Interp::OpAdd": 70}).count(function))
+        self.assertEqual(
+            10, CppHotnessProfile(profile.counts, namespaces=["vm"]).count(function)
+        )
+
+    def test_methods_order(self):
+        interp = CppClass(name="Interp")
+        for name in ("OpNop", "OpLoad", "OpAdd"):
+            interp.add_method(
+                CppClass.CppMethod(name=name, ret_type="void", implementation=[])
+            )
+        profile = CppHotnessProfile({"Interp::OpAdd": 70, "Interp::OpLoad": 30})
+        report = profile.apply([interp], sections=True)
+        self.assertEqual(report["hot"], ["Interp::OpLoad", "Interp::OpAdd"])
+        self.assertEqual(report["cold"], ["Interp::OpNop"])
+        writer = io.StringIO()
+        cpp = CppSourceFile(None, writer=writer)
+        interp.render_to_string(cpp)
+        # declarations keep their order, definitions are hot first
+        expected_output = dedent("""\
+            class Interp
+            {
+            public:
+                [[gnu::section(".text.unlikely")]] void OpNop();
+                [[gnu::section(".text.hot")]] void OpLoad();
+                [[gnu::section(".text.hot")]] void OpAdd();
+            };
+            [[gnu::section(".text.hot")]] void Interp::OpAdd()
+            {
+            }
+
+            [[gnu::section(".text.hot")]] void Interp::OpLoad()
+            {
+            }
+
+            [[gnu::section(".text.unlikely")]] void Interp::OpNop()
+            {
+            }""")
+        actual_output = writer.getvalue().strip()
+        expected_output_normalized = normalize_code(expected_output)
+        actual_output_normalized = normalize_code(actual_output)
+        if is_debug():
+            debug_dump(expected_output_normalized, actual_output_normalized, "cpp")
+        self.assertEqual(expected_output_normalized, actual_output_normalized)
+
+    def test_hints(self):
+        interp = CppClass(name="Interp")
+        for name in ("OpNop", "OpLoad", "OpAdd"):
+            interp.add_method(
+                CppClass.CppMethod(name=name, ret_type="void", implementation=[])
+            )
+        interp.methods[0].attributes = ["hot"]
+        profile = CppHotnessProfile(
+            {"Interp::OpAdd": 90, "Interp::OpLoad": 10}, hot_coverage=0.5
+        )
+        report = profile.apply([interp], hints=True)
+        self.assertEqual(report["warm"], ["Interp::OpLoad"])
+        # a conflicting attribute set by the user is kept
+        self.assertEqual(interp.methods[0].attributes, ["hot"])
+        self.assertIsNone(interp.methods[1].attributes)
+        self.assertEqual(interp.methods[2].attributes, {"hot": None})
+
+    def test_top_level_functions(self):
+        functions = [
+            CppFunction(name=name, ret_type="void", implementation=[])
+            for name in ("Cold", "Hot")
+        ]
+        CppHotnessProfile({"Hot": 1}).apply(functions)
+        header = CppRenderJob("a.h", functions, role="header").render()
+        source = CppRenderJob("a.cpp", functions, role="source").render()
+        self.assertLess(header.index("Cold"), header.index("Hot"))
+        self.assertLess(source.index("Hot"), source.index("Cold"))
+        ((_, shard),) = CppSourceShards(
+            "a.cpp", functions, shards=1
+        ).render_to_strings()
+        self.assertLess(shard.index("Hot"), shard.index("Cold"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,153 @@
+import os
+import tempfile
+import unittest
+from textwrap import dedent
+
+from code_gen.cpp import (
+    CppClass,
+    CppFunction,
+    CppProject,
+    CppRenderError,
+    CppRenderJob,
+    CppVariable,
+)
+from test.comparing_tools import normalize_code, debug_dump, is_debug
+
+__doc__ = """Unit tests for C++ code generator
+"""
+
+
+# implementation callbacks are referenced by import path from the worker processes
+def handle_to_factorial(cpp):
+    cpp("return n < 1 ? 1 : (n * factorial(n - 1));")
+
+
+def handle_to_get(cpp):
+    cpp("return m_var;")
+
+
+class TestCppProject(unittest.TestCase):
+    """
+    Test rendering of multiple files in worker processes
+    """
+
+    def test_render_job(self):
+        func = CppFunction(
+            name="factorial",
+            ret_type="int",
+            implementation="test.cpp.test_cpp_project_writer.handle_to_factorial",
+        )
+        func.add_argument("int n")
+        job = CppRenderJob("factorial.cpp", [func])
+        expected_output = dedent("""\
+            int factorial(int n) {
+                return n < 1 ? 1 : (n * factorial(n - 1));
+            }""")
+        actual_output = job.render().strip()
+        expected_output_normalized = normalize_code(expected_output)
+        actual_output_normalized = normalize_code(actual_output)
+        if is_debug():
+            debug_dump(expected_output_normalized, actual_output_normalized, "cpp")
+        self.assertEqual(expected_output_normalized, actual_output_normalized)
+
+    def test_unknown_role_raises(self):
+        self.assertRaises(ValueError, CppRenderJob, "a.h", [], role="inline")
+
+    def test_parallel_output_matches_serial(self):
+        with tempfile.TemporaryDirectory() as directory:
+            projects = []
+            for max_workers in (1, 2):
+                jobs = []
+                for index in range(8):
+                    cpp_class = CppClass(name=f"MyClass{index}", is_struct=True)
+                    cpp_class.add_variable(
+                        CppVariable(name="m_var", type="int", value=str(index))
+                    )
+                    cpp_class.add_method(
+                        CppClass.CppMethod(
+                            name="Get",
+                            ret_type="int",
+                            is_const=True,
+                            implementation="test.cpp.test_cpp_project_writer:handle_to_get",
+                        )
+                    )
+                    header = os.path.join(directory, f"class{index}.h")
+                    source = os.path.join(directory, f"class{index}.cpp")
+                    jobs.append(CppRenderJob(header, [cpp_class], role="header"))
+                    jobs.append(CppRenderJob(source, [cpp_class], role="source"))
+                projects.append(CppProject(jobs, max_workers=max_workers))
+            serial, parallel = projects
+            self.assertEqual(serial.render_to_strings(), parallel.render_to_strings())
+
+    def test_render_writes_files(self):
+        with tempfile.TemporaryDirectory() as directory:
+            jobs = []
+            for index in range(2):
+                cpp_class = CppClass(name=f"MyClass{index}", is_struct=True)
+                cpp_class.add_variable(
+                    CppVariable(name="m_var", type="int", value=str(index))
+                )
+                cpp_class.add_method(
+                    CppClass.CppMethod(
+                        name="Get",
+                        ret_type="int",
+                        is_const=True,
+                        implementation="test.cpp.test_cpp_project_writer:handle_to_get",
+                    )
+                )
+                jobs.append(
+                    CppRenderJob(
+                        os.path.join(directory, f"class{index}.h"),
+                        [cpp_class],
+                        role="header",
+                        preamble=["#pragma once"],
+                    )
+                )
+                jobs.append(
+                    CppRenderJob(
+                        os.path.join(directory, f"class{index}.cpp"),
+                        [cpp_class],
+                        role="source",
+                        preamble=[f'#include "class{index}.h"'],
+                    )
+                )
+            filenames = CppProject(jobs, max_workers=2).render()
+            self.assertEqual(4, len(filenames))
+            with open(os.path.join(directory, "class1.cpp")) as f:
+                actual_output = f.read().strip()
+        expected_output = dedent("""\
+            #include "class1.h"
+            int MyClass1::Get() const
+            {
+                return m_var;
+            }""")
+        expected_output_normalized = normalize_code(expected_output)
+        actual_output_normalized = normalize_code(actual_output)
+        if is_debug():
+            debug_dump(expected_output_normalized, actual_output_normalized, "cpp")
+        self.assertEqual(expected_output_normalized, actual_output_normalized)
+
+    def test_errors_are_aggregated(self):
+        jobs = []
+        for filename, implementation in (
+            ("lambda.cpp", lambda cpp: cpp("return 1;")),
+            ("good.cpp", handle_to_factorial),
+            ("missing.cpp", "test.cpp.missing:body"),
+        ):
+            func = CppFunction(
+                name="factorial", ret_type="int", implementation=implementation
+            )
+            func.add_argument("int n")
+            jobs.append(CppRenderJob(filename, [func]))
+        project = CppProject(jobs, max_workers=2)
+        with self.assertRaises(CppRenderError) as context:
+            project.render()
+        self.assertEqual(
+            ["lambda.cpp", "missing.cpp"],
+            [filename for filename, _ in context.exception.errors],
+        )
+        self.assertFalse(os.path.exists("good.cpp"))
+
+
+if __name__ == "__main__":
+    unittest.main()
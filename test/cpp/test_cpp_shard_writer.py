@@ -0,0 +1,147 @@
+import io
+import os
+import tempfile
+import unittest
+
+from code_gen.cpp import (
+    CppSourceFile,
+    CppClass,
+    CppArray,
+    CppFunction,
+    CppVariable,
+    CppSourceShards,
+)
+from test.comparing_tools import normalize_code, debug_dump, is_debug
+
+__doc__ = """Unit tests for C++ code generator
+"""
+
+
+class TestCppSourceShards(unittest.TestCase):
+    """
+    Test splitting of definitions into several source files
+    """
+
+    def test_shards_contain_all_definitions(self):
+        cpp_class = CppClass(name="MyClass")
+        cpp_class.add_variable(
+            CppVariable(name="m_count", type="int", is_static=True, value="0")
+        )
+        array = CppArray(name="m_items", type="int", is_static=True, is_const=True)
+        array.add_array_items(["1", "2", "3"])
+        cpp_class.add_array(array)
+        for index in range(30):
+            cpp_class.add_method(
+                CppClass.CppMethod(
+                    name=f"Get{index}",
+                    ret_type="int",
+                    implementation=[f"return {index};"] * (1 + index % 3),
+                )
+            )
+        nested = CppClass(name="Nested")
+        nested.add_method(
+            CppClass.CppMethod(name="Run", ret_type="void", implementation=["return;"])
+        )
+        cpp_class.add_internal_class(nested)
+        free_function = CppFunction(
+            name="Free", ret_type="int", implementation=["return 1;"]
+        )
+        shards = CppSourceShards(
+            "my_class.cpp",
+            elements=[cpp_class, free_function],
+            preamble=['#include "my_class.h"'],
+            shards=4,
+        )
+        results = shards.render_to_strings()
+        self.assertEqual(
+            ["my_class_0.cpp", "my_class_1.cpp", "my_class_2.cpp", "my_class_3.cpp"],
+            [filename for filename, _ in results],
+        )
+        prefix = '#include "my_class.h"\n'
+        for _, text in results:
+            self.assertTrue(text.startswith(prefix))
+
+        writer = io.StringIO()
+        cpp = CppSourceFile(None, writer=writer)
+        cpp_class.render_to_string_implementation(cpp)
+        free_function.render_to_string_implementation(cpp)
+        cpp.newline()
+        expected_output = writer.getvalue()
+        actual_output = "".join(text[len(prefix) :] for _, text in results)
+        expected_output_normalized = normalize_code(expected_output)
+        actual_output_normalized = normalize_code(actual_output)
+        if is_debug():
+            debug_dump(expected_output_normalized, actual_output_normalized, "cpp")
+        self.assertEqual(expected_output_normalized, actual_output_normalized)
+
+    def test_shards_have_similar_size(self):
+        cpp_class = CppClass(name="MyClass")
+        for index in range(300):
+            cpp_class.add_method(
+                CppClass.CppMethod(
+                    name=f"Get{index}",
+                    ret_type="int",
+                    implementation=[f"return {index};"] * (1 + index % 3),
+                )
+            )
+        results = CppSourceShards(
+            "a_{index}.cpp", [cpp_class], shards=3
+        ).render_to_strings()
+        sizes = [len(text) for _, text in results]
+        self.assertLess(max(sizes) - min(sizes), max(sizes) * 0.1)
+
+    def test_shard_count_from_target_size(self):
+        cpp_class = CppClass(name="MyClass")
+        for index in range(100):
+            cpp_class.add_method(
+                CppClass.CppMethod(
+                    name=f"Get{index}",
+                    ret_type="int",
+                    implementation=[f"return {index};"],
+                )
+            )
+        shards = CppSourceShards("a.cpp", [cpp_class], target_size=1000)
+        total = sum(len(unit) for unit in shards.definition_units())
+        self.assertEqual(-(-total // 1000), len(shards.render_to_strings()))
+
+    def test_more_shards_than_definitions(self):
+        cpp_class = CppClass(name="MyClass")
+        cpp_class.add_variable(
+            CppVariable(name="m_count", type="int", is_static=True, value="0")
+        )
+        cpp_class.add_method(
+            CppClass.CppMethod(name="Get", ret_type="int", implementation=["return 0;"])
+        )
+        nested = CppClass(name="Nested")
+        nested.add_method(
+            CppClass.CppMethod(name="Run", ret_type="void", implementation=["return;"])
+        )
+        cpp_class.add_internal_class(nested)
+        results = CppSourceShards("a.cpp", [cpp_class], shards=10).render_to_strings()
+        self.assertEqual(3, len(results))
+        self.assertTrue(all(text for _, text in results))
+
+    def test_render_writes_files(self):
+        cpp_class = CppClass(name="MyClass")
+        for index in range(5):
+            cpp_class.add_method(
+                CppClass.CppMethod(
+                    name=f"Get{index}",
+                    ret_type="int",
+                    implementation=[f"return {index};"],
+                )
+            )
+        with tempfile.TemporaryDirectory() as directory:
+            filenames = CppSourceShards(
+                os.path.join(directory, "a_{index}.cpp"), [cpp_class], shards=2
+            ).render()
+            self.assertEqual(2, len(filenames))
+            self.assertTrue(all(os.path.exists(filename) for filename in filenames))
+
+    def test_invalid_arguments_raise(self):
+        self.assertRaises(ValueError, CppSourceShards, "a.cpp")
+        self.assertRaises(ValueError, CppSourceShards, "a.cpp", shards=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,243 @@
+import io
+import unittest
+from array import array
+from textwrap import dedent
+
+from code_gen.cpp import CppSourceFile, CppClass, CppStructOfArrays, CppVariable
+from test.comparing_tools import normalize_code, debug_dump, is_debug
+
+__doc__ = """Unit tests for C++ code generator
+"""
+
+
+class TestCppStructOfArrays(unittest.TestCase):
+    """
+    Test struct-of-arrays container generation
+    """
+
+    def test_container(self):
+        writer = io.StringIO()
+        cpp = CppSourceFile(None, writer=writer)
+        particle = CppClass(name="Particle", is_struct=True)
+        particle.add_variable(CppVariable(name="x", type="float"))
+        particle.add_variable(CppVariable(name="id", type="uint32_t"))
+        particle.add_variable(CppVariable(name="count", type="int", is_static=True))
+        soa = CppStructOfArrays(record=particle, alignment=32)
+        soa.render_to_string(cpp)
+        self.assertEqual([("x", "float"), ("id", "uint32_t")], soa.fields())
+        expected_output = dedent("""\
+            class ParticleArray
+            {
+            public:
+                static constexpr size_t alignment = 32;
+
+                template <typename T>
+                struct Allocator
+                {
+                    using value_type = T;
+                    Allocator() = default;
+                    template <typename U>
+                    Allocator(const Allocator<U>&) noexcept {}
+                    T* allocate(size_t count)
+                    {
+                        return static_cast<T*>(
+                            ::operator new(count * sizeof(T), std::align_val_t{alignment}));
+                    }
+                    void deallocate(T* pointer, size_t) noexcept
+                    {
+                        ::operator delete(pointer, std::align_val_t{alignment});
+                    }
+                    template <typename U>
+                    bool operator==(const Allocator<U>&) const noexcept
+                    {
+                        return true;
+                    }
+                    template <typename U>
+                    bool operator!=(const Allocator<U>&) const noexcept
+                    {
+                        return false;
+                    }
+                };
+
+                struct Reference
+                {
+                    float& x;
+                    uint32_t& id;
+                };
+
+                struct ConstReference
+                {
+                    const float& x;
+                    const uint32_t& id;
+                };
+
+                struct Iterator
+                {
+                    ParticleArray* container;
+                    size_t index;
+                    Reference operator*() const
+                    {
+                        return (*container)[index];
+                    }
+                    Iterator& operator++()
+                    {
+                        ++index;
+                        return *this;
+                    }
+                    bool operator==(const Iterator& other) const
+                    {
+                        return index == other.index;
+                    }
+                    bool operator!=(const Iterator& other) const
+                    {
+                        return index != other.index;
+                    }
+                };
+
+                struct ConstIterator
+                {
+                    const ParticleArray* container;
+                    size_t index;
+                    ConstReference operator*() const
+                    {
+                        return (*container)[index];
+                    }
+                    ConstIterator& operator++()
+                    {
+                        ++index;
+                        return *this;
+                    }
+                    bool operator==(const ConstIterator& other) const
+                    {
+                        return index == other.index;
+                    }
+                    bool operator!=(const ConstIterator& other) const
+                    {
+                        return index != other.index;
+                    }
+                };
+
+                size_t size() const
+                {
+                    return m_x.size();
+                }
+                bool empty() const
+                {
+                    return m_x.empty();
+                }
+                void reserve(size_t count)
+                {
+                    m_x.reserve(count);
+                    m_id.reserve(count);
+                }
+                void resize(size_t count)
+                {
+                    m_x.resize(count);
+                    m_id.resize(count);
+                }
+                void clear()
+                {
+                    m_x.clear();
+                    m_id.clear();
+                }
+                void push_back(const Particle& value)
+                {
+                    m_x.push_back(value.x);
+                    m_id.push_back(value.id);
+                }
+                Reference operator[](size_t index)
+                {
+                    return Reference{m_x[index], m_id[index]};
+                }
+                ConstReference operator[](size_t index) const
+                {
+                    return ConstReference{m_x[index], m_id[index]};
+                }
+                Iterator begin()
+                {
+                    return Iterator{this, 0};
+                }
+                Iterator end()
+                {
+                    return Iterator{this, size()};
+                }
+                ConstIterator begin() const
+                {
+                    return ConstIterator{this, 0};
+                }
+                ConstIterator end() const
+                {
+                    return ConstIterator{this, size()};
+                }
+                float* x_data()
+                {
+                    return m_x.data();
+                }
+                const float* x_data() const
+                {
+                    return m_x.data();
+                }
+                uint32_t* id_data()
+                {
+                    return m_id.data();
+                }
+                const uint32_t* id_data() const
+                {
+                    return m_id.data();
+                }
+
+            private:
+                std::vector<float, Allocator<float>> m_x;
+                std::vector<uint32_t, Allocator<uint32_t>> m_id;
+            };""")
+        actual_output = writer.getvalue().strip()
+        expected_output_normalized = normalize_code(expected_output)
+        actual_output_normalized = normalize_code(actual_output)
+        if is_debug():
+            debug_dump(expected_output_normalized, actual_output_normalized, "cpp")
+        self.assertEqual(expected_output_normalized, actual_output_normalized)
+
+    def test_static_tables(self):
+        writer = io.StringIO()
+        cpp = CppSourceFile(None, writer=writer)
+        particle = CppClass(name="Particle", is_struct=True)
+        particle.add_variable(CppVariable(name="x", type="float"))
+        particle.add_variable(CppVariable(name="id", type="uint32_t"))
+        particle.add_variable(CppVariable(name="count", type="int", is_static=True))
+        soa = CppStructOfArrays(record=particle)
+        soa.render_static_tables(
+            cpp, "kParticles", {"x": array("f", [0.5, 1.0, -2.0]), "id": [7, 8, 9]}
+        )
+        expected_output = dedent("""\
+            constexpr size_t kParticles_size = 3;
+            alignas(64) constexpr float kParticles_x[3] = {0.5f, 1.0f, -2.0f};
+            alignas(64) constexpr uint32_t kParticles_id[3] = {7, 8, 9};""")
+        actual_output = writer.getvalue().strip()
+        expected_output_normalized = normalize_code(expected_output)
+        actual_output_normalized = normalize_code(actual_output)
+        if is_debug():
+            debug_dump(expected_output_normalized, actual_output_normalized, "cpp")
+        self.assertEqual(expected_output_normalized, actual_output_normalized)
+
+    def test_invalid(self):
+        cpp = CppSourceFile(None, writer=io.StringIO())
+        particle = CppClass(name="Particle", is_struct=True)
+        particle.add_variable(CppVariable(name="x", type="float"))
+        particle.add_variable(CppVariable(name="id", type="uint32_t"))
+        particle.add_variable(CppVariable(name="count", type="int", is_static=True))
+        soa = CppStructOfArrays(record=particle)
+        self.assertRaises(
+            ValueError, soa.render_static_tables, cpp, "t", {"x": [1.0], "id": []}
+        )
+        self.assertRaises(ValueError, soa.render_static_tables, cpp, "t", {"x": [1.0]})
+        self.assertRaises(
+            ValueError, CppStructOfArrays(record=particle, alignment=48).fields
+        )
+        flags = CppClass(name="Flags", is_struct=True)
+        flags.add_variable(CppVariable(name="on", type="bool"))
+        self.assertRaises(ValueError, CppStructOfArrays(record=flags).fields)
+        self.assertRaises(RuntimeError, CppStructOfArrays().fields)
+
+
+if __name__ == "__main__":
+    unittest.main()
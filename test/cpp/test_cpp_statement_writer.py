@@ -0,0 +1,120 @@
+import io
+import json
+import pickle
+import unittest
+from textwrap import dedent
+
+from code_gen.cpp import CppSourceFile, CppFunction, CppClass, CppBody, CppBlock
+from test.comparing_tools import normalize_code, debug_dump, is_debug
+
+__doc__ = """Unit tests for C++ code generator
+"""
+
+
+class TestCppBody(unittest.TestCase):
+    """
+    Test declarative function and method bodies
+    """
+
+    def test_function_body(self):
+        writer = io.StringIO()
+        cpp = CppSourceFile(None, writer=writer)
+        body = CppBody(
+            [
+                "if (n < 1)",
+                CppBlock(None, ["return 1;"]),
+                "return n * ${name}(n - 1);",
+            ],
+            params={"name": "factorial"},
+        )
+        func = CppFunction(name="factorial", ret_type="int", implementation=body)
+        func.add_argument("int n")
+        func.render_to_string(cpp)
+        expected_output = dedent("""\
+            int factorial(int n) {
+                if (n < 1)
+                {
+                    return 1;
+                }
+                return n * factorial(n - 1);
+            }""")
+        actual_output = writer.getvalue().strip()
+        expected_output_normalized = normalize_code(expected_output)
+        actual_output_normalized = normalize_code(actual_output)
+        if is_debug():
+            debug_dump(expected_output_normalized, actual_output_normalized, "cpp")
+        self.assertEqual(expected_output_normalized, actual_output_normalized)
+
+    def test_method_and_ctor_bodies(self):
+        writer = io.StringIO()
+        cpp = CppSourceFile(None, writer=writer)
+        cpp_class = CppClass(name="MyClass", is_struct=True)
+        cpp_class.add_method(
+            CppClass.CppCtor(
+                name="MyClass",
+                initializers=["m_data{ 0 }"],
+                implementation=CppBody(["Init();"]),
+            )
+        )
+        cpp_class.add_method(
+            CppClass.CppMethod(
+                name="GetData",
+                ret_type="int",
+                is_const=True,
+                implementation=["return m_data;"],
+            )
+        )
+        cpp_class.render_to_string_implementation(cpp)
+        expected_output = dedent("""\
+            MyClass::MyClass() : m_data{ 0 }
+            {
+                Init();
+            }
+
+            int MyClass::GetData() const
+            {
+                return m_data;
+            }""")
+        actual_output = writer.getvalue().strip()
+        expected_output_normalized = normalize_code(expected_output)
+        actual_output_normalized = normalize_code(actual_output)
+        if is_debug():
+            debug_dump(expected_output_normalized, actual_output_normalized, "cpp")
+        self.assertEqual(expected_output_normalized, actual_output_normalized)
+
+    def test_braces_and_missing_placeholder(self):
+        writer = io.StringIO()
+        cpp = CppSourceFile(None, writer=writer)
+        CppBody(["int a[] = {1, 2};", ""])(cpp)
+        self.assertEqual("int a[] = {1, 2};\n\n", writer.getvalue())
+        self.assertRaises(ValueError, CppBody(["return $value;"], {"other": 1}), cpp)
+
+    def test_hash_and_equality(self):
+        body = CppBody(
+            ["if (n < 1)", CppBlock(None, ["return 1;"])], params={"name": "factorial"}
+        )
+        same_body = CppBody(
+            ["if (n < 1)", CppBlock(None, ["return 1;"])], params={"name": "factorial"}
+        )
+        self.assertEqual(body, same_body)
+        self.assertEqual(hash(body), hash(same_body))
+        self.assertEqual(body.fingerprint(), same_body.fingerprint())
+        self.assertNotEqual(body, body.bind(name="fact"))
+        self.assertNotEqual(body.fingerprint(), body.bind(name="fact").fingerprint())
+
+    def test_serialization(self):
+        body = CppBody(
+            ["if (n < 1)", CppBlock(None, ["return 1;"]), "return n * ${name}(n - 1);"],
+            params={"name": "factorial"},
+        )
+        self.assertEqual(body, pickle.loads(pickle.dumps(body)))
+        data = json.loads(json.dumps(body.to_dict()))
+        self.assertEqual(body, CppBody.from_dict(data))
+
+    def test_invalid_statement_raises(self):
+        self.assertRaises(TypeError, CppBody, "return 0;")
+        self.assertRaises(TypeError, CppBody, [42])
+
+
+if __name__ == "__main__":
+    unittest.main()
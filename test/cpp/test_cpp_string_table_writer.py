@@ -0,0 +1,79 @@
+import io
+import unittest
+from textwrap import dedent
+
+from code_gen.cpp import CppSourceFile, CppStringTable
+
+__doc__ = """Unit tests for C++ code generator
+"""
+
+
+class TestCppStringTable(unittest.TestCase):
+    """
+    Test string pool with offset array
+    """
+
+    def test_render(self):
+        writer = io.StringIO()
+        cpp = CppSourceFile(None, writer=writer)
+        table = CppStringTable(
+            name="color_name",
+            strings=["red", "green", "dark green", "red"],
+            merge_suffixes=True,
+        )
+        table.render_to_string(cpp)
+        expected = dedent("""\
+            static const char color_name_pool[] =
+                "red\\0"
+                "dark green";
+            static const uint16_t color_name_offsets[] = {0, 9, 4, 0};
+            const char* color_name(size_t index) {
+                return color_name_pool + color_name_offsets[index];
+            }
+            """)
+        self.assertEqual(expected, writer.getvalue())
+        self.assertEqual(["<cstddef>", "<cstdint>"], table.required_includes())
+
+    def test_layout(self):
+        table = CppStringTable(name="names", strings=["ab", "b", "", "ab"])
+        self.assertEqual((b"ab\0b\0\0", [0, 3, 5, 0]), table.layout())
+        table.is_merge_suffixes = True
+        self.assertEqual((b"ab\0", [0, 1, 2, 0]), table.layout())
+
+    def test_escaping_and_chars_format(self):
+        strings = ['say "hi"?', "caf\u00e9\\1"]
+        writer = io.StringIO()
+        table = CppStringTable(name="text", strings=strings, accessor="GetText")
+        table.render_to_string_declaration(CppSourceFile(None, writer=writer))
+        table._render_pool(CppSourceFile(None, writer=writer), table.layout()[0])
+        expected = dedent("""\
+            const char* GetText(size_t index);
+            static const char text_pool[] =
+                "say \\"hi\\"\\?\\0"
+                "caf\\303\\251\\\\1";
+            """)
+        self.assertEqual(expected, writer.getvalue())
+
+        writer = io.StringIO()
+        table = CppStringTable(name="text", strings=["a'", "b"], pool_format="chars")
+        table._render_pool(CppSourceFile(None, writer=writer), table.layout()[0])
+        self.assertEqual(
+            "static const char text_pool[] = {'a', '\\'', '\\0', 'b', '\\0'};\n",
+            writer.getvalue(),
+        )
+
+    def test_offset_type(self):
+        table = CppStringTable(name="big", strings=["x" * 70000, "y"])
+        self.assertEqual("uint32_t", table.offsets_array().type)
+        table.offset_type = "uint16_t"
+        self.assertRaises(ValueError, table.offsets_array)
+
+    def test_invalid_strings(self):
+        self.assertRaises(ValueError, CppStringTable(name="empty").layout)
+        self.assertRaises(
+            ValueError, CppStringTable(name="nul", strings=["a\0b"]).layout
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
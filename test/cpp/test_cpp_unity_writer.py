@@ -0,0 +1,137 @@
+import json
+import os
+import tempfile
+import unittest
+from textwrap import dedent
+
+from code_gen.cpp import CppSourceFile, CppUnityBuild, internal_linkage_names
+
+__doc__ = """Unit tests for C++ code generator
+"""
+
+
+class TestCppUnityBuild(unittest.TestCase):
+    """
+    Test grouping of generated sources into unity files
+    """
+
+    def test_internal_linkage_names(self):
+        text = dedent("""\
+            static int counter = 0;
+            static void helper(int n)
+            {
+                static int local = 0;
+            }
+            const char* const names[] = {"a"};
+            const char* labels[] = {"a"};
+            constexpr int answer = 42;
+            const std::string& Name();
+            static const size_t MyClass::m_var = 255;
+            extern int shared;
+            extern const int limit = 5;
+            int visible(int n);
+            static_assert(sizeof(int) == 4);
+            """)
+        self.assertEqual(
+            {"counter", "helper", "names", "answer"}, internal_linkage_names(text)
+        )
+
+    def test_internal_linkage_in_namespaces(self):
+        text = dedent("""            namespace
+            {
+                int counter = 0;
+                void helper(int n)
+                {
+                    int local = n;
+                }
+                struct Cache
+                {
+                    static int size;
+                };
+            }
+            namespace app {
+                static int hits = 0;
+                int visible(int n);
+                namespace {
+                    const char* label = "}";
+                }
+            }
+            namespace fs = std::filesystem;
+            extern "C"
+            {
+                static int version = 1;
+            }
+            """)
+        self.assertEqual(
+            {"counter", "helper", "hits", "label", "version"},
+            internal_linkage_names(text),
+        )
+
+    def test_group_by_count(self):
+        unity = CppUnityBuild("unity_{index}.cpp", max_count=2)
+        for name in "abcde":
+            unity.add_source(f"{name}.cpp", text=f"int {name}();\n")
+        self.assertEqual(
+            {
+                "unity_0.cpp": ["a.cpp", "b.cpp"],
+                "unity_1.cpp": ["c.cpp", "d.cpp"],
+                "unity_2.cpp": ["e.cpp"],
+            },
+            unity.manifest(),
+        )
+
+    def test_group_by_size(self):
+        unity = CppUnityBuild("unity_{index}.cpp", max_size=25)
+        unity.add_source("a.cpp", text="a" * 10)
+        unity.add_source("b.cpp", text="b" * 10)
+        unity.add_source("c.cpp", text="c" * 10)
+        unity.add_source("d.cpp", text="d" * 100)
+        self.assertEqual(
+            [["a.cpp", "b.cpp"], ["c.cpp"], ["d.cpp"]],
+            list(unity.manifest().values()),
+        )
+
+    def test_clash_raises(self):
+        unity = CppUnityBuild("unity_{index}.cpp", max_count=10)
+        unity.add_source("a.cpp", text="static int helper(int n);\n")
+        unity.add_source("b.cpp", text="static int helper(int n);\n")
+        with self.assertRaises(ValueError) as context:
+            unity.manifest()
+        self.assertIn("'helper' in a.cpp and b.cpp", str(context.exception))
+
+    def test_split_on_clash(self):
+        unity = CppUnityBuild("unity_{index}.cpp", max_count=10, split_on_clash=True)
+        unity.add_source("a.cpp", text="static int helper(int n);\n")
+        unity.add_source("b.cpp", text="int other();\n")
+        unity.add_source("c.cpp", text="const int helper[] = {1};\n")
+        self.assertEqual(
+            [["a.cpp", "b.cpp"], ["c.cpp"]], list(unity.manifest().values())
+        )
+
+    def test_render_with_manifest(self):
+        with tempfile.TemporaryDirectory() as directory:
+            sources = []
+            for name in ["a", "b"]:
+                filename = os.path.join(directory, f"{name}.cpp")
+                cpp = CppSourceFile(filename)
+                cpp(f"int {name}() {{ return 0; }}")
+                cpp.close()
+                sources.append(cpp)
+            unity = CppUnityBuild(
+                os.path.join(directory, "unity_{index}.cpp"), max_count=5
+            )
+            for source in sources:
+                unity.add_source(source)
+            manifest = os.path.join(directory, "manifest.json")
+            filenames = unity.render(manifest=manifest)
+            with open(filenames[0]) as f:
+                self.assertEqual('#include "a.cpp"\n#include "b.cpp"\n', f.read())
+            with open(manifest) as f:
+                self.assertEqual(unity.manifest(), json.load(f))
+
+    def test_no_limit_raises(self):
+        self.assertRaises(ValueError, CppUnityBuild, "unity_{index}.cpp")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -77,6 +77,45 @@ class TestCppVariableStringIo(unittest.TestCase):
         v.render_to_string(cpp)
         self.assertIn("extern char* var1;", writer.getvalue())
 
+    def test_is_extern_single_definition(self):
+        header = io.StringIO()
+        source = io.StringIO()
+        v = CppVariable(
+            name="var1", type="double", is_const=True, is_extern=True, value="1.5"
+        )
+        v.render_to_string_declaration(CppSourceFile(None, writer=header))
+        v.render_to_string_implementation(CppSourceFile(None, writer=source))
+        self.assertEqual("extern const double var1;\n", header.getvalue())
+        self.assertEqual("extern const double var1 = 1.5;\n", source.getvalue())
+
+    def test_is_inline(self):
+        writer = io.StringIO()
+        cpp = CppSourceFile(None, writer=writer)
+        v = CppVariable(
+            name="var1", type="double", is_const=True, is_inline=True, value="1.5"
+        )
+        v.render_to_string_declaration(cpp)
+        v.render_to_string_implementation(cpp)
+        self.assertEqual("inline const double var1 = 1.5;\n", writer.getvalue())
+
+    def test_is_inline_class_member(self):
+        writer = io.StringIO()
+        cpp = CppSourceFile(None, writer=writer)
+        cls = CppClass(name="Cls")
+        v = CppVariable(
+            name="s_var", type="int", is_static=True, is_inline=True, value="3"
+        )
+        cls.add_variable(v)
+        cls.render_to_string(cpp)
+        self.assertIn("static inline int s_var = 3;", writer.getvalue())
+        self.assertNotIn("Cls::s_var", writer.getvalue())
+
+    def test_is_inline_static_raises(self):
+        v = CppVariable(
+            name="var1", type="int", is_static=True, is_inline=True, value="1"
+        )
+        self.assertRaises(ValueError, v.render_to_string, None)
+
 
 if __name__ == "__main__":
     unittest.main()